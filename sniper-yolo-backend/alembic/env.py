@@ -21,7 +21,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 from app.models.base import Base
 # Import all models to ensure they are registered with Base.metadata
-from app.models import user, item, food, drink, fun, enjoy
+from app.models import user, item, food, drink, fun, enjoy, refresh_token
 target_metadata = Base.metadata
 
 # Override the sqlalchemy.url from the environment if available
@@ -0,0 +1,26 @@
+"""Add token_version column to users table
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 令牌版本号：改密码/停用账号时递增，旧令牌随之失效
+    op.add_column('users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,46 @@
+"""Add (create_time, id) indexes for keyset pagination
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# 表名 -> 排序时间列；索引顺序与列表查询的 ORDER BY 时间 DESC, id DESC 一致
+KEYSET_INDEXES = {
+    'foods': 'create_time',
+    'drinks': 'create_time',
+    'enjoys': 'create_time',
+    'items': 'created_at',
+    'users': 'created_at',
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY 不能在事务里执行，建索引期间不阻塞写入
+    with op.get_context().autocommit_block():
+        for table, column in KEYSET_INDEXES.items():
+            op.create_index(
+                f'ix_{table}_{column}_id', table,
+                [sa.text(f'{column} DESC'), sa.text('id DESC')],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in KEYSET_INDEXES.items():
+            op.drop_index(
+                f'ix_{table}_{column}_id', table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,72 @@
+"""Add btree, GIN and trigram indexes for list filters
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# 等值过滤列和外键列（删除用户时的外键检查也会用到）
+BTREE_INDEXES = {
+    'foods': ['maker', 'flavor', 'category', 'created_by'],
+    'drinks': ['brand', 'flavor', 'created_by'],
+    'enjoys': ['maker', 'flavor', 'category', 'created_by'],
+    'items': ['owner_id'],
+}
+
+# tags @> ARRAY[...] 标签包含查询
+TAG_TABLES = ['foods', 'drinks', 'enjoys']
+
+# ILIKE '%x%' 模糊查询；pg_trgm 对中文需要数据库使用非 C 的 LC_CTYPE
+TRIGRAM_INDEXES = {
+    'foods': ['title', 'content'],
+    'drinks': ['title', 'content'],
+    'enjoys': ['title', 'location'],
+    'items': ['title', 'description'],
+}
+
+
+def _index_specs():
+    for table, columns in BTREE_INDEXES.items():
+        for column in columns:
+            yield f'ix_{table}_{column}', table, [column], {}
+    for table in TAG_TABLES:
+        yield f'ix_{table}_tags', table, ['tags'], {'postgresql_using': 'gin'}
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            yield f'ix_{table}_{column}_trgm', table, [column], {
+                'postgresql_using': 'gin',
+                'postgresql_ops': {column: 'gin_trgm_ops'},
+            }
+
+
+def upgrade() -> None:
+    op.execute(sa.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    # 扩展需要先提交，CONCURRENTLY 不能在事务里执行，建索引期间不阻塞写入
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in _index_specs():
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **options,
+            )
+
+
+def downgrade() -> None:
+    # pg_trgm 扩展可能被其他对象使用，保留不删
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in _index_specs():
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
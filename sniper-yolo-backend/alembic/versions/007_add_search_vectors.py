@@ -0,0 +1,80 @@
+"""Add generated search_vector columns for full-text search
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# array_to_string 是 STABLE，生成列只能用 IMMUTABLE 表达式，包一层并处理 NULL
+ARRAY_TEXT_FUNCTION = """
+CREATE OR REPLACE FUNCTION array_to_search_text(text[]) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT coalesce(array_to_string($1, ' '), '') $$
+"""
+
+# 权重：A 标题，B 正文/地点，C 标签/推荐菜，D 口味/制作者/品牌等
+SEARCH_VECTORS = {
+    'foods': (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(content, '')), 'B') || "
+        "setweight(to_tsvector('simple', array_to_search_text(tags::text[])), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(flavor, '') || ' ' || coalesce(maker, '') || ' ' "
+        "|| coalesce(category, '')), 'D')"
+    ),
+    'drinks': (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(content, '')), 'B') || "
+        "setweight(to_tsvector('simple', array_to_search_text(tags::text[])), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(flavor, '') || ' ' || coalesce(brand, '') || ' ' "
+        "|| coalesce(drink_type, '')), 'D')"
+    ),
+    'enjoys': (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(content, '') || ' ' || coalesce(location, '')), 'B') || "
+        "setweight(to_tsvector('simple', array_to_search_text(tags::text[]) || ' ' "
+        "|| array_to_search_text(recommend_dishes::text[])), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(flavor, '') || ' ' || coalesce(maker, '') || ' ' "
+        "|| coalesce(category, '')), 'D')"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.execute(sa.text(ARRAY_TEXT_FUNCTION))
+    # STORED 生成列需要重写整表并持有 ACCESS EXCLUSIVE 锁，大表请在低峰期执行
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(
+            table,
+            sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True),
+        )
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.create_index(
+                f'ix_{table}_search_vector', table, ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.drop_index(
+                f'ix_{table}_search_vector', table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    for table in SEARCH_VECTORS:
+        op.drop_column(table, 'search_vector')
+    op.execute(sa.text('DROP FUNCTION IF EXISTS array_to_search_text(text[])'))
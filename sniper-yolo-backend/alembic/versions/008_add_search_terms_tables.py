@@ -0,0 +1,42 @@
+"""Add n-gram search terms side tables for keyword search
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# 旁表 -> 业务表；词项由应用写入，已有数据在启动后由后台同步任务分批补齐
+SEARCH_TERMS_TABLES = {
+    'food_search_terms': 'foods',
+    'drink_search_terms': 'drinks',
+    'enjoy_search_terms': 'enjoys',
+}
+
+
+def upgrade() -> None:
+    for table, target in SEARCH_TERMS_TABLES.items():
+        op.create_table(table,
+            sa.Column('doc_id', sa.Integer(), nullable=False),
+            sa.Column('terms', postgresql.ARRAY(sa.Text()), nullable=False),
+            sa.Column('changed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['doc_id'], [f'{target}.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('doc_id')
+        )
+        # 倒排索引：terms @> ARRAY[...]，GIN 的 posting list 自带压缩
+        op.create_index(f'ix_{table}_terms', table, ['terms'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table in SEARCH_TERMS_TABLES:
+        op.drop_index(f'ix_{table}_terms', table_name=table)
+        op.drop_table(table)
@@ -0,0 +1,91 @@
+"""管理端API端点 - 仅超级用户可访问的运维诊断接口"""
+import logging
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.models.user import User
+from app.core.dependencies import get_current_active_superuser
+from app.core import db_pool, profiler, slow_query
+from app.core.database import Database
+from app.core.config import settings
+from app.utils.response import ApiSuccessResponse, ApiErrorResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=ApiSuccessResponse)
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="返回条数"),
+    current_user: User = Depends(get_current_active_superuser)
+) -> ApiSuccessResponse:
+    """最近的慢查询（最新的在前），开启 SLOW_QUERY_EXPLAIN 时附带执行计划"""
+    entries = slow_query.recent(limit)
+    return ApiSuccessResponse.create(
+        data={"total": len(entries), "items": entries},
+        msg="获取慢查询成功"
+    )
+
+
+@router.delete("/slow-queries", response_model=ApiSuccessResponse)
+async def clear_slow_queries(
+    current_user: User = Depends(get_current_active_superuser)
+) -> ApiSuccessResponse:
+    """清空慢查询缓冲区"""
+    slow_query.clear()
+    logger.info(f"慢查询缓冲区已被 {current_user.username} 清空")
+    return ApiSuccessResponse.create(data=None, msg="慢查询已清空")
+
+
+@router.get("/db-pool", response_model=ApiSuccessResponse)
+async def get_db_pool_status(
+    reset: bool = Query(False, description="读取后清零借出等待统计"),
+    current_user: User = Depends(get_current_active_superuser)
+) -> ApiSuccessResponse:
+    """本 worker 主库连接池的状态：占用/溢出/排队数、借出等待和连接年龄（不含只读副本）"""
+    data = db_pool.pool_status(Database.engine)
+    if reset:
+        db_pool.pool_stats(db_pool.PRIMARY_POOL).reset()
+    return ApiSuccessResponse.create(data=data, msg="获取连接池状态成功")
+
+
+def _profile_response(session: profiler.ProfileSession) -> PlainTextResponse:
+    return PlainTextResponse(
+        session.render(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{session.id}.folded"'}
+    )
+
+
+@router.get("/profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_active_superuser)
+):
+    """下载带 X-Profile: 1 请求的采样结果（collapsed-stack 格式）"""
+    session = profiler.get_profile(profile_id)
+    if session is None:
+        return ApiErrorResponse.create(
+            code="B00404",
+            status_code=status.HTTP_404_NOT_FOUND,
+            msg="采样结果不存在或已过期"
+        )
+    return _profile_response(session)
+
+
+@router.post("/profile")
+async def run_global_profile(
+    seconds: float = Query(10, gt=0, description="采样时长(秒)"),
+    current_user: User = Depends(get_current_active_superuser)
+):
+    """对本 worker 的事件循环做一段时间的全局采样，返回聚合后的 collapsed-stack"""
+    if not settings.PROFILER_ENABLED:
+        return ApiErrorResponse.create(
+            code="A00003",
+            status_code=status.HTTP_403_FORBIDDEN,
+            msg="采样分析未开启"
+        )
+    seconds = min(seconds, settings.PROFILER_MAX_SECONDS)
+    logger.info(f"{current_user.username} 开始全局采样 {seconds}s")
+    session = await profiler.profile_for(seconds)
+    return _profile_response(session)
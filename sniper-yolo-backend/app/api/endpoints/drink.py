@@ -6,13 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.drink import DrinkCreate, DrinkOut, DrinkUpdate
 from app.models.user import User
+from app.schemas.user import TokenClaims
 from app.services.drink_service import DrinkService
-from app.core.dependencies import get_current_active_user, get_db
+from app.core.dependencies import get_current_active_user, get_current_active_claims, get_db, get_read_db
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse, ApiResponse
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.fast_response import ApiORJSONRoute
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ApiORJSONRoute)
 
 
 @router.post("/", response_model=ApiSuccessResponse)
@@ -57,6 +60,10 @@ async def create_drink(
 async def read_drinks(
     page: int = 1,
     count: int = 10,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    view: str = "full",
+    q: Optional[str] = None,
     title: Optional[str] = None,
     content: Optional[str] = None,
     brand: Optional[str] = None,
@@ -67,17 +74,19 @@ async def read_drinks(
     sweetness: Optional[str] = None,
     ice: Optional[str] = None,
     tag: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """获取饮品记录列表（支持条件查询和分页）"""
     try:
+        # 带游标时按 (创建时间, id) 定位，忽略 page
+        after = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * count
         limit = count
 
-        logger.info(f"获取饮品记录列表，page={page}, count={count}, title={title}, content={content}, brand={brand}, min_star={min_star}, max_star={max_star}, flavor={flavor}, drink_type={drink_type}, sweetness={sweetness}, ice={ice}, tag={tag} (skip={skip}, limit={limit})")
+        logger.info(f"获取饮品记录列表，page={page}, count={count}, title={title}, content={content}, brand={brand}, min_star={min_star}, max_star={max_star}, flavor={flavor}, drink_type={drink_type}, sweetness={sweetness}, ice={ice}, tag={tag}, q={q} (skip={skip}, limit={limit})")
 
         drink_service = DrinkService()
-        drinks = await drink_service.search_drinks(
+        result = await drink_service.search_drinks_page(
             title=title,
             content=content,
             brand=brand,
@@ -88,35 +97,34 @@ async def read_drinks(
             sweetness=sweetness,
             ice=ice,
             tag=tag,
+            q=q,
             db=db,
             skip=skip,
-            limit=limit
-        )
-
-        total = await drink_service.search_drinks_count(
-            title=title,
-            content=content,
-            brand=brand,
-            min_star=int(min_star) if min_star is not None else None,
-            max_star=int(max_star) if max_star is not None else None,
-            flavor=flavor,
-            drink_type=drink_type,
-            sweetness=sweetness,
-            ice=ice,
-            tag=tag,
-            db=db
+            limit=limit,
+            after=after,
+            total_mode=total_mode,
+            view=view
         )
+        drinks = result.rows
 
         return ApiSuccessResponse.create(
             data={
                 "drinks": drinks,
-                "total": total,
+                "total": result.total,
+                "total_exact": result.total_exact,
                 "page": page,
-                "count": count
+                "count": count,
+                "next_cursor": next_cursor(drinks, limit, "create_time")
             },
             msg="获取饮品列表成功"
         )
 
+    except ValueError as e:
+        return ApiErrorResponse.create(
+            code="A00001",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            msg=str(e)
+        )
     except Exception as e:
         logger.error(f"获取饮品列表失败: {str(e)}", exc_info=True)
         return ApiErrorResponse.create(
@@ -129,7 +137,7 @@ async def read_drinks(
 @router.get("/{drink_id}", response_model=ApiSuccessResponse)
 async def get_drink(
     drink_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """根据 ID 获取单个饮品"""
     try:
@@ -160,7 +168,7 @@ async def get_drink(
 async def update_drink(
     drink_id: int,
     drink: DrinkUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 更新单个饮品"""
@@ -191,7 +199,7 @@ async def update_drink(
 @router.delete("/{drink_id}", response_model=ApiSuccessResponse)
 async def delete_drink(
     drink_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 删除单个饮品"""
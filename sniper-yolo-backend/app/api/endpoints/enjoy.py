@@ -6,13 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.enjoy import EnjoyCreate, EnjoyOut, EnjoyUpdate
 from app.models.user import User
+from app.schemas.user import TokenClaims
 from app.services.enjoy_service import EnjoyService
-from app.core.dependencies import get_current_active_user, get_db
+from app.core.dependencies import get_current_active_user, get_current_active_claims, get_db, get_read_db
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse, ApiResponse
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.fast_response import ApiORJSONRoute
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ApiORJSONRoute)
 
 
 @router.post("/", response_model=ApiSuccessResponse)
@@ -57,6 +60,10 @@ async def create_enjoy(
 async def read_enjoys(
     page: int = 1,
     count: int = 10,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    view: str = "full",
+    q: Optional[str] = None,
     title: Optional[str] = None,
     location: Optional[str] = None,
     maker: Optional[str] = None,
@@ -64,17 +71,19 @@ async def read_enjoys(
     max_star: Optional[float] = None,
     flavor: Optional[str] = None,
     tag: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """获取饭店记录列表（支持条件查询和分页）"""
     try:
+        # 带游标时按 (创建时间, id) 定位，忽略 page
+        after = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * count
         limit = count
 
-        logger.info(f"获取饭店记录列表，page={page}, count={count}, title={title}, location={location}, maker={maker}, min_star={min_star}, max_star={max_star}, flavor={flavor}, tag={tag} (skip={skip}, limit={limit})")
+        logger.info(f"获取饭店记录列表，page={page}, count={count}, title={title}, location={location}, maker={maker}, min_star={min_star}, max_star={max_star}, flavor={flavor}, tag={tag}, q={q} (skip={skip}, limit={limit})")
 
         enjoy_service = EnjoyService()
-        enjoys = await enjoy_service.search_enjoys(
+        result = await enjoy_service.search_enjoys_page(
             title=title,
             location=location,
             maker=maker,
@@ -82,32 +91,34 @@ async def read_enjoys(
             max_star=max_star,
             flavor=flavor,
             tag=tag,
+            q=q,
             db=db,
             skip=skip,
-            limit=limit
-        )
-
-        total = await enjoy_service.search_enjoys_count(
-            title=title,
-            location=location,
-            maker=maker,
-            min_star=min_star,
-            max_star=max_star,
-            flavor=flavor,
-            tag=tag,
-            db=db
+            limit=limit,
+            after=after,
+            total_mode=total_mode,
+            view=view
         )
+        enjoys = result.rows
 
         return ApiSuccessResponse.create(
             data={
                 "enjoys": enjoys,
-                "total": total,
+                "total": result.total,
+                "total_exact": result.total_exact,
                 "page": page,
-                "count": count
+                "count": count,
+                "next_cursor": next_cursor(enjoys, limit, "create_time")
             },
             msg="获取饭店列表成功"
         )
 
+    except ValueError as e:
+        return ApiErrorResponse.create(
+            code="A00001",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            msg=str(e)
+        )
     except Exception as e:
         logger.error(f"获取饭店列表失败: {str(e)}", exc_info=True)
         return ApiErrorResponse.create(
@@ -120,7 +131,7 @@ async def read_enjoys(
 @router.get("/{enjoy_id}", response_model=ApiSuccessResponse)
 async def get_enjoy(
     enjoy_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """根据 ID 获取单个饭店"""
     try:
@@ -151,7 +162,7 @@ async def get_enjoy(
 async def update_enjoy(
     enjoy_id: int,
     enjoy: EnjoyUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 更新单个饭店"""
@@ -182,7 +193,7 @@ async def update_enjoy(
 @router.delete("/{enjoy_id}", response_model=ApiSuccessResponse)
 async def delete_enjoy(
     enjoy_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 删除单个饭店"""
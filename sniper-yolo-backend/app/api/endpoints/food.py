@@ -6,13 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.food import FoodCreate, FoodOut, FoodUpdate
 from app.models.user import User
+from app.schemas.user import TokenClaims
 from app.services.food_service import FoodService
-from app.core.dependencies import get_current_active_user, get_db
+from app.core.dependencies import get_current_active_user, get_current_active_claims, get_db, get_read_db
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse, ApiResponse
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.fast_response import ApiORJSONRoute
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ApiORJSONRoute)
 
 
 @router.post("/", response_model=ApiSuccessResponse)
@@ -57,6 +60,10 @@ async def create_food(
 async def read_foods(
     page: int = 1,
     count: int = 10,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    view: str = "full",
+    q: Optional[str] = None,
     title: Optional[str] = None,
     content: Optional[str] = None,
     maker: Optional[str] = None,
@@ -65,17 +72,19 @@ async def read_foods(
     flavor: Optional[str] = None,
     tag: Optional[str] = None,
     category: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """获取食品记录列表（支持条件查询和分页）"""
     try:
+        # 带游标时按 (创建时间, id) 定位，忽略 page
+        after = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * count
         limit = count
 
-        logger.info(f"获取食品记录列表，page={page}, count={count}, title={title}, content={content}, maker={maker}, min_star={min_star}, max_star={max_star}, flavor={flavor}, tag={tag}, category={category} (skip={skip}, limit={limit})")
+        logger.info(f"获取食品记录列表，page={page}, count={count}, title={title}, content={content}, maker={maker}, min_star={min_star}, max_star={max_star}, flavor={flavor}, tag={tag}, q={q}, category={category} (skip={skip}, limit={limit})")
 
         food_service = FoodService()
-        foods = await food_service.search_foods(
+        result = await food_service.search_foods_page(
             title=title,
             content=content,
             maker=maker,
@@ -83,34 +92,35 @@ async def read_foods(
             max_star=int(max_star) if max_star is not None else None,
             flavor=flavor,
             tag=tag,
+            q=q,
             category=category,
             db=db,
             skip=skip,
-            limit=limit
-        )
-
-        total = await food_service.search_foods_count(
-            title=title,
-            content=content,
-            maker=maker,
-            min_star=int(min_star) if min_star is not None else None,
-            max_star=int(max_star) if max_star is not None else None,
-            flavor=flavor,
-            tag=tag,
-            category=category,
-            db=db
+            limit=limit,
+            after=after,
+            total_mode=total_mode,
+            view=view
         )
+        foods = result.rows
 
         return ApiSuccessResponse.create(
             data={
                 "foods": foods,
-                "total": total,
+                "total": result.total,
+                "total_exact": result.total_exact,
                 "page": page,
-                "count": count
+                "count": count,
+                "next_cursor": next_cursor(foods, limit, "create_time")
             },
             msg="获取食品列表成功"
         )
 
+    except ValueError as e:
+        return ApiErrorResponse.create(
+            code="A00001",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            msg=str(e)
+        )
     except Exception as e:
         logger.error(f"获取食品列表失败: {str(e)}", exc_info=True)
         return ApiErrorResponse.create(
@@ -123,7 +133,7 @@ async def read_foods(
 @router.get("/{food_id}", response_model=ApiSuccessResponse)
 async def get_food(
     food_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """根据 ID 获取单个食品"""
     try:
@@ -154,7 +164,7 @@ async def get_food(
 async def update_food(
     food_id: int,
     food: FoodUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 更新单个食品"""
@@ -185,7 +195,7 @@ async def update_food(
 @router.delete("/{food_id}", response_model=ApiSuccessResponse)
 async def delete_food(
     food_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 删除单个食品"""
@@ -6,13 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.item import ItemCreate, ItemOut, ItemUpdate
 from app.models.user import User
+from app.schemas.user import TokenClaims
 from app.services.item_service import ItemService
-from app.core.dependencies import get_current_active_user, get_db
+from app.core.dependencies import get_current_active_user, get_current_active_claims, get_db, get_read_db
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse, ApiResponse
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.fast_response import ApiORJSONRoute
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ApiORJSONRoute)
 
 
 @router.post("/", response_model=ApiSuccessResponse)
@@ -55,15 +58,20 @@ async def create_item(
 async def read_items(
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    view: str = "full",
     title: Optional[str] = None,
     description: Optional[str] = None,
     owner_id: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """获取物品列表（支持条件查询和分页）"""
     try:
+        # 带游标时按 (创建时间, id) 定位，忽略 page
+        after = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * page_size
         limit = page_size
 
@@ -72,7 +80,7 @@ async def read_items(
                    f"min_price={min_price}, max_price={max_price}")
 
         item_service = ItemService()
-        items = await item_service.search_items(
+        result = await item_service.search_items_page(
             title=title,
             description=description,
             owner_id=owner_id,
@@ -80,28 +88,31 @@ async def read_items(
             max_price=max_price,
             db=db,
             skip=skip,
-            limit=limit
-        )
-
-        total = await item_service.search_items_count(
-            title=title,
-            description=description,
-            owner_id=owner_id,
-            min_price=min_price,
-            max_price=max_price,
-            db=db
+            limit=limit,
+            after=after,
+            total_mode=total_mode,
+            view=view
         )
+        items = result.rows
 
         return ApiSuccessResponse.create(
             data={
                 "items": items,
-                "total": total,
+                "total": result.total,
+                "total_exact": result.total_exact,
                 "page": page,
-                "page_size": page_size
+                "page_size": page_size,
+                "next_cursor": next_cursor(items, limit, "created_at")
             },
             msg="获取物品列表成功"
         )
 
+    except ValueError as e:
+        return ApiErrorResponse.create(
+            code="A00001",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            msg=str(e)
+        )
     except Exception as e:
         logger.error(f"获取物品列表失败: {str(e)}", exc_info=True)
         return ApiErrorResponse.create(
@@ -114,7 +125,7 @@ async def read_items(
 @router.get("/{item_id}", response_model=ApiSuccessResponse)
 async def get_item(
     item_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """根据 ID 获取单个物品"""
     try:
@@ -145,7 +156,7 @@ async def get_item(
 async def update_item(
     item_id: int,
     item: ItemUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 更新单个物品"""
@@ -176,7 +187,7 @@ async def update_item(
 @router.delete("/{item_id}", response_model=ApiSuccessResponse)
 async def delete_item(
     item_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenClaims = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """根据 ID 删除单个物品"""
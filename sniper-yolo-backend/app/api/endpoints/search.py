@@ -0,0 +1,58 @@
+"""全文检索API端点 - 跨美食、饮品、饭店的混合结果"""
+from typing import Optional
+import logging
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.search_service import SearchService, decode_search_cursor
+from app.core.dependencies import get_read_db
+from app.utils.response import ApiSuccessResponse, ApiErrorResponse
+from app.utils.fast_response import ApiORJSONRoute
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=ApiORJSONRoute)
+
+MAX_SEARCH_COUNT = 50
+
+
+@router.get("", response_model=ApiSuccessResponse)
+async def search(
+    q: str,
+    count: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+) -> ApiSuccessResponse:
+    """按相关度检索美食、饮品和饭店，结果带类型和高亮，使用游标翻页"""
+    try:
+        after = decode_search_cursor(cursor) if cursor else None
+        if count < 1 or count > MAX_SEARCH_COUNT:
+            raise ValueError(f"count 取值范围为 1-{MAX_SEARCH_COUNT}")
+
+        logger.info(f"全文检索，q={q}, count={count}, cursor={cursor}")
+
+        search_service = SearchService()
+        result = await search_service.search(q, db, limit=count, after=after)
+
+        return ApiSuccessResponse.create(
+            data={
+                "results": result["results"],
+                "count": count,
+                "next_cursor": result["next_cursor"]
+            },
+            msg="检索成功"
+        )
+
+    except ValueError as e:
+        return ApiErrorResponse.create(
+            code="A00001",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            msg=str(e)
+        )
+    except Exception as e:
+        logger.error(f"全文检索失败: {str(e)}", exc_info=True)
+        return ApiErrorResponse.create(
+            code="B00500",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            msg=f"服务器内部错误: {str(e)}"
+        )
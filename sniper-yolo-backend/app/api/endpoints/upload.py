@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Body, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any, List
 import json
 import time
@@ -7,6 +8,7 @@ import uuid
 
 from app.services.storage_service import storage_service
 from app.core.config import settings
+from app.core import timing
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse
 
 router = APIRouter()
@@ -307,7 +309,8 @@ async def upload_image(
         token = q.upload_token(settings.QINIU_BUCKET_NAME, unique_key, 3600)
 
         # 上传文件到七牛云
-        ret, info = put_data(token, unique_key, file_content)
+        with timing.phase("qiniu"):
+            ret, info = await run_in_threadpool(put_data, token, unique_key, file_content)
 
         # 检查上传是否成功
         if ret and ret.get('key'):
@@ -397,7 +400,8 @@ async def upload_images(
                 token = q.upload_token(settings.QINIU_BUCKET_NAME, unique_key, 3600)
 
                 # 上传文件到七牛云
-                ret, info = put_data(token, unique_key, file_content)
+                with timing.phase("qiniu"):
+                    ret, info = await run_in_threadpool(put_data, token, unique_key, file_content)
 
                 if ret and ret.get('key'):
                     # 生成完整的图片URL
@@ -1,15 +1,22 @@
 """用户相关API端点 - 使用统一响应格式和PostgreSQL"""
 import logging
-from typing import Any
-from fastapi import APIRouter, Depends, status
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate, UserLogin
+from app.schemas.user import UserCreate, UserUpdate, UserLogin, RefreshTokenRequest, TokenClaims
 from app.services.user_service import UserService
-from app.core.dependencies import get_current_active_user, get_db
-from app.core.security import create_access_token
+from app.services.session_service import SessionService
+from app.core.dependencies import get_current_active_user, get_current_claims, get_db, get_read_db
+from app.core.security import create_access_token, user_token_claims
+from app.core.hashing import PasswordHashBusyError
+from app.core.rate_limit import login_rate_limiter
+from app.core.config import settings
+from app.utils.asgi import get_client_ip
+from app.core import timing
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse
+from app.utils.pagination import decode_cursor, next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +28,7 @@ async def create_user(
     user_create: UserCreate,
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
-    """创建新用户 - 先验证后插入"""
+    """创建新用户 - 一次插入，唯一性冲突由数据库约束识别"""
     try:
         logger.info(f"尝试创建用户: {user_create.email}")
         user_service = UserService()
@@ -30,13 +37,15 @@ async def create_user(
         # 添加成功日志
         logger.info(f"用户创建成功: {user.username} ({user.email})")
 
-        # 生成访问令牌
-        access_token = create_access_token(subject=str(user.id))
+        # 开启登录会话：短期访问令牌 + 刷新令牌
+        access_token, refresh_token = await SessionService().create_session(user, db)
 
         return ApiSuccessResponse.create(
             data={
                 "access_token": access_token,
+                "refresh_token": refresh_token,
                 "token_type": "bearer",
+                "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
                 "user": {
                     "id": str(user.id),
                     "email": user.email,
@@ -51,6 +60,9 @@ async def create_user(
             status_code=status.HTTP_201_CREATED
         )
 
+    except PasswordHashBusyError:
+        # 交给全局处理器返回 503
+        raise
     except ValueError as e:
         # 添加验证错误日志
         logger.warning(f"用户创建验证失败: {str(e)}")
@@ -73,40 +85,57 @@ async def create_user(
 async def read_users(
     page: int = 1,
     page_size: int = 10,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    view: str = "full",
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
-    """获取用户列表"""
+    """获取用户列表；view=summary 只返回 id、用户名、状态和创建时间"""
     try:
+        # 带游标时按 (创建时间, id) 定位，忽略 page
+        after = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * page_size
         limit = page_size
         logger.info(f"获取用户列表，page={page}, page_size={page_size} (skip={skip}, limit={limit})")
         user_service = UserService()
-        users = await user_service.get_users(db, skip=skip, limit=limit)
+        result = await user_service.get_users_page(
+            db, skip=skip, limit=limit, after=after, total_mode=total_mode, view=view
+        )
 
         # 转换用户数据格式
         users_data = []
-        for user in users:
-            users_data.append({
-                "id": str(user.id),
-                "email": user.email,
-                "username": user.username,
-                "mobile": user.mobile,
-                "is_active": user.is_active,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "updated_at": user.updated_at.isoformat() if user.updated_at else None
-            })
-
-        total = await user_service.get_users_count(db)
+        with timing.phase("serialize"):
+            if view == "summary":
+                users_data = [User.summary_dict(row) for row in result.rows]
+            else:
+                for user in result.rows:
+                    users_data.append({
+                        "id": str(user.id),
+                        "email": user.email,
+                        "username": user.username,
+                        "mobile": user.mobile,
+                        "is_active": user.is_active,
+                        "created_at": user.created_at.isoformat() if user.created_at else None,
+                        "updated_at": user.updated_at.isoformat() if user.updated_at else None
+                    })
 
         return ApiSuccessResponse.create(
             data={
                 "users": users_data,
-                "total": total,
+                "total": result.total,
+                "total_exact": result.total_exact,
                 "page": page,
-                "page_size": page_size
+                "page_size": page_size,
+                "next_cursor": next_cursor(users_data, limit, "created_at")
             },
             msg="获取用户列表成功"
         )
+    except ValueError as e:
+        return ApiErrorResponse.create(
+            code="A00001",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            msg=str(e)
+        )
     except Exception as e:
         return ApiErrorResponse.create(
             code="B00500",
@@ -118,7 +147,7 @@ async def read_users(
 @router.get("/{user_id}", response_model=ApiSuccessResponse)
 async def read_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> ApiSuccessResponse:
     """根据ID获取用户信息"""
     try:
@@ -180,6 +209,9 @@ async def update_user(
             },
             msg="用户信息更新成功"
         )
+    except PasswordHashBusyError:
+        # 交给全局处理器返回 503
+        raise
     except ValueError as e:
         return ApiErrorResponse.create(
             code="A00001",
@@ -224,10 +256,16 @@ async def delete_user(
 
 @router.post("/login", response_model=ApiSuccessResponse)
 async def login_for_access_token(
+    request: Request,
     login_data: UserLogin,
     db: AsyncSession = Depends(get_db)
 ) -> ApiSuccessResponse:
     """用户登录并获取访问令牌"""
+    # 查库和密码哈希之前先限流，超限时由全局处理器返回 429
+    await login_rate_limiter.check(
+        login_data.identifier,
+        get_client_ip(request.scope, settings.CLIENT_IP_HEADER)
+    )
     try:
         user_service = UserService()
         user = await user_service.authenticate_user(login_data.identifier, login_data.password, db)
@@ -237,11 +275,13 @@ async def login_for_access_token(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 msg="用户名/邮箱/手机号或密码错误"
             )
-        access_token = create_access_token(subject=str(user.id))
+        access_token, refresh_token = await SessionService().create_session(user, db)
         return ApiSuccessResponse.create(
             data={
                 "access_token": access_token,
+                "refresh_token": refresh_token,
                 "token_type": "bearer",
+                "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
                 "user": {
                     "id": str(user.id),
                     "email": user.email,
@@ -255,6 +295,9 @@ async def login_for_access_token(
             msg="登录成功",
             status_code=status.HTTP_200_OK
         )
+    except PasswordHashBusyError:
+        # 交给全局处理器返回 503
+        raise
     except Exception as e:
         return ApiErrorResponse.create(
             code="C00500",
@@ -263,6 +306,69 @@ async def login_for_access_token(
         )
 
 
+@router.post("/token/refresh", response_model=ApiSuccessResponse)
+async def refresh_access_token(
+    refresh_data: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db)
+) -> ApiSuccessResponse:
+    """用刷新令牌换取新的访问令牌，刷新令牌同时轮换"""
+    try:
+        rotated = await SessionService().rotate(refresh_data.refresh_token, db)
+        if not rotated:
+            return ApiErrorResponse.create(
+                code="C00401",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                msg="刷新令牌无效或已过期，请重新登录"
+            )
+        user, access_token, refresh_token = rotated
+        return ApiSuccessResponse.create(
+            data={
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "token_type": "bearer",
+                "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            },
+            msg="令牌刷新成功",
+            status_code=status.HTTP_200_OK
+        )
+    except Exception as e:
+        logger.error(f"刷新令牌失败: {str(e)}", exc_info=True)
+        return ApiErrorResponse.create(
+            code="C00500",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            msg="刷新令牌过程中发生错误"
+        )
+
+
+@router.post("/logout", response_model=ApiSuccessResponse)
+async def logout(
+    all_sessions: bool = False,
+    current_user: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db)
+) -> ApiSuccessResponse:
+    """退出登录 - 撤销当前会话，all_sessions=true 时撤销该用户的全部会话"""
+    try:
+        session_service = SessionService()
+        if all_sessions:
+            revoked = len(await session_service.revoke_user_sessions(current_user.id, db))
+        elif current_user.session_id:
+            revoked = int(await session_service.revoke_session(current_user.session_id, db))
+        else:
+            # 旧令牌不属于任何会话，只能等它自然过期
+            revoked = 0
+        return ApiSuccessResponse.create(
+            data={"revoked_sessions": revoked},
+            msg="退出登录成功"
+        )
+    except Exception as e:
+        logger.error(f"退出登录失败: {str(e)}", exc_info=True)
+        return ApiErrorResponse.create(
+            code="B00500",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            msg="退出登录失败"
+        )
+
+
 @router.post("/test-login", response_model=ApiSuccessResponse)
 async def test_login(
     db: AsyncSession = Depends(get_db)
@@ -280,7 +386,7 @@ async def test_login(
             )
 
         # 生成token
-        access_token = create_access_token(subject=str(test_user.id))
+        access_token = create_access_token(subject=str(test_user.id), claims=user_token_claims(test_user))
         token_data = {
             "access_token": access_token,
             "token_type": "bearer"
@@ -1,7 +1,7 @@
 """Router summary using Starlette's Router."""
 from fastapi import APIRouter
 
-from app.api.endpoints import users, items, food, upload, enjoy, llm, drink
+from app.api.endpoints import users, items, food, upload, enjoy, llm, drink, admin, search
 
 api_router = APIRouter(redirect_slashes=False)
 
@@ -51,4 +51,18 @@ api_router.include_router(
     drink.router,
     prefix="/drinks",
     tags=["drinks"]
-)
\ No newline at end of file
+)
+
+# 添加全文检索路由
+api_router.include_router(
+    search.router,
+    prefix="/search",
+    tags=["search"]
+)
+
+# 添加管理端路由
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["admin"]
+)
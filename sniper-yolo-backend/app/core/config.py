@@ -31,9 +31,17 @@ class Settings(BaseSettings):
     
     # Security Settings
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7天 = 7 * 24 * 60 = 10080 分钟
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # 访问令牌短期有效，过期后用刷新令牌换新
     ALGORITHM: str = "HS256"
     
+    # Security Headers (name -> value), appended to every HTTP response
+    SECURITY_HEADERS: Dict[str, str] = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    }
+
     # CORS Settings
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
     
@@ -97,4 +105,116 @@ class Settings(BaseSettings):
         description="允许的文件类型"
     )
 
+    # 请求日志配置
+    LOG_LEVEL: str = Field(default="INFO", description="根日志级别")
+    LOG_QUEUE_MAXSIZE: int = Field(default=10000, description="日志队列容量，满了之后丢弃并计数")
+    LOG_REQUEST_DETAILS: Optional[bool] = Field(default=None, description="是否逐条记录请求头/请求体/响应体，默认跟随DEBUG")
+    ACCESS_LOG_SAMPLE_RATE: float = Field(default=1.0, description="访问日志默认采样率(0-1)")
+    ACCESS_LOG_SAMPLE_RATES: Dict[str, float] = Field(
+        default={"/health": 0.01},
+        description="按路由模板覆盖的采样率，如 {\"/api/v1/foods/\": 0.1}"
+    )
+    LOG_REQUEST_BODY_MAX_BYTES: int = Field(default=2048, description="请求体日志最多记录的字节数，0表示不记录")
+    LOG_RESPONSE_BODY_MAX_BYTES: int = Field(default=2048, description="响应体日志最多记录的字节数，0表示不记录")
+    LOG_BODY_CONTENT_TYPES: List[str] = Field(
+        default=["application/json", "text/plain", "application/x-www-form-urlencoded"],
+        description="允许记录body的Content-Type前缀，为空表示不限制"
+    )
+    LOG_BODY_CONTENT_TYPES_DENY: List[str] = Field(
+        default=["multipart/form-data", "application/octet-stream", "text/event-stream", "image/", "audio/", "video/"],
+        description="禁止记录body的Content-Type前缀，优先于允许列表"
+    )
+
+    # Server-Timing
+    SERVER_TIMING_HEADER: bool = Field(default=True, description="是否在响应中输出 Server-Timing 头")
+
+    # SQL统计 / N+1 检测
+    QUERY_STATS_HEADERS: Optional[bool] = Field(default=None, description="是否输出 X-DB-Query-Count/X-DB-Time-Ms 响应头，默认跟随DEBUG")
+    QUERY_COUNT_WARN_THRESHOLD: int = Field(default=10, description="单个请求SQL语句数超过该值时告警")
+    QUERY_REPEAT_WARN_THRESHOLD: int = Field(default=5, description="同一语句形状在单个请求内重复该次数时告警(疑似N+1)")
+
+    # 慢查询日志
+    SLOW_QUERY_THRESHOLD_MS: float = Field(default=200.0, description="SQL执行超过该毫秒数时记录慢查询")
+    SLOW_QUERY_BUFFER_SIZE: int = Field(default=100, description="内存中保留的慢查询条数")
+    SLOW_QUERY_EXPLAIN: bool = Field(default=False, description="是否对慢SELECT在旁路连接上异步执行 EXPLAIN (ANALYZE, BUFFERS)")
+    SLOW_QUERY_EXPLAIN_INTERVAL: float = Field(default=60.0, description="同一语句形状两次 EXPLAIN 的最小间隔(秒)")
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = Field(default=5000, description="EXPLAIN ANALYZE 的 statement_timeout(毫秒)")
+
+    # 按需采样分析
+    PROFILER_ENABLED: bool = Field(default=True, description="是否允许超级用户通过 X-Profile 头或管理接口采样")
+    PROFILER_INTERVAL_MS: float = Field(default=5.0, description="采样间隔(毫秒)")
+    PROFILER_MAX_STORED: int = Field(default=20, description="内存中保留的请求采样结果份数")
+    PROFILER_MAX_SECONDS: int = Field(default=60, description="全局采样会话的最长时长(秒)")
+
+    # 事件循环监控
+    LOOP_LAG_INTERVAL: float = Field(default=0.1, description="事件循环延迟采样间隔(秒)")
+    LOOP_BLOCK_THRESHOLD_MS: float = Field(default=100.0, description="事件循环被占用超过该毫秒数视为阻塞")
+    LOOP_BLOCK_WATCHDOG: Optional[bool] = Field(default=None, description="是否启用阻塞看门狗并记录调用栈，默认跟随DEBUG")
+
+    # 已认证用户缓存
+    USER_CACHE_TTL: float = Field(default=30.0, description="用户缓存有效期(秒)，0表示不缓存")
+    USER_CACHE_MAXSIZE: int = Field(default=10000, description="用户缓存最多条数，0表示不缓存")
+    USER_CACHE_NOTIFY: bool = Field(default=True, description="是否通过 PostgreSQL LISTEN/NOTIFY 在 worker 间广播缓存失效")
+
+    # 登录限流
+    LOGIN_RATE_LIMIT_ENABLED: bool = Field(default=True, description="是否启用登录限流")
+    LOGIN_RATE_IP_BURST: int = Field(default=20, description="单个IP的登录令牌桶容量")
+    LOGIN_RATE_IP_PER_MINUTE: float = Field(default=30.0, description="单个IP每分钟回填的登录次数")
+    LOGIN_RATE_IDENTIFIER_BURST: int = Field(default=5, description="单个登录标识(邮箱/手机号)的令牌桶容量")
+    LOGIN_RATE_IDENTIFIER_PER_MINUTE: float = Field(default=5.0, description="单个登录标识每分钟回填的登录次数")
+    LOGIN_RATE_MAX_KEYS: int = Field(default=100000, description="进程内每类限流最多跟踪的键数")
+    LOGIN_RATE_SWEEP_INTERVAL: float = Field(default=60.0, description="清理已回满令牌桶的间隔(秒)")
+    LOGIN_RATE_LIMIT_REDIS_URL: Optional[str] = Field(default=None, description="多worker共享限流的 Redis 地址，为空表示进程内限流")
+    CLIENT_IP_HEADER: str = Field(default="", description="反向代理写入客户端IP的请求头(如 X-Real-IP)，为空表示直接使用连接地址；只在应用只能经由会覆盖该请求头的代理访问时设置")
+
+    # 已验证JWT缓存
+    JWT_CACHE_MAXSIZE: int = Field(default=10000, description="已验证JWT缓存最多条数，0表示不缓存")
+    JWT_CACHE_TTL: float = Field(default=300.0, description="已验证JWT缓存有效期(秒)，不会超过令牌自身的exp")
+
+    # 令牌版本表
+    TOKEN_VERSION_REFRESH_INTERVAL: float = Field(default=30.0, description="令牌版本表从数据库刷新的间隔(秒)，即跨worker撤销的最长生效时间")
+
+    # 数据库连接池（每个 worker 一套，总连接数约为 worker数 × (DB_POOL_SIZE + DB_MAX_OVERFLOW)）
+    DB_POOL_SIZE: int = Field(default=10, description="连接池常驻连接数")
+    DB_MAX_OVERFLOW: int = Field(default=20, description="连接池满时允许额外创建的连接数")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, description="等待空闲连接的超时(秒)，超时视为连接池耗尽")
+    DB_POOL_RECYCLE: int = Field(default=1800, description="连接最长使用时间(秒)，超过后借出时重建，-1表示不回收")
+    DB_POOL_PRE_PING: bool = Field(default=True, description="借出连接前是否先探活")
+    DB_POOL_USE_LIFO: bool = Field(default=False, description="是否后进先出借出连接，让多余的空闲连接自然超时")
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, description="asyncpg 预编译语句缓存大小，经 PgBouncer 事务模式连接时设为0")
+    DB_COMMAND_TIMEOUT: Optional[float] = Field(default=None, description="asyncpg 单条语句超时(秒)，为空表示不限制")
+    DB_POOL_WAIT_WARN_MS: float = Field(default=100.0, description="借出连接等待超过该毫秒数时记录告警")
+
+    # 只读副本
+    DATABASE_REPLICA_URLS: List[str] = Field(default=[], description="只读副本连接地址(JSON数组)，为空表示读写都走主库")
+    REPLICA_HEALTH_CHECK_INTERVAL: float = Field(default=5.0, description="副本健康检查间隔(秒)")
+    REPLICA_HEALTH_CHECK_TIMEOUT: float = Field(default=2.0, description="单次副本健康检查超时(秒)")
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=10.0, description="复制延迟超过该秒数的副本不参与读流量")
+    READ_YOUR_WRITES_SECONDS: float = Field(default=5.0, description="用户写入后读请求固定走主库的时长(秒)，0表示不固定")
+
+    # 列表分页
+    ESTIMATED_COUNT_CACHE_TTL: float = Field(default=60.0, description="total_mode=estimate 时表行数估计的缓存时间(秒)")
+
+    # n-gram 检索词项旁表
+    SEARCH_INDEX_ENABLED: bool = Field(default=True, description="是否维护并使用美食/饮品/饭店的 n-gram 检索词项旁表，关闭时关键词过滤只用 ILIKE")
+    SEARCH_INDEX_SYNC_INTERVAL: float = Field(default=3600.0, description="检查并补齐缺失/过期词项的间隔(秒)；服务内的写入在同一事务里更新词项，不依赖该任务")
+    SEARCH_INDEX_SYNC_BATCH: int = Field(default=500, description="词项同步每批处理的行数")
+
+    # 刷新令牌与会话撤销
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=30, description="刷新令牌有效期(天)，每次轮换重新计算")
+    REVOCATION_REFRESH_INTERVAL: float = Field(default=5.0, description="撤销列表增量刷新间隔(秒)，即跨worker撤销的最长生效时间")
+    REVOCATION_FULL_REBUILD_INTERVAL: float = Field(default=600.0, description="撤销列表整体重建间隔(秒)，重建时丢弃访问令牌已全部过期的会话")
+    REVOCATION_BLOOM_CAPACITY: int = Field(default=100000, description="撤销布隆过滤器的预期会话数")
+    REVOCATION_BLOOM_ERROR_RATE: float = Field(default=0.001, description="撤销布隆过滤器的目标误判率")
+
+    # 密码哈希执行池
+    PASSWORD_HASH_EXECUTOR: str = Field(default="thread", description="密码哈希执行池类型: thread / process")
+    PASSWORD_HASH_WORKERS: Optional[int] = Field(default=None, description="密码哈希并发上限，默认 min(4, CPU核数)")
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=64, description="排队+执行中的哈希任务上限，超过时返回503")
+
+    # 指标配置
+    METRICS_ENABLED: bool = Field(default=True, description="是否开放 /metrics 端点")
+    METRICS_MULTIPROC_DIR: Optional[str] = Field(default=None, description="多worker指标快照目录，为空表示单进程模式")
+    METRICS_FLUSH_INTERVAL: float = Field(default=5.0, description="多进程模式下快照落盘间隔(秒)")
+
 settings = Settings()
\ No newline at end of file
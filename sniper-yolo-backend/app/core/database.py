@@ -1,13 +1,35 @@
-"""PostgreSQL数据库连接管理"""
+"""PostgreSQL数据库连接管理（主库 + 可选只读副本）"""
+import asyncio
+import itertools
 import logging
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 from app.core.config import settings
+from app.core.db_events import instrument_engine
+from app.core.db_pool import engine_options, instrument_pool
+from app.core.metrics import registry
 
 logger = logging.getLogger(__name__)
 
+db_read_routing_total = registry.counter(
+    "db_read_routing_total", "Read sessions handed out by target", ("target",)
+)
+db_replica_healthy = registry.gauge(
+    "db_replica_healthy", "Whether a read replica passed its last health check", ("replica",)
+)
+
+# 副本上 WAL 已全部回放（或本身就是主库，单实例充当副本时）视为无延迟；
+# 否则用最后回放事务的时间估算延迟
+_REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
 class Database:
     """PostgreSQL连接管理器"""
     DATABASE_URL: Optional[str] = settings.DATABASE_URL
@@ -15,18 +37,25 @@ class Database:
     engine = None
     async_session = None
 
+    # 只读副本：与 DATABASE_REPLICA_URLS 一一对应
+    replica_engines: List = []
+    replica_sessions: List = []
+    replica_healthy: List[bool] = []
+    _replica_cursor = itertools.count()
+
     @classmethod
     async def connect(cls):
         """连接PostgreSQL"""
         try:
             cls.engine = create_async_engine(
                 settings.DATABASE_URL,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True,
-                echo=False  # Set to True for SQL debug logging
+                echo=False,  # Set to True for SQL debug logging
+                **engine_options()
             )
 
+            instrument_engine(cls.engine)
+            instrument_pool(cls.engine)
+
             # Create async session factory
             cls.async_session = sessionmaker(
                 cls.engine,
@@ -36,6 +65,20 @@ class Database:
 
             logger.info("✅ PostgreSQL连接成功")
 
+            cls.replica_engines = []
+            cls.replica_sessions = []
+            for index, url in enumerate(settings.DATABASE_REPLICA_URLS):
+                replica = create_async_engine(url, echo=False, **engine_options())
+                instrument_engine(replica)
+                instrument_pool(replica, f"replica-{index}")
+                cls.replica_engines.append(replica)
+                cls.replica_sessions.append(
+                    sessionmaker(replica, class_=AsyncSession, expire_on_commit=False)
+                )
+            cls.replica_healthy = [True] * len(cls.replica_engines)
+            if cls.replica_engines:
+                logger.info(f"✅ 已配置 {len(cls.replica_engines)} 个只读副本")
+
         except Exception as e:
             logger.error(f"❌ PostgreSQL连接失败: {e}")
             raise
@@ -43,6 +86,11 @@ class Database:
     @classmethod
     async def close(cls):
         """关闭PostgreSQL连接"""
+        for replica in cls.replica_engines:
+            await replica.dispose()
+        cls.replica_engines = []
+        cls.replica_sessions = []
+        cls.replica_healthy = []
         if cls.engine:
             await cls.engine.dispose()
             logger.info("✅ PostgreSQL连接已关闭")
@@ -65,3 +113,57 @@ class Database:
         if cls.async_session:
             return cls.async_session()
         return None
+
+    @classmethod
+    def get_read_session(cls):
+        """轮询一个健康的只读副本；没有副本或全部不健康时回退主库"""
+        count = len(cls.replica_sessions)
+        if count:
+            start = next(cls._replica_cursor)
+            for offset in range(count):
+                index = (start + offset) % count
+                if cls.replica_healthy[index]:
+                    db_read_routing_total.inc("replica")
+                    return cls.replica_sessions[index]()
+            db_read_routing_total.inc("fallback")
+        return cls.async_session()
+
+    @classmethod
+    async def _ping_engine(cls, engine) -> bool:
+        """能连上且复制延迟不超过 REPLICA_MAX_LAG_SECONDS 视为健康"""
+        query = _REPLICA_LAG_SQL if engine.dialect.name == "postgresql" else "SELECT 0"
+        try:
+            async with engine.connect() as conn:
+                result = await asyncio.wait_for(conn.execute(text(query)), settings.REPLICA_HEALTH_CHECK_TIMEOUT)
+                lag = float(result.scalar() or 0)
+        except Exception:
+            return False
+        return lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    @classmethod
+    async def check_replicas(cls) -> List[bool]:
+        """探测所有副本，更新健康状态"""
+        results = await asyncio.gather(*(cls._ping_engine(engine) for engine in cls.replica_engines))
+        for index, healthy in enumerate(results):
+            if index < len(cls.replica_healthy) and cls.replica_healthy[index] != healthy:
+                if healthy:
+                    logger.info(f"只读副本 #{index} 恢复，重新参与读流量")
+                else:
+                    logger.warning(f"只读副本 #{index} 健康检查失败，读流量回退到其他副本或主库")
+            if index < len(cls.replica_healthy):
+                cls.replica_healthy[index] = healthy
+            db_replica_healthy.set(1 if healthy else 0, str(index))
+        return list(results)
+
+    @classmethod
+    async def run_replica_monitor(cls, interval: Optional[float] = None) -> None:
+        """常驻任务：定期做副本健康检查"""
+        interval = interval or settings.REPLICA_HEALTH_CHECK_INTERVAL
+        while True:
+            try:
+                await cls.check_replicas()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"只读副本健康检查失败: {e}")
+            await asyncio.sleep(interval)
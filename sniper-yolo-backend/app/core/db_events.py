@@ -0,0 +1,49 @@
+"""SQLAlchemy 语句级事件分发 - 一对 cursor 事件，多个观察者共享
+
+before/after_cursor_execute 只在引擎上注册一次，计算好耗时后依次调用
+通过 add_query_listener 注册的回调（请求计时、SQL计数、慢查询等），
+避免每个功能各自挂一套监听器。
+"""
+import logging
+import time
+from typing import Any, Callable, List
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# callback(statement, parameters, context, duration_seconds)
+QueryListener = Callable[[str, Any, Any, float], None]
+
+_listeners: List[QueryListener] = []
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    """注册语句执行完成后的回调"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+    for listener in _listeners:
+        try:
+            listener(statement, parameters, context, duration)
+        except Exception as e:
+            logger.warning(f"SQL事件回调失败: {e}")
+
+
+def instrument_engine(engine) -> None:
+    """给 (异步) 引擎挂上 cursor 事件；重复调用是安全的"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,231 @@
+"""可观测的数据库连接池 - 借出等待、占用数、溢出使用和连接年龄
+
+InstrumentedPool 继承异步引擎默认的 AsyncAdaptedQueuePool，只在
+``connect``（从池里取连接，必要时排队、新建或探活）外面计时；连接的
+建立和关闭通过池事件记录。等待超过 DB_POOL_WAIT_WARN_MS 时打印一条带池状态
+的告警，借出超时（池饥饿）单独计数并记录错误日志。
+
+主库和每个只读副本各有一个池，统计按池名（``primary``、``replica-0`` ...）
+分开保存，指标都带 ``pool`` 标签；管理接口只展示主库的池。
+
+所有计数在持有连接的线程里更新（异步引擎下就是事件循环线程），
+只做整数/浮点的加减，不加锁。
+"""
+import logging
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_POOL = "primary"
+
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+db_pool_checkout_timeouts_total = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT", ("pool",)
+)
+db_pool_waiting = registry.gauge(
+    "db_pool_waiting", "Coroutines currently waiting for a pooled connection", ("pool",)
+)
+db_pool_connection_events_total = registry.counter(
+    "db_pool_connection_events_total", "DBAPI connections opened/closed/invalidated by the pool", ("pool", "event")
+)
+db_pool_oldest_connection_age_seconds = registry.gauge(
+    "db_pool_oldest_connection_age_seconds", "Age of the oldest open pooled connection", ("pool",)
+)
+
+
+class PoolStats:
+    """借出等待的累计统计，供管理接口展示"""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.waiting = 0
+        self.peak_checked_out = 0
+        # id(ConnectionRecord) -> 建立时间(monotonic)
+        self.connections: Dict[int, float] = {}
+
+    def observe_checkout(self, waited: float, checked_out: int) -> None:
+        self.checkouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def connection_ages(self) -> Dict[str, float]:
+        now = time.monotonic()
+        ages = [now - created for created in self.connections.values()]
+        return {
+            "open": len(ages),
+            "oldest_seconds": round(max(ages), 3) if ages else 0.0,
+            "average_seconds": round(sum(ages) / len(ages), 3) if ages else 0.0,
+        }
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+
+
+# 池名 -> 统计；引擎 dispose 时池会被重建，统计按名字保存才能延续
+_stats: Dict[str, PoolStats] = {}
+
+
+def pool_stats(name: str = PRIMARY_POOL) -> PoolStats:
+    """某个连接池的统计，不存在时创建"""
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = PoolStats()
+    return stats
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """给借出路径计时的 AsyncAdaptedQueuePool"""
+
+    # instrument_pool 设置；计入哪一份统计、指标的 pool 标签
+    name = PRIMARY_POOL
+
+    @property
+    def stats(self) -> PoolStats:
+        return pool_stats(self.name)
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.name = self.name
+        return pool
+
+    def connect(self):
+        stats = self.stats
+        started = time.perf_counter()
+        stats.waiting += 1
+        db_pool_waiting.set(stats.waiting, self.name)
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            stats.timeouts += 1
+            db_pool_checkout_timeouts_total.inc(self.name)
+            logger.error(f"数据库连接池 {self.name} 借出超时({self._timeout}s)，连接池已耗尽: {self.status()}")
+            raise
+        finally:
+            stats.waiting -= 1
+            db_pool_waiting.set(stats.waiting, self.name)
+
+        waited = time.perf_counter() - started
+        db_pool_checkout_wait_seconds.observe(waited, self.name)
+        stats.observe_checkout(waited, self.checkedout())
+        if waited * 1000 >= settings.DB_POOL_WAIT_WARN_MS:
+            logger.warning(f"数据库连接池 {self.name} 借出等待 {waited * 1000:.1f}ms: {self.status()}")
+        return connection
+
+
+class _ConnectionListener:
+    """一个连接池的连接建立/关闭事件，记入该池自己的统计"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def connect(self, dbapi_connection, connection_record) -> None:
+        pool_stats(self.name).connections[id(connection_record)] = time.monotonic()
+        db_pool_connection_events_total.inc(self.name, "connect")
+
+    def close(self, dbapi_connection, connection_record) -> None:
+        pool_stats(self.name).connections.pop(id(connection_record), None)
+        db_pool_connection_events_total.inc(self.name, "close")
+
+    def invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        db_pool_connection_events_total.inc(self.name, "invalidate")
+
+
+_listeners: Dict[str, _ConnectionListener] = {}
+
+
+def instrument_pool(engine, name: str = PRIMARY_POOL) -> None:
+    """给引擎（或连接池）命名并挂上连接建立/关闭事件；重复调用是安全的"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = getattr(sync_engine, "pool", sync_engine)
+    if isinstance(pool, InstrumentedPool):
+        pool.name = name
+    listener = _listeners.get(name)
+    if listener is None:
+        listener = _listeners[name] = _ConnectionListener(name)
+    if not event.contains(sync_engine, "connect", listener.connect):
+        event.listen(sync_engine, "connect", listener.connect)
+        event.listen(sync_engine, "close", listener.close)
+        event.listen(sync_engine, "invalidate", listener.invalidate)
+
+
+def engine_options() -> Dict[str, Any]:
+    """create_async_engine 的连接池和 asyncpg 参数，全部来自 Settings"""
+    if settings.DATABASE_URL and settings.DATABASE_URL.startswith("sqlite"):
+        # SQLite 沿用 SQLAlchemy 的默认连接池
+        return {}
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
+    if settings.DATABASE_URL and settings.DATABASE_URL.startswith("postgresql+asyncpg"):
+        connect_args: Dict[str, Any] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+        if settings.DB_COMMAND_TIMEOUT is not None:
+            connect_args["command_timeout"] = settings.DB_COMMAND_TIMEOUT
+        options["connect_args"] = connect_args
+    return options
+
+
+def _collect_connection_age() -> None:
+    for name, stats in list(_stats.items()):
+        db_pool_oldest_connection_age_seconds.set(stats.connection_ages()["oldest_seconds"], name)
+
+
+registry.add_collector(_collect_connection_age)
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """当前连接池状态 + 启动以来的借出统计；统计只取这个引擎自己的池"""
+    pool = getattr(engine, "pool", None)
+    if pool is None or not hasattr(pool, "checkedout"):
+        return {"instrumented": False}
+
+    instrumented = isinstance(pool, InstrumentedPool)
+    name = pool.name if instrumented else PRIMARY_POOL
+    stats = pool_stats(name)
+    return {
+        "instrumented": instrumented,
+        "pool": name,
+        "config": {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "recycle": settings.DB_POOL_RECYCLE,
+            "pre_ping": settings.DB_POOL_PRE_PING,
+            "use_lifo": settings.DB_POOL_USE_LIFO,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        },
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "waiting": stats.waiting,
+        "peak_checked_out": stats.peak_checked_out,
+        "checkouts": stats.checkouts,
+        "checkout_wait_avg_ms": round(stats.wait_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+        "checkout_wait_max_ms": round(stats.wait_max * 1000, 3),
+        "checkout_timeouts": stats.timeouts,
+        "connections": stats.connection_ages(),
+    }
@@ -2,26 +2,74 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from jose import JWTError
 from starlette.requests import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.user import User
+from app.schemas.user import TokenClaims
 from app.services.user_service import UserService
 from app.services.llm_service import LLMService
-from app.core.database import Database
+from app.core.database import Database, db_read_routing_total
+from app.core.security import decode_access_token
+from app.core import read_your_writes, revocation, timing, token_versions
 
 security = HTTPBearer()
 
 
-async def get_db():
-    """Get database session dependency."""
+async def get_db(request: Request):
+    """Get database session dependency (primary).
+
+    Non-idempotent requests pin the client to the primary for reads during
+    the read-your-writes window, at both start and end of the request.
+    """
+    writer = None
+    if request.method not in read_your_writes.SAFE_METHODS:
+        writer = read_your_writes.client_key(request)
+        read_your_writes.pin(writer)
     async with Database.async_session() as session:
         try:
             yield session
         finally:
             await session.close()
+            read_your_writes.pin(writer)
+
+
+async def get_read_db(request: Request):
+    """Get a read-only database session: a healthy replica chosen round-robin,
+    or the primary when no replica is available or the client wrote recently."""
+    if Database.replica_sessions and read_your_writes.is_pinned(read_your_writes.client_key(request)):
+        db_read_routing_total.inc("pinned")
+        session = Database.async_session()
+    else:
+        session = Database.get_read_session()
+    async with session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def _credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def _decode_token(token: str) -> dict:
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+async def _check_session(payload: dict, db: AsyncSession) -> None:
+    """带 sid 的令牌检查会话是否已撤销；布隆过滤器命中时才会用到 db"""
+    session_id = payload.get("sid")
+    if session_id is not None and await revocation.is_revoked(session_id, db):
+        raise _credentials_exception("Session has been revoked")
 
 
 async def get_current_user(
@@ -30,36 +78,27 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user from JWT token."""
-    try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+    with timing.phase("auth"):
+        payload = _decode_token(credentials.credentials)
+        await _check_session(payload, db)
         user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
 
         # 从数据库获取用户 (user_id is string, convert to int)
         user_service = UserService()
-        user = await user_service.get_user(int(user_id), db)
+        user = await user_service.get_user_cached(int(user_id), db)
 
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        return user
-    except JWTError:
+    if not user:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
 
+    # 改密码/停用账号后旧令牌失效（未携带版本号的旧令牌视为版本0）
+    if payload.get("ver", 0) != (user.token_version or 0):
+        raise _credentials_exception("Token has been revoked")
+
+    return user
+
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
@@ -73,6 +112,76 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_active_superuser(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """Get current active superuser."""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough privileges"
+        )
+    return current_user
+
+
+async def get_current_claims(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> TokenClaims:
+    """Authorize from token claims alone; falls back to the database only for
+    legacy tokens or users missing from the token-version map."""
+    with timing.phase("auth"):
+        payload = _decode_token(credentials.credentials)
+        await _check_session(payload, db)
+        user_id = int(payload["sub"])
+
+        known_version = token_versions.get(user_id)
+        if known_version is not None and "ver" in payload and "is_active" in payload:
+            if payload["ver"] != known_version:
+                raise _credentials_exception("Token has been revoked")
+            return TokenClaims(
+                id=user_id,
+                is_active=payload["is_active"],
+                is_superuser=payload.get("is_superuser", False),
+                vip_level=payload.get("vip_level", 1),
+                token_version=payload["ver"],
+                session_id=payload.get("sid"),
+            )
+
+        # 旧令牌或版本表里没有该用户：回退到数据库（走用户缓存）
+        user = await UserService().get_user_cached(user_id, db)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    token_versions.put(user_id, user.token_version or 0)
+    if payload.get("ver", 0) != (user.token_version or 0):
+        raise _credentials_exception("Token has been revoked")
+    return TokenClaims(
+        id=user.id,
+        is_active=bool(user.is_active),
+        is_superuser=bool(user.is_superuser),
+        vip_level=user.vip_level if user.vip_level is not None else 1,
+        token_version=user.token_version or 0,
+        session_id=payload.get("sid"),
+    )
+
+
+async def get_current_active_claims(
+    claims: TokenClaims = Depends(get_current_claims)
+) -> TokenClaims:
+    """Get claims of the current active user without loading the user row."""
+    if not claims.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return claims
+
+
 def get_user_service() -> UserService:
     """获取用户服务实例"""
     return UserService()
@@ -85,3 +194,4 @@ def get_llm_service() -> LLMService:
         base_url=settings.LLM_BASE_URL,
         default_model=settings.LLM_DEFAULT_MODEL
     )
+
@@ -0,0 +1,85 @@
+"""有界的密码哈希执行池 - 把 pbkdf2 等CPU密集计算移出事件循环
+
+pbkdf2_hmac 计算时会释放GIL，默认的线程池就能真正并行；也可以通过
+PASSWORD_HASH_EXECUTOR=process 换成进程池。排队中的任务数超过
+PASSWORD_HASH_MAX_PENDING 时直接抛出 PasswordHashBusyError，由全局
+异常处理器返回 503 + Retry-After，而不是让登录风暴无限堆积。
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core import timing
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+password_hash_pending = registry.gauge(
+    "password_hash_pending", "Password hash jobs submitted and not yet finished"
+)
+password_hash_queue_depth = registry.gauge(
+    "password_hash_queue_depth", "Password hash jobs waiting for a free worker"
+)
+password_hash_rejected_total = registry.counter(
+    "password_hash_rejected_total", "Password hash jobs rejected because the queue was full"
+)
+
+
+class PasswordHashBusyError(Exception):
+    """哈希队列已满，调用方应尽快返回 503"""
+
+
+class BoundedHashExecutor:
+    """带并发上限和排队上限的执行池；计数只在事件循环线程里更新"""
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None, max_pending: int = 64):
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _update_gauges(self) -> None:
+        password_hash_pending.set(self.pending)
+        password_hash_queue_depth.set(max(self.pending - self.max_workers, 0))
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.max_pending
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.saturated:
+            password_hash_rejected_total.inc()
+            raise PasswordHashBusyError("密码哈希队列已满")
+        self.pending += 1
+        self._update_gauges()
+        try:
+            loop = asyncio.get_running_loop()
+            with timing.phase("hash"):
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            self._update_gauges()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = BoundedHashExecutor(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
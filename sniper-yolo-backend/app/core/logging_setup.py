@@ -0,0 +1,108 @@
+"""非阻塞日志管线：QueueHandler + 后台写线程 + 采样的结构化访问日志"""
+import json
+import logging
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+access_logger = logging.getLogger("app.access")
+
+_listener: Optional[QueueListener] = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """有界队列的QueueHandler：队列满时丢弃记录并计数，绝不阻塞事件循环"""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        """累计丢弃的日志条数"""
+        return self._dropped
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def setup_logging() -> None:
+    """把根日志器切换到队列模式，真正的格式化输出由后台线程完成"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    level = logging.getLevelName(settings.LOG_LEVEL.upper())
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_MAXSIZE)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """停止后台写线程，并把队列里剩余的记录刷出去"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_log_records() -> int:
+    """队列满时被丢弃的日志条数"""
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+def _sample_rate(route: str) -> float:
+    return settings.ACCESS_LOG_SAMPLE_RATES.get(route, settings.ACCESS_LOG_SAMPLE_RATE)
+
+
+def log_access(
+    method: str,
+    route: str,
+    status: int,
+    duration_ms: float,
+    bytes_in: int,
+    bytes_out: int,
+    **fields: Any,
+) -> None:
+    """按路由采样后输出一行JSON访问日志；5xx 总是记录"""
+    if status < 500:
+        rate = _sample_rate(route)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return
+
+    record: Dict[str, Any] = {
+        "method": method,
+        "route": route,
+        "status": status,
+        "duration_ms": round(duration_ms, 2),
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+    }
+    record.update(fields)
+    access_logger.info(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
@@ -0,0 +1,99 @@
+"""事件循环延迟监控 + 阻塞调用检测
+
+- 延迟监控：后台协程每隔 LOOP_LAG_INTERVAL 秒 sleep 一次，实际醒来时间
+  比预期晚多少就是循环的调度延迟，写入 event_loop_lag_seconds 直方图；
+  超过 LOOP_BLOCK_THRESHOLD_MS 时计入 event_loop_stalls_total。
+- 阻塞检测（LOOP_BLOCK_WATCHDOG，默认跟随DEBUG）：看门狗线程检查上面
+  协程的心跳，心跳超时说明某个回调正占着循环，此时直接抓取循环线程
+  当前的调用栈写入告警日志，每次卡顿只记录一次。
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+event_loop_stalls_total = registry.counter(
+    "event_loop_stalls_total", "Times the event loop was blocked longer than the threshold"
+)
+
+_heartbeat = 0.0
+
+
+async def monitor_lag(interval: Optional[float] = None) -> None:
+    """测量事件循环调度延迟并更新心跳"""
+    global _heartbeat
+    interval = interval or settings.LOOP_LAG_INTERVAL
+    threshold = settings.LOOP_BLOCK_THRESHOLD_MS / 1000
+    loop = asyncio.get_running_loop()
+    while True:
+        _heartbeat = time.monotonic()
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(loop.time() - expected, 0.0)
+        event_loop_lag_seconds.observe(lag)
+        if lag > threshold:
+            event_loop_stalls_total.inc()
+
+
+class BlockingWatchdog:
+    """心跳超时时抓取事件循环线程的调用栈"""
+
+    def __init__(self, loop_thread_id: int, interval: float, threshold: float):
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.threshold = threshold
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        reported = None
+        # 每次醒来检查心跳；允许正常 sleep 间隔，再超出阈值才算阻塞
+        while not self._stop.wait(self.threshold / 2):
+            beat = _heartbeat
+            if not beat:
+                continue
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for < self.threshold or reported == beat:
+                continue
+            reported = beat
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                "事件循环被阻塞超过 %.0fms，当前调用栈:\n%s", blocked_for * 1000, stack
+            )
+
+
+def start_watchdog() -> Optional[BlockingWatchdog]:
+    """在事件循环线程里调用；LOOP_BLOCK_WATCHDOG 关闭时返回 None"""
+    enabled = settings.LOOP_BLOCK_WATCHDOG
+    if enabled is None:
+        enabled = settings.DEBUG
+    if not enabled:
+        return None
+    watchdog = BlockingWatchdog(
+        threading.get_ident(),
+        settings.LOOP_LAG_INTERVAL,
+        settings.LOOP_BLOCK_THRESHOLD_MS / 1000,
+    )
+    watchdog.start()
+    return watchdog
@@ -0,0 +1,315 @@
+"""进程内指标注册表 - Prometheus 文本格式导出，支持多 worker 目录聚合
+
+所有指标更新都发生在事件循环线程里，只是对 dict 做一次查找和加法，
+不加锁。多 worker 部署时设置 METRICS_MULTIPROC_DIR：每个进程定期把
+自己的快照原子地写成 ``metrics_<pid>.json``，被抓取的那个 worker 合并
+目录里所有快照后输出。计数器/直方图对所有进程（含已退出的）求和，
+仪表盘只统计仍存活的进程。部署新版本前应清空该目录。
+"""
+import asyncio
+import json
+import logging
+import os
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def snapshot(self) -> Dict[str, object]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        values = self._values
+        values[labels] = values.get(labels, 0.0) + amount
+
+    def snapshot(self) -> Dict[str, object]:
+        return {"samples": [[list(k), v] for k, v in self._values.items()]}
+
+
+class Gauge(_Metric):
+    """可增可减的仪表盘；多进程下只统计存活进程之和"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        values = self._values
+        values[labels] = values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {"samples": [[list(k), v] for k, v in self._values.items()]}
+
+
+class Histogram(_Metric):
+    """固定桶直方图；每个标签组合存 [各桶计数..., +Inf计数, sum]"""
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        # 非累积地落到第一个 >= value 的桶里，导出时再做累加
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "buckets": list(self.buckets),
+            "samples": [[list(k), list(v)] for k, v in self._values.items()],
+        }
+
+
+class MetricsRegistry:
+    """指标注册表，负责快照、多进程合并和文本格式渲染"""
+
+    def __init__(self, multiproc_dir: Optional[str] = None):
+        self.multiproc_dir = multiproc_dir
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """注册抓取前执行的回调，用来刷新按需计算的仪表盘（如连接池状态）"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"指标采集回调失败: {e}")
+        return {
+            name: {
+                "type": m.type_name,
+                "help": m.documentation,
+                "labelnames": list(m.labelnames),
+                **m.snapshot(),
+            }
+            for name, m in self._metrics.items()
+        }
+
+    # ---- 多进程 ----
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiproc_dir, f"metrics_{pid}.json")
+
+    def flush(self) -> None:
+        """把本进程快照原子写入多进程目录"""
+        if not self.multiproc_dir:
+            return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load_all(self) -> Iterable[Tuple[bool, Dict[str, Dict[str, object]]]]:
+        for filename in os.listdir(self.multiproc_dir):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+            try:
+                pid = int(filename[len("metrics_"):-len(".json")])
+                with open(os.path.join(self.multiproc_dir, filename), encoding="utf-8") as f:
+                    data = json.load(f)
+            except (ValueError, OSError):
+                continue
+            yield _pid_alive(pid), data
+
+    def collect(self) -> Dict[str, Dict[str, object]]:
+        """返回需要导出的快照：单进程直接返回，多进程合并目录下所有快照"""
+        if not self.multiproc_dir:
+            return self.snapshot()
+
+        self.flush()
+        merged: Dict[str, Dict[str, object]] = {}
+        for alive, data in self._load_all():
+            for name, metric in data.items():
+                if metric["type"] == "gauge" and not alive:
+                    continue
+                target = merged.setdefault(name, {**metric, "samples": {}})
+                samples: Dict[LabelValues, object] = target["samples"]
+                for labels, value in metric["samples"]:
+                    key = tuple(labels)
+                    if metric["type"] == "histogram":
+                        current = samples.get(key)
+                        samples[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+                    else:
+                        samples[key] = samples.get(key, 0.0) + value
+        for metric in merged.values():
+            metric["samples"] = [[list(k), v] for k, v in metric["samples"].items()]
+        return merged
+
+    # ---- 渲染 ----
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        for name, metric in sorted(self.collect().items()):
+            labelnames = metric["labelnames"]
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for labels, value in metric["samples"]:
+                pairs = list(zip(labelnames, labels))
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(metric["buckets"], value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(pairs + [('le', _format_value(bound))])} {_format_value(cumulative)}")
+                cumulative += value[-2]
+                lines.append(f"{name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {_format_value(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = MetricsRegistry(settings.METRICS_MULTIPROC_DIR)
+
+# ---- HTTP ----
+http_requests_total = registry.counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "SQL statements issued per request", ("method", "route"),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+# ---- 业务错误码 ----
+api_errors_total = registry.counter(
+    "api_errors_total", "ApiErrorResponse envelopes by error code", ("code",)
+)
+
+# ---- 数据库连接池 ----
+db_pool_size = registry.gauge("db_pool_size", "Configured pool size", ("pool",))
+db_pool_checked_out = registry.gauge("db_pool_checked_out", "Connections currently checked out", ("pool",))
+db_pool_checked_in = registry.gauge("db_pool_checked_in", "Idle connections in the pool", ("pool",))
+db_pool_overflow = registry.gauge("db_pool_overflow", "Current overflow connections", ("pool",))
+
+
+def _collect_db_pool() -> None:
+    from app.core.database import Database
+
+    engines = [("primary", Database.engine)]
+    engines += [(f"replica-{index}", engine) for index, engine in enumerate(Database.replica_engines)]
+    for name, engine in engines:
+        pool = getattr(engine, "pool", None)
+        if pool is None or not hasattr(pool, "checkedout"):
+            continue
+        db_pool_size.set(pool.size(), name)
+        db_pool_checked_out.set(pool.checkedout(), name)
+        db_pool_checked_in.set(pool.checkedin(), name)
+        db_pool_overflow.set(max(pool.overflow(), 0), name)
+
+
+registry.add_collector(_collect_db_pool)
+
+
+async def run_flusher(interval: Optional[float] = None) -> None:
+    """多进程模式下定期落盘本进程快照，供其他 worker 被抓取时合并"""
+    interval = interval or settings.METRICS_FLUSH_INTERVAL
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            registry.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"指标快照落盘失败: {e}")
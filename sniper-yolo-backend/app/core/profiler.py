@@ -0,0 +1,159 @@
+"""按需采样分析器 - 后台线程定时抓取事件循环线程的调用栈
+
+不依赖信号，也不需要重启 uvicorn：有采样会话时才启动一个守护线程，
+每隔 PROFILER_INTERVAL_MS 读一次 ``sys._current_frames()`` 中事件循环
+线程的栈，按会话归类后输出 collapsed-stack 格式（flamegraph.pl /
+speedscope 可直接打开）。
+
+- 全局会话：记录循环线程上的所有栈（墙钟时间）。
+- 请求会话：只记录栈中包含该请求入口帧的样本；入口帧不在栈上说明
+  该请求正在等待I/O或其他任务占用了循环，计入 ``[awaiting]``。
+  同步依赖/端点在线程池里执行的部分不会被采到。
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from types import FrameType
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+AWAITING = "[awaiting]"
+
+
+class ProfileSession:
+    """一次采样会话；root 为 None 表示全局会话"""
+
+    def __init__(self, thread_id: int, root: Optional[FrameType] = None, name: str = ""):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.thread_id = thread_id
+        self.root = root
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = time.time()
+        self.duration = 0.0
+
+    def add(self, frames: List[FrameType]) -> None:
+        """frames 从叶子到根排列"""
+        self.samples += 1
+        if self.root is None:
+            self.stacks[_collapse(frames)] += 1
+            return
+        for i, frame in enumerate(frames):
+            if frame is self.root:
+                self.stacks[_collapse(frames[:i + 1])] += 1
+                return
+        self.stacks[AWAITING] += 1
+
+    def render(self) -> str:
+        """collapsed-stack 文本：每行 ``root;...;leaf count``"""
+        header = (
+            f"# {self.name} samples={self.samples} "
+            f"interval_ms={settings.PROFILER_INTERVAL_MS} duration_s={self.duration:.3f}\n"
+        )
+        body = "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+        return header + body + "\n"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    path = code.co_filename.replace("\\", "/").split("/")
+    module = "/".join(path[-2:])
+    return f"{name} ({module})".replace(";", ":")
+
+
+def _collapse(frames: List[FrameType]) -> str:
+    return ";".join(_frame_label(f) for f in reversed(frames))
+
+
+class StackSampler:
+    """采样线程：有会话时运行，会话全部结束后自动退出"""
+
+    def __init__(self):
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, session: ProfileSession) -> ProfileSession:
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession) -> ProfileSession:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        session.duration = time.time() - session.started_at
+        return session
+
+    def _run(self) -> None:
+        interval = settings.PROFILER_INTERVAL_MS / 1000
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+            current = sys._current_frames()
+            by_thread: Dict[int, List[FrameType]] = {}
+            for session in sessions:
+                frames = by_thread.get(session.thread_id)
+                if frames is None:
+                    frames = by_thread[session.thread_id] = _walk(current.get(session.thread_id))
+                session.add(frames)
+            del current, by_thread
+
+
+def _walk(frame: Optional[FrameType]) -> List[FrameType]:
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+sampler = StackSampler()
+
+_profiles: "OrderedDict[str, ProfileSession]" = OrderedDict()
+
+
+def start_request_profile(root: FrameType, name: str) -> ProfileSession:
+    """开始只针对当前请求的采样；root 为请求入口协程的帧"""
+    return sampler.start(ProfileSession(threading.get_ident(), root, name))
+
+
+def finish_request_profile(session: ProfileSession) -> None:
+    """结束采样并保存结果，只保留最近 PROFILER_MAX_STORED 份"""
+    sampler.stop(session)
+    session.root = None
+    _profiles[session.id] = session
+    while len(_profiles) > settings.PROFILER_MAX_STORED:
+        _profiles.popitem(last=False)
+    logger.info(f"请求采样完成: {session.name} id={session.id} samples={session.samples}")
+
+
+def get_profile(profile_id: str) -> Optional[ProfileSession]:
+    return _profiles.get(profile_id)
+
+
+async def profile_for(seconds: float) -> ProfileSession:
+    """全局采样 seconds 秒，返回聚合后的会话"""
+    session = sampler.start(ProfileSession(threading.get_ident(), name=f"global pid={os.getpid()}"))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop(session)
+    return session
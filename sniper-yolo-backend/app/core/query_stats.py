@@ -0,0 +1,66 @@
+"""每个请求的SQL语句计数、DB耗时和重复语句（N+1）检测"""
+import re
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from app.core.db_events import add_query_listener
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%\([^)]+\)s|%s|:\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """把语句归一化成“形状”：去掉字面量、占位符编号和 IN 列表长度"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """单个请求内的SQL统计"""
+
+    __slots__ = ("count", "total_time", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[normalize_sql(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """同一语句形状执行次数 >= threshold 的列表"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _record_query(statement, parameters, context, duration: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, duration)
+
+
+add_query_listener(_record_query)
@@ -0,0 +1,174 @@
+"""登录限流 - 按登录标识和客户端IP的令牌桶
+
+每个键一个令牌桶：容量为 burst，按 per_minute/60 的速率连续回填，相当于
+平滑的滑动窗口。本地实现只存 ``key -> (tokens, last)`` 两个浮点数，
+每 LOGIN_RATE_SWEEP_INTERVAL 秒在请求路径上顺手清理一次已回满的桶，
+键数超过上限时淘汰最早插入的键。
+
+配置 LOGIN_RATE_LIMIT_REDIS_URL 后改用 Redis + Lua 原子脚本，多个 worker
+共享同一组令牌桶；Redis 不可用时退回本地限流。
+
+超限的登录请求在查库和密码哈希之前就被拒绝（429 + Retry-After）。
+"""
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+login_rate_limited_total = registry.counter(
+    "login_rate_limited_total", "Login attempts rejected by the rate limiter", ("scope",)
+)
+
+
+class LoginRateLimitedError(Exception):
+    """登录尝试过于频繁"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("登录尝试过于频繁")
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """进程内令牌桶；只在事件循环线程里使用，不加锁"""
+
+    def __init__(self, capacity: float, per_minute: float, max_keys: int = 100000,
+                 sweep_interval: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """消耗一个令牌；允许时返回 0，否则返回需要等待的秒数"""
+        now = time.monotonic() if now is None else now
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = self.capacity
+        else:
+            tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            return (1.0 - tokens) / self.rate
+
+        self._buckets[key] = (tokens - 1.0, now)
+        if bucket is None and len(self._buckets) > self.max_keys:
+            # dict 保持插入顺序，淘汰最早出现的键
+            del self._buckets[next(iter(self._buckets))]
+        return 0.0
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """删除已经回满的桶，返回删除数量"""
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        full = [
+            key for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * self.rate >= self.capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+        return len(full)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# KEYS[1]=桶键  ARGV: capacity, rate(每秒), now(秒)
+_REDIS_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local last = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - last, 0) * rate)
+local retry = 0
+if tokens < 1 then
+  retry = (1 - tokens) / rate
+else
+  tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry)
+"""
+
+
+class RedisTokenBucketLimiter:
+    """Redis 上的共享令牌桶（redis 包按需导入）"""
+
+    def __init__(self, url: str, prefix: str, capacity: float, per_minute: float):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_SCRIPT)
+        self.prefix = prefix
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+
+    async def hit(self, key: str) -> float:
+        retry = await self._script(keys=[f"{self.prefix}:{key}"], args=[self.capacity, self.rate, time.time()])
+        return float(retry)
+
+
+class LoginRateLimiter:
+    """登录限流：先按IP，再按登录标识"""
+
+    def __init__(self):
+        self.local = {
+            "ip": TokenBucketLimiter(
+                settings.LOGIN_RATE_IP_BURST, settings.LOGIN_RATE_IP_PER_MINUTE,
+                settings.LOGIN_RATE_MAX_KEYS, settings.LOGIN_RATE_SWEEP_INTERVAL,
+            ),
+            "identifier": TokenBucketLimiter(
+                settings.LOGIN_RATE_IDENTIFIER_BURST, settings.LOGIN_RATE_IDENTIFIER_PER_MINUTE,
+                settings.LOGIN_RATE_MAX_KEYS, settings.LOGIN_RATE_SWEEP_INTERVAL,
+            ),
+        }
+        self.shared = None
+        if settings.LOGIN_RATE_LIMIT_REDIS_URL:
+            try:
+                self.shared = {
+                    "ip": RedisTokenBucketLimiter(
+                        settings.LOGIN_RATE_LIMIT_REDIS_URL, "login_rate:ip",
+                        settings.LOGIN_RATE_IP_BURST, settings.LOGIN_RATE_IP_PER_MINUTE,
+                    ),
+                    "identifier": RedisTokenBucketLimiter(
+                        settings.LOGIN_RATE_LIMIT_REDIS_URL, "login_rate:identifier",
+                        settings.LOGIN_RATE_IDENTIFIER_BURST, settings.LOGIN_RATE_IDENTIFIER_PER_MINUTE,
+                    ),
+                }
+            except ImportError:
+                logger.warning("未安装 redis 包，登录限流退回进程内模式")
+
+    async def _hit(self, scope: str, key: str) -> float:
+        if self.shared is not None:
+            try:
+                return await self.shared[scope].hit(key)
+            except Exception as e:
+                logger.warning(f"Redis 登录限流失败，退回进程内模式: {e}")
+        return self.local[scope].hit(key)
+
+    async def check(self, identifier: str, client_ip: Optional[str]) -> None:
+        """超限时抛出 LoginRateLimitedError"""
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return
+        for scope, key in (("ip", client_ip), ("identifier", identifier.strip().lower())):
+            if not key:
+                continue
+            retry_after = await self._hit(scope, key)
+            if retry_after > 0:
+                login_rate_limited_total.inc(scope)
+                raise LoginRateLimitedError(retry_after)
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -0,0 +1,49 @@
+"""读己之写 - 用户写入后的短时间内，读请求固定走主库
+
+副本有复制延迟，用户刚提交的修改可能还没回放到副本上。get_db 在
+非幂等请求（POST/PUT/PATCH/DELETE）开始和结束时调用 ``pin``，
+get_read_db 发现该客户端仍在 READ_YOUR_WRITES_SECONDS 窗口内时改用主库。
+
+客户端按访问令牌里的用户 id 区分，匿名请求按客户端IP。固定记录只在
+本进程内，多 worker 部署时不同 worker 之间不共享；副本延迟由
+REPLICA_MAX_LAG_SECONDS 兜底。
+"""
+from typing import Optional
+
+from jose import JWTError
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.utils.asgi import get_client_ip
+from app.utils.cache import TTLCache
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_pins = TTLCache(100000, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def client_key(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+        except JWTError:
+            subject = None
+        if subject is not None:
+            return f"user:{subject}"
+    ip = get_client_ip(request.scope, settings.CLIENT_IP_HEADER)
+    return f"ip:{ip}" if ip else None
+
+
+def pin(key: Optional[str]) -> None:
+    if key is not None and settings.READ_YOUR_WRITES_SECONDS > 0:
+        _pins.set(key, True)
+
+
+def is_pinned(key: Optional[str]) -> bool:
+    return key is not None and key in _pins
+
+
+def clear() -> None:
+    _pins.clear()
@@ -0,0 +1,156 @@
+"""会话撤销列表 - 进程内布隆过滤器，认证热路径不查库
+
+访问令牌里的 ``sid`` 对应 refresh_tokens.session_id。登出、刷新令牌
+重放等场景会给会话写入 ``revoked_at``。本进程把最近被撤销的会话 id
+放进布隆过滤器：
+
+- 每 REVOCATION_REFRESH_INTERVAL 秒只拉取 ``revoked_at`` 晚于水位线的行，
+  增量加入过滤器；
+- 每 REVOCATION_FULL_REBUILD_INTERVAL 秒整体重建一次，只保留最近
+  ACCESS_TOKEN_EXPIRE_MINUTES 内撤销的会话——更早撤销的会话，其访问
+  令牌都已过期，无需再拦截；
+- 本进程撤销会话时立即加入（``revoke_local``）。
+
+过滤器判定“不存在”时直接放行；判定“可能存在”时才查一次库确认，
+确认结果按会话 id 短期缓存，误判的会话不会每个请求都查库。
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.refresh_token import RefreshToken
+from app.utils.bloom import BloomFilter
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+revocation_checks_total = registry.counter(
+    "revocation_checks_total", "Session revocation checks on authenticated requests", ("result",)
+)
+revocation_filter_entries = registry.gauge(
+    "revocation_filter_entries", "Revoked sessions currently held in the Bloom filter"
+)
+
+# 提交较晚的事务可能写入早于水位线的 revoked_at，增量拉取时往回多看一段
+_OVERLAP = timedelta(seconds=30)
+
+_filter = BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+_watermark: Optional[datetime] = None
+_last_rebuild = 0.0
+# 查库确认过的结果：session_id -> 是否已撤销
+_confirmed = TTLCache(10000, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_false_positives = TTLCache(10000, settings.REVOCATION_REFRESH_INTERVAL)
+
+
+def _retention() -> timedelta:
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES) + _OVERLAP
+
+
+def revoke_local(session_ids: Iterable[str]) -> None:
+    """本进程撤销会话后立即生效，不等下一次刷新"""
+    for session_id in session_ids:
+        _filter.add(session_id)
+        _confirmed.set(session_id, True)
+        _false_positives.pop(session_id)
+    revocation_filter_entries.set(len(_filter))
+
+
+async def _session_revoked(session_id: str, db: AsyncSession) -> bool:
+    result = await db.execute(
+        select(RefreshToken.id)
+        .where(RefreshToken.session_id == session_id, RefreshToken.revoked_at.isnot(None))
+        .limit(1)
+    )
+    return result.first() is not None
+
+
+async def is_revoked(session_id: str, db: AsyncSession) -> bool:
+    """过滤器未命中时不访问 db；只有命中（含误判）才查库确认"""
+    if session_id in _confirmed:
+        revocation_checks_total.inc("revoked")
+        return True
+    if session_id not in _filter:
+        revocation_checks_total.inc("negative")
+        return False
+    if session_id in _false_positives:
+        revocation_checks_total.inc("false_positive")
+        return False
+
+    if await _session_revoked(session_id, db):
+        _confirmed.set(session_id, True)
+        revocation_checks_total.inc("revoked")
+        return True
+    _false_positives.set(session_id, True)
+    revocation_checks_total.inc("false_positive")
+    return False
+
+
+def clear() -> None:
+    global _filter, _watermark
+    _filter = BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+    _watermark = None
+    _confirmed.clear()
+    _false_positives.clear()
+    revocation_filter_entries.set(0)
+
+
+async def refresh(full: bool = False) -> int:
+    """增量拉取新撤销的会话；``full`` 时重建过滤器。返回本次读取的行数"""
+    global _filter, _watermark, _last_rebuild
+    from app.core.database import Database
+
+    now = datetime.now(timezone.utc)
+    full = full or _watermark is None
+    since = now - _retention() if full else _watermark - _OVERLAP
+
+    async with Database.async_session() as db:
+        result = await db.execute(
+            select(RefreshToken.session_id, RefreshToken.revoked_at)
+            .where(RefreshToken.revoked_at >= since)
+        )
+        rows = result.all()
+
+    if full:
+        capacity = settings.REVOCATION_BLOOM_CAPACITY
+        if len(rows) > capacity // 2:
+            logger.warning(f"撤销会话数 {len(rows)} 接近布隆过滤器容量 {capacity}，本次按两倍行数分配")
+            capacity = len(rows) * 2
+        rebuilt = BloomFilter(capacity, settings.REVOCATION_BLOOM_ERROR_RATE)
+        # 查询之后才提交的撤销不在 rows 里：本进程的已在 _confirmed，其他的由下一次增量补上
+        rebuilt.update(session_id for session_id, _ in rows)
+        _filter = rebuilt
+        _last_rebuild = time.monotonic()
+    else:
+        _filter.update(session_id for session_id, _ in rows)
+
+    # 重建后水位线从保留窗口起点算起，已丢弃的旧会话不会被增量拉回来
+    base = since if full else _watermark
+    latest = max((revoked_at for _, revoked_at in rows), default=None)
+    if latest is not None and latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    _watermark = max(latest, base) if latest is not None else base
+    revocation_filter_entries.set(len(_filter))
+    return len(rows)
+
+
+async def run_refresher(interval: Optional[float] = None) -> None:
+    """常驻任务：定期增量刷新，按 REVOCATION_FULL_REBUILD_INTERVAL 整体重建"""
+    interval = interval or settings.REVOCATION_REFRESH_INTERVAL
+    while True:
+        try:
+            full = time.monotonic() - _last_rebuild >= settings.REVOCATION_FULL_REBUILD_INTERVAL
+            count = await refresh(full=full)
+            if count:
+                logger.debug(f"撤销列表已刷新: {count} 条")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"撤销列表刷新失败: {e}")
+        await asyncio.sleep(interval)
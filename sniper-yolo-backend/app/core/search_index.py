@@ -0,0 +1,217 @@
+"""中文关键词检索 - 美食、饮品、饭店的 n-gram 倒排索引
+
+PostgreSQL 自带的文本检索配置不切分中文，``ILIKE '%x%'`` 也用不上 btree
+索引（数据库是 C locale 时 pg_trgm 也不处理汉字）。每篇文档的 n-gram 词项
+（见 app.utils.ngrams）存在旁表 ``<kind>_search_terms`` 里（迁移 008），
+``terms`` 上的 GIN 索引就是倒排索引，posting list 由数据库压缩存储，
+各 worker 不在内存里各持一份：
+
+- 服务的创建/更新在同一个事务里写词项（``index_document``），删除由外键
+  级联；提交后所有 worker 立刻可见，没有跨 worker 的同步延迟；
+- 存量数据和绕过服务的写入（脚本、手工 SQL）由后台任务 ``run_sync`` 补齐：
+  按 ``coalesce(update_time, create_time)`` 找出缺失或过期的词项，分批在
+  线程池里切词后写回，多个 worker 用 advisory lock 错开。这类写入在下一次
+  同步（SEARCH_INDEX_SYNC_INTERVAL）之前搜不到；
+- ``match_condition`` 先用 ``terms @> 查询词项`` 取候选，再用和回退路径
+  完全相同的 ILIKE 条件复核。查询词项只会多取候选、不会漏掉 ILIKE 能
+  命中的行，所以两条路径返回同样的结果，索引只决定快慢。本进程第一次
+  同步完成前（存量数据可能还没有词项）只用 ILIKE。
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.drink import Drink
+from app.models.enjoy import Enjoy
+from app.models.food import Food
+from app.models.search_terms import DrinkSearchTerms, EnjoySearchTerms, FoodSearchTerms
+from app.utils.ngrams import document_terms, query_terms
+
+logger = logging.getLogger(__name__)
+
+search_index_lookups_total = registry.counter(
+    "search_index_lookups_total", "Keyword filters answered through the n-gram index or by ILIKE alone", ("kind", "source")
+)
+search_index_synced_total = registry.counter(
+    "search_index_synced_total", "Rows whose missing or stale n-gram terms were written by the sync task", ("kind",)
+)
+
+# 类型 -> (模型, 词项旁表, 被索引的列)；数组列按空格拼接
+INDEXED_FIELDS = {
+    "food": (Food, FoodSearchTerms, ("title", "content")),
+    "drink": (Drink, DrinkSearchTerms, ("title", "content")),
+    "enjoy": (Enjoy, EnjoySearchTerms, ("title", "content", "recommend_dishes")),
+}
+
+# pg_try_advisory_xact_lock 的键，加上类型序号；只在同步任务之间互斥
+_SYNC_LOCK_KEY = 0x5E4C0000
+# 同步被其他 worker 占用或出错时的重试间隔(秒)
+_RETRY_INTERVAL = 5.0
+
+_ready = False
+
+
+def document_text(kind: str, obj: Any) -> str:
+    """被索引列拼成的文本；``obj`` 可以是实体或查询结果行"""
+    _, _, fields = INDEXED_FIELDS[kind]
+    parts = []
+    for field in fields:
+        value = getattr(obj, field, None)
+        if not value:
+            continue
+        parts.append(" ".join(value) if isinstance(value, (list, tuple)) else str(value))
+    return " ".join(parts)
+
+
+def _terms_row(kind: str, obj: Any, changed_at: Any) -> Dict[str, Any]:
+    return {"doc_id": obj.id, "terms": sorted(document_terms(document_text(kind, obj))), "changed_at": changed_at}
+
+
+def _changed_at(model: Any):
+    return func.coalesce(model.update_time, model.create_time)
+
+
+def _upsert(kind: str, rows: List[Dict[str, Any]], current_only: bool = False):
+    """写入或替换词项；``current_only`` 时只在业务行没有再次变更时写入"""
+    model, terms_model, _ = INDEXED_FIELDS[kind]
+    table = terms_model.__table__
+    stmt = insert(table).values(rows)
+    where = None
+    if current_only:
+        # 同步任务读到的版本可能已被服务的更新取代，这时保留服务写入的词项
+        current = select(_changed_at(model)).where(model.id == stmt.excluded.doc_id).scalar_subquery()
+        where = stmt.excluded.changed_at.is_not_distinct_from(current)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.doc_id],
+        set_={"terms": stmt.excluded.terms, "changed_at": stmt.excluded.changed_at},
+        where=where,
+    )
+
+
+async def index_document(db: AsyncSession, kind: str, obj: Any) -> None:
+    """在调用方的事务里写入一篇文档的词项，随业务数据一起提交；新建时先 flush 拿到 id"""
+    if not settings.SEARCH_INDEX_ENABLED or db.get_bind().dialect.name != "postgresql":
+        return
+    row = _terms_row(kind, obj, obj.update_time or obj.create_time)
+    await db.execute(_upsert(kind, [row]))
+
+
+def is_ready() -> bool:
+    return settings.SEARCH_INDEX_ENABLED and _ready
+
+
+def _like_pattern(term: str) -> str:
+    """``%term%``；term 里的 LIKE 通配符按字面匹配（PostgreSQL 默认转义符是反斜杠）"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def ilike_condition(kind: str, q: str):
+    """每个空白分隔的词在任一被索引列里 ILIKE 命中；两条路径最终都以它为准"""
+    model, _, fields = INDEXED_FIELDS[kind]
+    columns = []
+    for field in fields:
+        column = getattr(model, field)
+        if isinstance(column.type, ARRAY):
+            column = func.array_to_string(column, " ")
+        columns.append(column)
+    return and_(*[or_(*[column.ilike(_like_pattern(term)) for column in columns]) for term in q.split()])
+
+
+def indexed_condition(kind: str, q: str):
+    """倒排索引取候选再用 ILIKE 复核；索引未就绪或查询没有可检索字符时返回 None"""
+    if not is_ready():
+        return None
+    terms = query_terms(q)
+    if not terms:
+        return None
+    model, terms_model, _ = INDEXED_FIELDS[kind]
+    candidates = select(terms_model.doc_id).where(terms_model.terms.contains(sorted(terms)))
+    return and_(model.id.in_(candidates), ilike_condition(kind, q))
+
+
+def match_condition(kind: str, q: str):
+    """关键词过滤条件，和其他结构化条件一起交给数据库求交集"""
+    condition = indexed_condition(kind, q)
+    if condition is not None:
+        search_index_lookups_total.inc(kind, "index")
+        return condition
+    search_index_lookups_total.inc(kind, "ilike")
+    return ilike_condition(kind, q)
+
+
+def _tokenize(kind: str, rows: List[Any]) -> List[Dict[str, Any]]:
+    return [_terms_row(kind, row, row.changed_at) for row in rows]
+
+
+async def _sync_batch(kind: str, position: int) -> Optional[int]:
+    """补齐一批缺失或过期的词项；返回处理的行数，其他 worker 正在处理时返回 None"""
+    from app.core.database import Database
+
+    model, terms_model, fields = INDEXED_FIELDS[kind]
+    changed_at = _changed_at(model)
+    query = (
+        select(model.id, changed_at.label("changed_at"), *[getattr(model, field) for field in fields])
+        .outerjoin(terms_model, terms_model.doc_id == model.id)
+        .where(or_(terms_model.doc_id.is_(None), terms_model.changed_at.is_distinct_from(changed_at)))
+        .order_by(model.id)
+        .limit(settings.SEARCH_INDEX_SYNC_BATCH)
+    )
+    async with Database.async_session() as db:
+        locked = await db.execute(select(func.pg_try_advisory_xact_lock(_SYNC_LOCK_KEY + position)))
+        if not locked.scalar():
+            return None
+        rows = (await db.execute(query)).all()
+        if rows:
+            # 切词是纯 CPU 计算，放到线程池里，不占用事件循环
+            values = await run_in_threadpool(_tokenize, kind, rows)
+            await db.execute(_upsert(kind, values, current_only=True))
+        await db.commit()
+    search_index_synced_total.inc(kind, amount=len(rows))
+    return len(rows)
+
+
+async def sync() -> Optional[int]:
+    """补齐全部类型缺失或过期的词项；返回处理的行数，与其他 worker 冲突时返回 None"""
+    total = 0
+    for position, kind in enumerate(INDEXED_FIELDS):
+        while True:
+            count = await _sync_batch(kind, position)
+            if count is None:
+                return None
+            total += count
+            if count < settings.SEARCH_INDEX_SYNC_BATCH:
+                break
+    return total
+
+
+def clear() -> None:
+    """测试用：回到未就绪状态"""
+    global _ready
+    _ready = False
+
+
+async def run_sync(interval: Optional[float] = None) -> None:
+    """常驻任务：启动时补齐存量词项，之后定期检查绕过服务写入的行"""
+    global _ready
+    interval = interval or settings.SEARCH_INDEX_SYNC_INTERVAL
+    while True:
+        try:
+            count = await sync()
+            if count is not None:
+                if count:
+                    logger.info(f"检索词项已同步: {count} 行")
+                _ready = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            count = None
+            logger.warning(f"检索词项同步失败: {e}")
+        await asyncio.sleep(interval if _ready and count is not None else _RETRY_INTERVAL)
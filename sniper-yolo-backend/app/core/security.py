@@ -1,14 +1,16 @@
 """Pydantic validation + Starlette middleware for authentication."""
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.metrics import registry
+from app.utils.cache import TTLCache
 
 # 修改pwd_context配置，使用PBKDF2替代bcrypt
 pwd_context = CryptContext(
@@ -28,12 +30,23 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bounded hashing pool (raises PasswordHashBusyError when saturated)."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bounded hashing pool (raises PasswordHashBusyError when saturated)."""
+    return await password_hasher.run(get_password_hash, password)
+
+
 # 在 security.py 中，create_access_token 函数负责生成 JWT 令牌
 def create_access_token(
     subject: str,
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None
 ) -> str:
-    """Create a JWT access token."""
+    """Create a JWT access token, optionally embedding extra claims (see user_token_claims)."""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -42,6 +55,8 @@ def create_access_token(
         )
     
     to_encode = {"exp": expire, "sub": str(subject)}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -50,16 +65,71 @@ def create_access_token(
     return encoded_jwt
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses."""
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        return response
\ No newline at end of file
+jwt_cache_requests_total = registry.counter(
+    "jwt_cache_requests_total", "Verified-JWT memo cache lookups", ("result",)
+)
+
+# sha256(token) -> 已验证的 payload；过期时间取 JWT_CACHE_TTL 与令牌 exp 的较早者
+_decoded_tokens = TTLCache(settings.JWT_CACHE_MAXSIZE, settings.JWT_CACHE_TTL)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify and decode a JWT access token, memoized by token digest.
+
+    Raises JWTError for invalid or expired tokens; failures are never cached.
+    Returns a copy, so callers may modify the result.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _decoded_tokens.get(key)
+    if payload is not None:
+        jwt_cache_requests_total.inc("hit")
+        return dict(payload)
+
+    jwt_cache_requests_total.inc("miss")
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    ttl = settings.JWT_CACHE_TTL if exp is None else min(settings.JWT_CACHE_TTL, exp - time.time())
+    if ttl > 0:
+        _decoded_tokens.set(key, payload, ttl)
+    return dict(payload)
+
+
+def user_token_claims(user: Any) -> Dict[str, Any]:
+    """Claims that let read-only routes authorize without loading the user row."""
+    return {
+        "is_active": bool(user.is_active),
+        "is_superuser": bool(user.is_superuser),
+        "vip_level": user.vip_level if user.vip_level is not None else 1,
+        "ver": user.token_version or 0,
+    }
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses.
+
+    Pure ASGI: the header block is encoded once at startup and appended to the
+    ``http.response.start`` message, so there is no extra task or memory-stream
+    hop per request as with BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp, headers: Optional[Dict[str, str]] = None) -> None:
+        self.app = app
+        headers = settings.SECURITY_HEADERS if headers is None else headers
+        self.raw_headers: Tuple[Tuple[bytes, bytes], ...] = tuple(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.raw_headers:
+            await self.app(scope, receive, send)
+            return
+
+        raw_headers = self.raw_headers
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *raw_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,147 @@
+"""慢查询日志 - 记录归一化SQL、参数形状、调用的服务方法，可选异步 EXPLAIN
+
+超过 SLOW_QUERY_THRESHOLD_MS 的语句会被记录到日志和内存环形缓冲区。
+开启 SLOW_QUERY_EXPLAIN 后，SELECT 语句会在旁路连接上用同样的参数重新
+执行 ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)``（在事务里执行并回滚），
+执行计划写回缓冲区里对应的条目，超级用户通过 /admin/slow-queries 查看。
+同一语句形状在 SLOW_QUERY_EXPLAIN_INTERVAL 秒内只 EXPLAIN 一次。
+"""
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.db_events import add_query_listener
+from app.core.query_stats import normalize_sql
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover - greenlet 随 SQLAlchemy asyncio 一起安装
+    greenlet = None
+
+logger = logging.getLogger(__name__)
+
+_buffer: Deque[Dict[str, Any]] = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+_last_explained: Dict[str, float] = {}
+_pending: Set[asyncio.Task] = set()
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+
+def describe_parameters(parameters: Any) -> Any:
+    """只保留参数的类型结构，不记录值"""
+    if isinstance(parameters, dict):
+        return {k: describe_parameters(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [describe_parameters(v) for v in parameters]
+    return type(parameters).__name__
+
+
+def _iter_frames():
+    frame = sys._getframe(2)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    # AsyncSession 的同步部分跑在子 greenlet 里，调用方协程的栈挂在父 greenlet 上
+    if greenlet is not None:
+        current = greenlet.getcurrent()
+        while current.parent is not None:
+            current = current.parent
+            frame = current.gr_frame
+            while frame is not None:
+                yield frame
+                frame = frame.f_back
+
+
+def find_caller() -> Optional[str]:
+    """找到发起查询的服务方法，如 FoodService.search_foods_page"""
+    fallback = None
+    for frame in _iter_frames():
+        filename = frame.f_code.co_filename.replace("\\", "/")
+        if "/app/" not in filename or "/app/core/" in filename:
+            continue
+        name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+        if "/app/services/" in filename:
+            return name
+        if fallback is None:
+            fallback = name
+    return fallback
+
+
+def recent(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """最近的慢查询，最新的在前"""
+    entries = list(reversed(_buffer))
+    return entries[:limit] if limit else entries
+
+
+def clear() -> None:
+    _buffer.clear()
+    _last_explained.clear()
+
+
+def _should_explain(statement: str, shape: str) -> bool:
+    if not settings.SLOW_QUERY_EXPLAIN:
+        return False
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return False
+    now = time.monotonic()
+    last = _last_explained.get(shape)
+    if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+        return False
+    _last_explained[shape] = now
+    return True
+
+
+async def _explain(entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+    from app.core.database import Database
+
+    _explaining.set(True)
+    try:
+        async with Database.engine.connect() as conn:
+            await conn.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"
+            )
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+            )
+            entry["plan"] = result.scalar()
+            await conn.rollback()
+    except Exception as e:
+        entry["plan_error"] = str(e)
+        logger.warning(f"慢查询 EXPLAIN 失败: {e}")
+
+
+def _record_query(statement, parameters, context, duration: float) -> None:
+    if duration * 1000 < settings.SLOW_QUERY_THRESHOLD_MS or _explaining.get():
+        return
+
+    shape = normalize_sql(statement)
+    entry: Dict[str, Any] = {
+        "time": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(duration * 1000, 2),
+        "sql": shape,
+        "params": describe_parameters(parameters),
+        "caller": find_caller(),
+        "plan": None,
+    }
+    _buffer.append(entry)
+    logger.warning(
+        "慢查询 %.2fms [%s] %s params=%s",
+        entry["duration_ms"], entry["caller"], shape, entry["params"],
+    )
+
+    if _should_explain(statement, shape):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(_explain(entry, statement, parameters))
+        _pending.add(task)
+        task.add_done_callback(_pending.discard)
+
+
+add_query_listener(_record_query)
@@ -0,0 +1,92 @@
+"""请求内分阶段计时 - 基于 contextvar，输出为 Server-Timing 头和访问日志字段
+
+用法::
+
+    with timing.phase("auth"):
+        ...
+
+阶段可以嵌套（例如 auth 里包含了查用户的 db 时间），同名阶段会累加。
+在没有活动请求的上下文（脚本、后台任务）里调用是无操作的。
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from app.core.db_events import add_query_listener
+
+
+class ServerTiming:
+    """单个请求的阶段耗时累加器"""
+
+    __slots__ = ("_phases",)
+
+    def __init__(self) -> None:
+        # name -> [总耗时(秒), 次数]
+        self._phases: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self._phases.get(name)
+        if entry is None:
+            self._phases[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        """{阶段: 毫秒}，用于访问日志"""
+        return {name: round(total * 1000, 2) for name, (total, _) in self._phases.items()}
+
+    def header_value(self, total: Optional[float] = None) -> str:
+        """格式化为 Server-Timing 头，例如 ``db;dur=3.20;desc="2x", app;dur=9.10``"""
+        parts = []
+        for name, (seconds, count) in self._phases.items():
+            part = f"{name};dur={seconds * 1000:.2f}"
+            if count > 1:
+                part += f';desc="{int(count)}x"'
+            parts.append(part)
+        if total is not None:
+            parts.append(f"app;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+def start_request() -> ServerTiming:
+    """为当前请求创建并绑定一个计时器"""
+    collector = ServerTiming()
+    _current.set(collector)
+    return collector
+
+
+def current() -> Optional[ServerTiming]:
+    return _current.get()
+
+
+def record(name: str, seconds: float) -> None:
+    """把一段已测得的耗时记到当前请求上"""
+    collector = _current.get()
+    if collector is not None:
+        collector.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """统计 with 块的耗时"""
+    collector = _current.get()
+    if collector is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector.add(name, time.perf_counter() - start)
+
+
+def _record_query(statement, parameters, context, duration: float) -> None:
+    record("db", duration)
+
+
+add_query_listener(_record_query)
@@ -0,0 +1,71 @@
+"""用户令牌版本表 - 让只读接口凭令牌里的声明鉴权，无需查库
+
+令牌里带 ``ver``（签发时的 users.token_version）。改密码、停用账号时
+版本号递增，旧令牌随之失效。本进程维护 user id -> 版本号 的映射：
+
+- 每 TOKEN_VERSION_REFRESH_INTERVAL 秒从数据库整表刷新一次；
+- 本进程修改用户时立即写入（``put`` / ``discard``）；
+- 其他 worker 的修改通过用户缓存的失效通知到达，直接 ``discard``，
+  下一次请求会回退到数据库读取最新版本。
+
+映射里没有的用户一律回退查库，所以撤销最迟在一个刷新周期内生效。
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import select
+
+from app.core import user_cache
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_versions: Dict[int, int] = {}
+
+
+def get(user_id: int) -> Optional[int]:
+    return _versions.get(user_id)
+
+
+def put(user_id: int, version: int) -> None:
+    _versions[user_id] = version
+
+
+def discard(user_id: int) -> None:
+    _versions.pop(user_id, None)
+
+
+def clear() -> None:
+    _versions.clear()
+
+
+user_cache.add_subscriber(discard)
+
+
+async def refresh() -> int:
+    """从数据库整表加载版本号；版本只增不减，保留本地更新的较大值"""
+    global _versions
+    from app.core.database import Database
+
+    async with Database.async_session() as db:
+        result = await db.execute(select(User.id, User.token_version))
+        rows = result.all()
+    current = _versions
+    _versions = {user_id: max(version, current.get(user_id, version)) for user_id, version in rows}
+    return len(_versions)
+
+
+async def run_refresher(interval: Optional[float] = None) -> None:
+    """常驻任务：定期刷新版本表"""
+    interval = interval or settings.TOKEN_VERSION_REFRESH_INTERVAL
+    while True:
+        try:
+            count = await refresh()
+            logger.debug(f"令牌版本表已刷新: {count} 个用户")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"令牌版本表刷新失败: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,136 @@
+"""已认证用户的进程内缓存 + 跨 worker 失效通知
+
+get_current_user 每个请求都要按 id 查一次 users 表，而用户行几乎不变。
+这里按 user id 缓存列值快照（USER_CACHE_TTL 秒、最多 USER_CACHE_MAXSIZE
+条），命中时构造一个已分离（detached）的 User 实例返回，请求之间不共享
+同一个可变对象。
+
+失效：UserService.update_user / delete_user 调用 ``invalidate``，
+本进程立即删除；数据库为 PostgreSQL 且开启 USER_CACHE_NOTIFY 时，还会在
+同一事务里 ``pg_notify``，事务提交后其他 worker 通过 LISTEN 收到并删除。
+其他实现（如 Redis）可以用 ``add_publisher`` 挂上。
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "user_cache_invalidate"
+
+user_cache_requests_total = registry.counter(
+    "user_cache_requests_total", "Authenticated-user cache lookups", ("result",)
+)
+
+_cache = TTLCache(settings.USER_CACHE_MAXSIZE, settings.USER_CACHE_TTL)
+_publishers: List[Callable[[int, AsyncSession], Awaitable[None]]] = []
+_subscribers: List[Callable[[int], None]] = []
+_columns = [attr.key for attr in User.__mapper__.column_attrs]
+
+
+def get(user_id: int) -> Optional[User]:
+    """命中时返回一个新的已分离 User 实例"""
+    snapshot = _cache.get(user_id)
+    if snapshot is None:
+        user_cache_requests_total.inc("miss")
+        return None
+    user_cache_requests_total.inc("hit")
+    user = User.__mapper__.class_manager.new_instance()
+    for key, value in snapshot.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return user
+
+
+def put(user: User) -> None:
+    _cache.set(user.id, {key: getattr(user, key) for key in _columns})
+
+
+def discard(user_id: int) -> None:
+    """只删除本进程的缓存"""
+    _cache.pop(user_id)
+
+
+def clear() -> None:
+    _cache.clear()
+
+
+def add_publisher(publisher: Callable[[int, AsyncSession], Awaitable[None]]) -> None:
+    """注册失效广播回调 ``async fn(user_id, db)``，在写事务提交前调用"""
+    _publishers.append(publisher)
+
+
+def add_subscriber(subscriber: Callable[[int], None]) -> None:
+    """注册收到其他 worker 失效通知时的回调 ``fn(user_id)``"""
+    _subscribers.append(subscriber)
+
+
+async def invalidate(user_id: int, db: AsyncSession) -> None:
+    """写事务提交前调用：删除本地缓存并广播给其他 worker"""
+    discard(user_id)
+    for publisher in _publishers:
+        await publisher(user_id, db)
+
+
+# ---- PostgreSQL LISTEN/NOTIFY ----
+
+def _is_postgres(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+async def _notify(user_id: int, db: AsyncSession) -> None:
+    # NOTIFY 在事务提交时才投递，回滚则不投递
+    if settings.USER_CACHE_NOTIFY and _is_postgres(db):
+        await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": str(user_id)})
+
+
+add_publisher(_notify)
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    try:
+        user_id = int(payload)
+    except ValueError:
+        logger.warning(f"无效的用户缓存失效通知: {payload!r}")
+        return
+    discard(user_id)
+    for subscriber in _subscribers:
+        subscriber(user_id)
+
+
+async def run_listener(retry_delay: float = 5.0) -> None:
+    """常驻任务：LISTEN 失效频道，断线后清空本地缓存并重连"""
+    import asyncpg
+
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(dsn)
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: lost.set())
+            await conn.add_listener(CHANNEL, _on_notification)
+            logger.info("用户缓存失效监听已启动")
+            await lost.wait()
+            logger.warning("用户缓存失效监听连接断开，清空本地缓存后重连")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"用户缓存失效监听失败: {e}")
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        # 断线期间可能错过通知
+        clear()
+        await asyncio.sleep(retry_delay)
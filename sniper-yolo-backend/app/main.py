@@ -1,4 +1,6 @@
 """FastAPI实例创建 - 使用统一响应格式"""
+import asyncio
+import math
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -9,15 +11,20 @@ from app.core.config import settings
 from app.api.router import api_router
 from app.core.security import SecurityHeadersMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.core import metrics, loop_monitor, user_cache, token_versions, revocation, search_index
 from app.middleware.cors import setup_cors
 from app.utils.response import ApiSuccessResponse, ApiErrorResponse
 from app.core.database import Database
+from app.core.logging_setup import setup_logging, shutdown_logging
+from app.core.hashing import PasswordHashBusyError, password_hasher
+from app.core.rate_limit import LoginRateLimitedError
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# 配置日志（队列 + 后台写线程，避免在事件循环里做I/O）
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # 创建FastAPI应用
@@ -32,8 +39,12 @@ app = FastAPI(
 )
 
 # 添加中间件
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(ProfilerMiddleware)
 setup_cors(app)
 
 # 包含API路由
@@ -42,7 +53,7 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 
 # 全局异常处理器
 # 导入 JSONResponse
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 # 修改 HTTP 异常处理器
 @app.exception_handler(StarletteHTTPException)
@@ -95,6 +106,40 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         media_type="application/json; charset=utf-8"
     )
 
+@app.exception_handler(PasswordHashBusyError)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashBusyError):
+    """密码哈希队列已满 - 快速拒绝"""
+    logger.warning(f"密码哈希队列已满，拒绝请求: {request.method} {request.url.path}")
+
+    error_response = ApiErrorResponse.create(
+        code="B00503",
+        status_code=503,
+        msg="服务繁忙，请稍后重试"
+    )
+
+    return JSONResponse(
+        status_code=503,
+        content=error_response.model_dump(),
+        media_type="application/json; charset=utf-8",
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(LoginRateLimitedError)
+async def login_rate_limited_handler(request: Request, exc: LoginRateLimitedError):
+    """登录过于频繁 - 在查库和哈希之前拒绝"""
+    error_response = ApiErrorResponse.create(
+        code="C00429",
+        status_code=429,
+        msg="登录尝试过于频繁，请稍后再试"
+    )
+
+    return JSONResponse(
+        status_code=429,
+        content=error_response.model_dump(),
+        media_type="application/json; charset=utf-8",
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """全局异常处理"""
@@ -121,6 +166,18 @@ async def startup_event():
         logger.info("PostgreSQL连接正常")
     else:
         logger.error("PostgreSQL连接异常")
+    if Database.replica_engines:
+        app.state.replica_monitor = asyncio.create_task(Database.run_replica_monitor())
+    if settings.METRICS_MULTIPROC_DIR:
+        app.state.metrics_flusher = asyncio.create_task(metrics.run_flusher())
+    app.state.loop_monitor = asyncio.create_task(loop_monitor.monitor_lag())
+    app.state.token_version_refresher = asyncio.create_task(token_versions.run_refresher())
+    app.state.revocation_refresher = asyncio.create_task(revocation.run_refresher())
+    if settings.SEARCH_INDEX_ENABLED and Database.engine.dialect.name == "postgresql":
+        app.state.search_index_sync = asyncio.create_task(search_index.run_sync())
+    if settings.USER_CACHE_NOTIFY and Database.engine.dialect.name == "postgresql":
+        app.state.user_cache_listener = asyncio.create_task(user_cache.run_listener())
+    app.state.loop_watchdog = loop_monitor.start_watchdog()
     """应用启动事件"""
     logger.info("Starting Sniper YOLO Backend...")
     logger.info(f"Environment: {settings.DEBUG and 'Development' or 'Production'}")
@@ -130,9 +187,28 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭事件"""
+    flusher = getattr(app.state, "metrics_flusher", None)
+    if flusher:
+        flusher.cancel()
+    app.state.loop_monitor.cancel()
+    app.state.token_version_refresher.cancel()
+    app.state.revocation_refresher.cancel()
+    search_index_sync = getattr(app.state, "search_index_sync", None)
+    if search_index_sync:
+        search_index_sync.cancel()
+    listener = getattr(app.state, "user_cache_listener", None)
+    if listener:
+        listener.cancel()
+    replica_monitor = getattr(app.state, "replica_monitor", None)
+    if replica_monitor:
+        replica_monitor.cancel()
+    if app.state.loop_watchdog:
+        app.state.loop_watchdog.stop()
+    password_hasher.shutdown()
     await Database.close()
     logger.info("PostgreSQL连接已关闭")
     logger.info("Shutting down Sniper YOLO Backend...")
+    shutdown_logging()
 
 
 @app.get("/")
@@ -161,6 +237,17 @@ async def health_check():
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus 指标端点"""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled", status_code=404)
+    return PlainTextResponse(
+        metrics.registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
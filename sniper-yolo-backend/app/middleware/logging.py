@@ -1,12 +1,18 @@
+"""纯ASGI请求日志中间件 - 边转发边记录，不缓冲完整的请求/响应体"""
 import time
-import json
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import StreamingResponse
 import logging
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging_setup import log_access
+from app.utils.asgi import get_route_template
 
 logger = logging.getLogger(__name__)
 
+
 def _pretty_headers(headers: dict) -> str:
     """脱敏 + 对齐打印"""
     lines = []
@@ -16,42 +22,166 @@ def _pretty_headers(headers: dict) -> str:
         lines.append(f"  {k:<20}: {v}")
     return "\n".join(lines)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start = time.time()
+
+class _BodyTap:
+    """单方向的body旁路采样：只保留前 limit 字节，同时统计总大小"""
+
+    __slots__ = ("limit", "loggable", "content_type", "captured", "size", "logged")
+
+    def __init__(self, limit: int, loggable: bool, content_type: str):
+        self.limit = limit
+        self.loggable = loggable
+        self.content_type = content_type
+        self.captured = bytearray()
+        self.size = 0
+        self.logged = False
+
+    def feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.loggable:
+            remaining = self.limit - len(self.captured)
+            if remaining > 0:
+                self.captured += chunk[:remaining]
+
+    def render(self) -> str:
+        if not self.loggable:
+            return f"[{self.content_type or 'unknown'} - size: {self.size} bytes]"
+        if not self.size:
+            return "-"
+        text = self.captured.decode("utf-8", errors="replace")
+        if self.size > len(self.captured):
+            return f"{text}… [truncated, total {self.size} bytes]"
+        return text
+
+
+class LoggingMiddleware:
+    """纯ASGI日志中间件
+
+    把 receive/send 的消息原样转发给下游/客户端，只在旁路复制一段
+    有上限的body用于日志，因此不会改变首字节时间，也不会把上传文件
+    或SSE流完整地驻留在内存里。
+
+    每个请求结束时输出一行采样后的JSON访问日志；逐条的头部/body
+    明细日志只在 LOG_REQUEST_DETAILS（默认跟随DEBUG）开启时记录。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        request_body_limit: Optional[int] = None,
+        response_body_limit: Optional[int] = None,
+        allow_content_types: Optional[Iterable[str]] = None,
+        deny_content_types: Optional[Iterable[str]] = None,
+        log_details: Optional[bool] = None,
+    ) -> None:
+        self.app = app
+        if log_details is None:
+            log_details = settings.LOG_REQUEST_DETAILS
+        self.log_details = settings.DEBUG if log_details is None else log_details
+        self.request_body_limit = (
+            settings.LOG_REQUEST_BODY_MAX_BYTES if request_body_limit is None else request_body_limit
+        )
+        self.response_body_limit = (
+            settings.LOG_RESPONSE_BODY_MAX_BYTES if response_body_limit is None else response_body_limit
+        )
+        self.allow_content_types = tuple(
+            t.lower() for t in (settings.LOG_BODY_CONTENT_TYPES if allow_content_types is None else allow_content_types)
+        )
+        self.deny_content_types = tuple(
+            t.lower() for t in (settings.LOG_BODY_CONTENT_TYPES_DENY if deny_content_types is None else deny_content_types)
+        )
+
+    def _is_loggable(self, content_type: str, limit: int) -> bool:
+        """deny 优先；allow 为空时表示不限制"""
+        if not self.log_details or limit <= 0:
+            return False
+        content_type = content_type.lower()
+        if any(content_type.startswith(t) for t in self.deny_content_types):
+            return False
+        if not self.allow_content_types:
+            return True
+        return any(content_type.startswith(t) for t in self.allow_content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
 
         # 1. 请求头
-        headers = {k.decode("utf-8"): v.decode("utf-8") for k, v in request.headers.raw}
-        logger.info("→ Headers:\n%s", _pretty_headers(headers))
-
-        # 2. 请求体
-        body_bytes = await request.body()
-        # 检查是否是文件上传请求
-        content_type = request.headers.get("content-type", "")
-        if "multipart/form-data" in content_type:
-            # 文件上传请求，不记录body（避免二进制数据解码错误）
-            logger.info("→ Body: [multipart/form-data - file upload, size: %d bytes]", len(body_bytes))
-        else:
-            # 普通请求，尝试解码body
-            try:
-                logger.info("→ Body: %s", body_bytes.decode() or "-")
-            except UnicodeDecodeError:
-                logger.info("→ Body: [binary data, size: %d bytes]", len(body_bytes))
-
-        # 3. 业务处理
-        response = await call_next(request)
-
-        # 4. 响应体
-        resp_body = b""
-        async for chunk in response.body_iterator:
-            resp_body += chunk
-        logger.info("← Status : %s", response.status_code)
-        logger.info("← Body   : %s", resp_body.decode() or "-")
-
-        # 5. 重新封装
-        return StreamingResponse(
-            iter([resp_body]),
-            status_code=response.status_code,
-            headers=dict(response.headers),
-            media_type=response.media_type,
+        request_headers = Headers(scope=scope)
+        if self.log_details:
+            headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+            logger.info("→ %s %s", scope["method"], scope["path"])
+            logger.info("→ Headers:\n%s", _pretty_headers(headers))
+
+        request_type = request_headers.get("content-type", "")
+        request_tap = _BodyTap(
+            self.request_body_limit,
+            self._is_loggable(request_type, self.request_body_limit),
+            request_type,
         )
+        response_tap: Optional[_BodyTap] = None
+        status_code = 500
+
+        def log_request_body() -> None:
+            if not request_tap.logged:
+                request_tap.logged = True
+                if self.log_details:
+                    logger.info("→ Body: %s", request_tap.render())
+
+        # 2. 请求体：随下游读取逐块旁路记录
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                request_tap.feed(message.get("body", b""))
+                if not message.get("more_body", False):
+                    log_request_body()
+            return message
+
+        # 3. 响应：状态/头部到达时立即放行，body逐块放行
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_tap, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                log_request_body()
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("X-Process-Time", f"{time.perf_counter() - start:.6f}")
+                response_type = response_headers.get("content-type", "")
+                response_tap = _BodyTap(
+                    self.response_body_limit,
+                    self._is_loggable(response_type, self.response_body_limit),
+                    response_type,
+                )
+                if self.log_details:
+                    logger.info("← Status : %s", status_code)
+            elif message["type"] == "http.response.body" and response_tap is not None:
+                response_tap.feed(message.get("body", b""))
+                if not message.get("more_body", False) and not response_tap.logged:
+                    response_tap.logged = True
+                    if self.log_details:
+                        logger.info("← Body   : %s", response_tap.render())
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            # 4. 单行访问日志（按路由采样）
+            extra = {}
+            collector = scope.get("server_timing")
+            if collector is not None:
+                extra["timings"] = collector.as_dict()
+            stats = scope.get("query_stats")
+            if stats is not None:
+                extra["db_queries"] = stats.count
+                extra["db_time_ms"] = round(stats.total_time * 1000, 2)
+            log_access(
+                method=scope["method"],
+                route=get_route_template(scope),
+                status=status_code,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                bytes_in=request_tap.size,
+                bytes_out=response_tap.size if response_tap else 0,
+                **extra,
+            )
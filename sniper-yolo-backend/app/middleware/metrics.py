@@ -0,0 +1,42 @@
+"""纯ASGI指标中间件 - 按路由模板记录请求数、耗时和在途请求数"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+from app.utils.asgi import get_route_template
+
+
+class MetricsMiddleware:
+    """记录 http_requests_total / http_request_duration_seconds / http_requests_in_flight"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            method = scope["method"]
+            route = get_route_template(scope)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(time.perf_counter() - start, method, route)
@@ -0,0 +1,67 @@
+"""纯ASGI按需采样中间件 - 超级用户带 X-Profile: 1 请求时采样本次请求"""
+import logging
+import sys
+
+from jose import JWTError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import profiler, revocation
+from app.core.config import settings
+from app.core.database import Database
+from app.core.security import decode_access_token
+from app.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+async def _is_superuser(headers: Headers) -> bool:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token or Database.async_session is None:
+        return False
+    try:
+        payload = decode_access_token(token)
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
+        return False
+    async with Database.async_session() as db:
+        if payload.get("sid") and await revocation.is_revoked(payload["sid"], db):
+            return False
+        user = await UserService().get_user_cached(user_id, db)
+    return bool(user and user.is_active and user.is_superuser)
+
+
+class ProfilerMiddleware:
+    """请求头 ``X-Profile: 1`` 且令牌属于超级用户时，对本次请求做墙钟采样
+
+    响应头 ``X-Profile-Id`` 返回采样编号，结果通过
+    ``GET /api/v1/admin/profiles/{id}`` 以 collapsed-stack 文本下载。
+    非超级用户的 X-Profile 头会被忽略。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get("x-profile") != "1" or not await _is_superuser(headers):
+            await self.app(scope, receive, send)
+            return
+
+        session = profiler.start_request_profile(
+            sys._getframe(), f"{scope['method']} {scope['path']}"
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", session.id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.finish_request_profile(session)
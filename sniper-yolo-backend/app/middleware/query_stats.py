@@ -0,0 +1,63 @@
+"""纯ASGI SQL统计中间件 - 统计每个请求的语句数/DB耗时，并对N+1给出告警"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import query_stats
+from app.core.config import settings
+from app.core.metrics import db_queries_per_request
+from app.utils.asgi import get_route_template
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """绑定请求级 QueryStats
+
+    - 调试模式下通过 X-DB-Query-Count / X-DB-Time-Ms 响应头返回统计
+    - 统计挂在 ``scope["query_stats"]`` 上，由日志中间件写入访问日志
+    - 语句数超过 QUERY_COUNT_WARN_THRESHOLD，或同一语句形状重复
+      QUERY_REPEAT_WARN_THRESHOLD 次以上时输出告警
+    """
+
+    def __init__(self, app: ASGIApp, emit_headers: bool = None) -> None:
+        self.app = app
+        if emit_headers is None:
+            emit_headers = settings.QUERY_STATS_HEADERS
+        self.emit_headers = settings.DEBUG if emit_headers is None else emit_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = query_stats.start_request()
+        scope["query_stats"] = stats
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.emit_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("X-DB-Time-Ms", f"{stats.total_time * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._check(scope, stats)
+
+    def _check(self, scope: Scope, stats: query_stats.QueryStats) -> None:
+        if not stats.count:
+            return
+        route = get_route_template(scope)
+        db_queries_per_request.observe(stats.count, scope["method"], route)
+
+        if stats.count > settings.QUERY_COUNT_WARN_THRESHOLD:
+            logger.warning(
+                "SQL语句过多: %s %s 执行了 %d 条语句, 耗时 %.2fms (阈值 %d)",
+                scope["method"], route, stats.count, stats.total_time * 1000,
+                settings.QUERY_COUNT_WARN_THRESHOLD,
+            )
+        for shape, n in stats.repeated(settings.QUERY_REPEAT_WARN_THRESHOLD):
+            logger.warning("疑似N+1查询: %s %s 同一语句执行了 %d 次: %s", scope["method"], route, n, shape)
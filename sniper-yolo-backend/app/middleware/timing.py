@@ -0,0 +1,37 @@
+"""纯ASGI Server-Timing 中间件 - 为每个请求绑定阶段计时器并输出响应头"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import timing
+from app.core.config import settings
+
+
+class ServerTimingMiddleware:
+    """绑定 timing 收集器，在 http.response.start 时写入 Server-Timing 头
+
+    收集器同时挂在 ``scope["server_timing"]`` 上，外层的日志中间件在请求
+    结束后从这里取各阶段耗时写进访问日志。
+    """
+
+    def __init__(self, app: ASGIApp, emit_header: bool = None) -> None:
+        self.app = app
+        self.emit_header = settings.SERVER_TIMING_HEADER if emit_header is None else emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        collector = timing.start_request()
+        scope["server_timing"] = collector
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.emit_header:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", collector.header_value(time.perf_counter() - start))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
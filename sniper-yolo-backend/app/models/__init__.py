@@ -6,5 +6,8 @@ from app.models.food import Food
 from app.models.drink import Drink
 from app.models.fun import Fun
 from app.models.enjoy import Enjoy
+from app.models.refresh_token import RefreshToken
+from app.models.search_terms import DrinkSearchTerms, EnjoySearchTerms, FoodSearchTerms
 
-__all__ = ["Base", "User", "Item", "Food", "Drink", "Fun", "Enjoy"]
+__all__ = ["Base", "User", "Item", "Food", "Drink", "Fun", "Enjoy", "RefreshToken",
+           "FoodSearchTerms", "DrinkSearchTerms", "EnjoySearchTerms"]
@@ -1,5 +1,17 @@
 """Base SQLAlchemy model for all models to inherit from"""
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import DeclarativeMeta
 
-Base: DeclarativeMeta = declarative_base()
\ No newline at end of file
+Base: DeclarativeMeta = declarative_base()
+
+# search_vector 生成列用到的 IMMUTABLE 函数（array_to_string 是 STABLE），迁移 007 同样会创建
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION array_to_search_text(text[]) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE "
+        "AS $$ SELECT coalesce(array_to_string($1, ' '), '') $$"
+    ).execute_if(dialect="postgresql"),
+)
@@ -1,9 +1,19 @@
 """Food SQLAlchemy model for PostgreSQL"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Computed, Column, Integer, String, Text, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.models.base import Base
 
+# 全文检索向量，与迁移 007 一致；权重 A 标题 > B 正文 > C 标签 > D 其他属性
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'B') || "
+    "setweight(to_tsvector('simple', array_to_search_text(tags::text[])), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(flavor, '') || ' ' || coalesce(maker, '') || ' ' "
+    "|| coalesce(category, '')), 'D')"
+)
+
 
 class Food(Base):
     """美食表模型"""
@@ -16,14 +26,47 @@ class Food(Base):
     images = Column(ARRAY(String), nullable=True)
     tags = Column(ARRAY(String), nullable=True)
     star = Column(Integer, nullable=True)
-    maker = Column(String, nullable=False)
-    flavor = Column(String, nullable=True)
-    category = Column(String, nullable=True)  # 菜品分类：素菜、荤菜、凉菜、下酒菜等
+    maker = Column(String, nullable=False, index=True)
+    flavor = Column(String, nullable=True, index=True)
+    category = Column(String, nullable=True, index=True)  # 菜品分类：素菜、荤菜、凉菜、下酒菜等
     create_time = Column(DateTime(timezone=True), server_default="now()", nullable=True)
     update_time = Column(DateTime(timezone=True), onupdate="now()", nullable=True)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
+    # 数据库生成列，只在检索时用到，默认不加载
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
+    __table_args__ = (
+        # 键集分页：ORDER BY create_time DESC, id DESC
+        Index("ix_foods_create_time_id", create_time.desc(), id.desc()),
+        # 标签包含查询：tags @> ARRAY[...]
+        Index("ix_foods_tags", tags, postgresql_using="gin"),
+        # 全文检索：search_vector @@ tsquery
+        Index("ix_foods_search_vector", search_vector, postgresql_using="gin"),
+        # ILIKE '%x%' 模糊查询（pg_trgm）
+        Index("ix_foods_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_foods_content_trgm", content, postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"}),
+    )
+
+    @classmethod
+    def summary_columns(cls) -> list:
+        """列表 view=summary 只查询的卡片字段"""
+        return [cls.id, cls.title, cls.cover, cls.star, cls.tags, cls.maker, cls.create_time]
+
+    @staticmethod
+    def summary_dict(row) -> dict:
+        """summary_columns 查询结果行转字典，格式与 to_dict 中的同名字段一致"""
+        return {
+            "id": str(row.id),
+            "title": row.title or "",
+            "cover": row.cover or "",
+            "star": int(row.star) if row.star is not None else 0,
+            "tags": list(row.tags) if row.tags else [],
+            "maker": row.maker or "",
+            "create_time": row.create_time.isoformat() if row.create_time else None
+        }
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
         return {
@@ -1,6 +1,6 @@
 """Item SQLAlchemy model for PostgreSQL"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -14,13 +14,38 @@ class Item(Base):
     description = Column(Text, nullable=True)
     price = Column(Float, nullable=True)
     is_available = Column(Boolean, default=True, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default="now()", nullable=True)
     updated_at = Column(DateTime(timezone=True), onupdate="now()", nullable=True)
 
+    __table_args__ = (
+        # 键集分页：ORDER BY created_at DESC, id DESC
+        Index("ix_items_created_at_id", created_at.desc(), id.desc()),
+        # ILIKE '%x%' 模糊查询（pg_trgm）
+        Index("ix_items_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_items_description_trgm", description, postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="items")
 
+    @classmethod
+    def summary_columns(cls) -> list:
+        """列表 view=summary 只查询的卡片字段"""
+        return [cls.id, cls.title, cls.price, cls.is_available, cls.owner_id, cls.created_at]
+
+    @staticmethod
+    def summary_dict(row) -> dict:
+        """summary_columns 查询结果行转字典，格式与 to_dict 中的同名字段一致"""
+        return {
+            "id": str(row.id),
+            "title": row.title,
+            "price": float(row.price) if row.price is not None else 0.0,
+            "is_available": row.is_available,
+            "owner_id": str(row.owner_id) if row.owner_id else "",
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
         return {
@@ -0,0 +1,27 @@
+"""RefreshToken SQLAlchemy model for PostgreSQL"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.models.base import Base
+
+
+class RefreshToken(Base):
+    """刷新令牌表模型
+
+    只保存令牌的 sha256 摘要。同一次登录（会话）的令牌轮换时共用
+    ``session_id``，访问令牌里的 ``sid`` 就是它；会话被撤销时该会话
+    所有行都写入 ``revoked_at``。
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    session_id = Column(String(32), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default="now()", nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # 撤销列表增量刷新按 revoked_at 范围扫描
+        Index("ix_refresh_tokens_revoked_at", "revoked_at", postgresql_where=revoked_at.isnot(None)),
+    )
@@ -0,0 +1,49 @@
+"""检索词项旁表 SQLAlchemy 模型 - 美食、饮品、饭店各一张
+
+每行是一篇文档的 n-gram 词项（见 app.utils.ngrams），``terms`` 上的 GIN
+索引就是倒排索引，posting list 由 PostgreSQL 压缩存储。业务表删除时按
+外键级联删除；写入和维护见 app.core.search_index。
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.models.base import Base
+
+
+class FoodSearchTerms(Base):
+    """美食检索词项表"""
+    __tablename__ = "food_search_terms"
+
+    doc_id = Column(Integer, ForeignKey("foods.id", ondelete="CASCADE"), primary_key=True)
+    terms = Column(ARRAY(Text), nullable=False)
+    # 生成词项时业务行的 coalesce(update_time, create_time)，用于发现过期的词项
+    changed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_food_search_terms_terms", "terms", postgresql_using="gin"),
+    )
+
+
+class DrinkSearchTerms(Base):
+    """饮品检索词项表"""
+    __tablename__ = "drink_search_terms"
+
+    doc_id = Column(Integer, ForeignKey("drinks.id", ondelete="CASCADE"), primary_key=True)
+    terms = Column(ARRAY(Text), nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_drink_search_terms_terms", "terms", postgresql_using="gin"),
+    )
+
+
+class EnjoySearchTerms(Base):
+    """饭店检索词项表"""
+    __tablename__ = "enjoy_search_terms"
+
+    doc_id = Column(Integer, ForeignKey("enjoys.id", ondelete="CASCADE"), primary_key=True)
+    terms = Column(ARRAY(Text), nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_enjoy_search_terms_terms", "terms", postgresql_using="gin"),
+    )
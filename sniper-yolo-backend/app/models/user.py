@@ -1,6 +1,6 @@
 """User SQLAlchemy model for PostgreSQL"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, SmallInteger
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -18,12 +18,33 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=True)
     is_superuser = Column(Boolean, default=False, nullable=True)
     vip_level = Column(SmallInteger, default=1, nullable=True)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default="now()", nullable=True)
     updated_at = Column(DateTime(timezone=True), onupdate="now()", nullable=True)
 
+    __table_args__ = (
+        # 键集分页：ORDER BY created_at DESC, id DESC
+        Index("ix_users_created_at_id", created_at.desc(), id.desc()),
+    )
+
     # Relationships
     items = relationship("Item", back_populates="owner", cascade="all, delete-orphan")
 
+    @classmethod
+    def summary_columns(cls) -> list:
+        """列表 view=summary 只查询的卡片字段"""
+        return [cls.id, cls.username, cls.is_active, cls.created_at]
+
+    @staticmethod
+    def summary_dict(row) -> dict:
+        """summary_columns 查询结果行转字典，格式与 to_dict 中的同名字段一致"""
+        return {
+            "id": str(row.id),
+            "username": row.username,
+            "is_active": row.is_active,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
         return {
@@ -47,4 +47,19 @@ class UserLogin(BaseModel):
 class Token(BaseModel):
     """Response model for authentication token."""
     access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    token_type: str = "bearer"
+
+
+class TokenClaims(BaseModel):
+    """Identity claims carried by an access token."""
+    id: int
+    is_active: bool = True
+    is_superuser: bool = False
+    vip_level: int = 1
+    token_version: int = 0
+    session_id: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    """Request model for refreshing an access token."""
+    refresh_token: str
@@ -1,6 +1,6 @@
 import os
 from app.models.user import User
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -26,7 +26,7 @@ async def create_superuser():
             username="admin",
             email=ADMIN_EMAIL,
             mobile="13800000000",
-            hashed_password=get_password_hash(ADMIN_PASS),
+            hashed_password=await get_password_hash_async(ADMIN_PASS),
             is_superuser=True,
             is_active=True,
             created_at=datetime.now(timezone.utc),
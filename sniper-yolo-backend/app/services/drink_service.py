@@ -2,11 +2,13 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
+from sqlalchemy import select, or_, and_
 from sqlalchemy.sql import text
 
 from app.models.drink import Drink
 from app.schemas.drink import DrinkCreate, DrinkUpdate
+from app.core import search_index, timing
+from app.utils.pagination import Cursor, Page, check_view, fetch_page
 
 
 class DrinkService:
@@ -48,6 +50,8 @@ class DrinkService:
 
             logger.debug(f"准备保存到数据库")
             db.add(drink)
+            await db.flush()
+            await search_index.index_document(db, "drink", drink)
             await db.commit()
             await db.refresh(drink)
             logger.debug(f"保存成功，饮品ID: {drink.id}")
@@ -80,11 +84,6 @@ class DrinkService:
         drinks = result.scalars().all()
         return [d.to_dict() for d in drinks]
 
-    async def get_drinks_count(self, db: AsyncSession) -> int:
-        """Get total count of all drinks."""
-        result = await db.execute(select(func.count(Drink.id)))
-        return result.scalar()
-
     async def update_drink(
         self, drink_id: int, drink_update: DrinkUpdate, updated_by: int, db: AsyncSession
     ) -> Optional[dict]:
@@ -100,6 +99,7 @@ class DrinkService:
 
         drink.update_time = datetime.now(timezone.utc)
         drink.updated_by = updated_by
+        await search_index.index_document(db, "drink", drink)
         await db.commit()
         await db.refresh(drink)
         return drink.to_dict()
@@ -114,7 +114,7 @@ class DrinkService:
             return True
         return False
 
-    async def search_drinks(
+    def _search_conditions(
         self,
         title: Optional[str] = None,
         content: Optional[str] = None,
@@ -126,60 +126,57 @@ class DrinkService:
         sweetness: Optional[str] = None,
         ice: Optional[str] = None,
         tag: Optional[str] = None,
-        db: AsyncSession = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[dict]:
-        """Search drinks with filters and pagination."""
-        # 构建查询条件
-        query = select(Drink)
+        q: Optional[str] = None
+    ) -> list:
+        """search/count/page 共用的过滤条件"""
+        conditions = []
 
         # 标题模糊查询
         if title:
-            query = query.where(Drink.title.ilike(f"%{title}%"))
+            conditions.append(Drink.title.ilike(f"%{title}%"))
 
         # 内容模糊查询
         if content:
-            query = query.where(Drink.content.ilike(f"%{content}%"))
+            conditions.append(Drink.content.ilike(f"%{content}%"))
 
         # 品牌精确查询
         if brand:
-            query = query.where(Drink.brand == brand)
+            conditions.append(Drink.brand == brand)
 
         # 星级评分区间查询
         if min_star is not None:
-            query = query.where(Drink.star >= min_star)
+            conditions.append(Drink.star >= min_star)
 
         if max_star is not None:
-            query = query.where(Drink.star <= max_star)
+            conditions.append(Drink.star <= max_star)
 
         # 口味精确查询
         if flavor:
-            query = query.where(Drink.flavor == flavor)
+            conditions.append(Drink.flavor == flavor)
 
         # 饮品类型精确查询
         if drink_type:
-            query = query.where(Drink.drink_type == drink_type)
+            conditions.append(Drink.drink_type == drink_type)
 
         # 甜度精确查询
         if sweetness:
-            query = query.where(Drink.sweetness == sweetness)
+            conditions.append(Drink.sweetness == sweetness)
 
         # 冰量精确查询
         if ice:
-            query = query.where(Drink.ice == ice)
+            conditions.append(Drink.ice == ice)
 
         # 标签包含查询
         if tag:
-            query = query.where(Drink.tags.contains([tag]))
+            conditions.append(Drink.tags.contains([tag]))
 
-        # 应用分页并按创建时间倒序
-        query = query.order_by(Drink.create_time.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        drinks = result.scalars().all()
-        return [d.to_dict() for d in drinks]
+        # 关键词检索：n-gram 倒排索引取候选并用 ILIKE 复核，与上面的结构化条件由数据库求交集
+        if q:
+            conditions.append(search_index.match_condition("drink", q))
 
-    async def search_drinks_count(
+        return conditions
+
+    async def search_drinks_page(
         self,
         title: Optional[str] = None,
         content: Optional[str] = None,
@@ -191,50 +188,28 @@ class DrinkService:
         sweetness: Optional[str] = None,
         ice: Optional[str] = None,
         tag: Optional[str] = None,
-        db: AsyncSession = None
-    ) -> int:
-        """Get total count of drinks matching search criteria."""
-        # 构建查询条件
-        query = select(func.count(Drink.id))
-
-        # 标题模糊查询
-        if title:
-            query = query.where(Drink.title.ilike(f"%{title}%"))
-
-        # 内容模糊查询
-        if content:
-            query = query.where(Drink.content.ilike(f"%{content}%"))
-
-        # 品牌精确查询
-        if brand:
-            query = query.where(Drink.brand == brand)
-
-        # 星级评分区间查询
-        if min_star is not None:
-            query = query.where(Drink.star >= min_star)
-
-        if max_star is not None:
-            query = query.where(Drink.star <= max_star)
-
-        # 口味精确查询
-        if flavor:
-            query = query.where(Drink.flavor == flavor)
-
-        # 饮品类型精确查询
-        if drink_type:
-            query = query.where(Drink.drink_type == drink_type)
-
-        # 甜度精确查询
-        if sweetness:
-            query = query.where(Drink.sweetness == sweetness)
-
-        # 冰量精确查询
-        if ice:
-            query = query.where(Drink.ice == ice)
-
-        # 标签包含查询
-        if tag:
-            query = query.where(Drink.tags.contains([tag]))
-
-        result = await db.execute(query)
-        return result.scalar()
+        q: Optional[str] = None,
+        db: AsyncSession = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        total_mode: str = "exact",
+        view: str = "full"
+    ) -> Page:
+        """Search drinks and the matching total in one statement (see fetch_page)."""
+        # summary 只查询卡片字段，结果行直接转字典，不构造 ORM 实体
+        columns = [Drink] if check_view(view) == "full" else Drink.summary_columns()
+        conditions = self._search_conditions(
+            title=title, content=content, brand=brand, min_star=min_star, max_star=max_star, flavor=flavor, drink_type=drink_type, sweetness=sweetness, ice=ice, tag=tag, q=q
+        )
+        page = await fetch_page(
+            db, select(*columns).where(*conditions), Drink.create_time, Drink.id,
+            table=Drink.__tablename__, filtered=bool(conditions),
+            skip=skip, limit=limit, after=after, total_mode=total_mode
+        )
+        with timing.phase("serialize"):
+            if view == "full":
+                page.rows = [row.to_dict() for row in page.rows]
+            else:
+                page.rows = [Drink.summary_dict(row) for row in page.rows]
+        return page
@@ -3,10 +3,12 @@ from typing import List, Optional, Dict, Any
 import logging
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
+from sqlalchemy import select, or_, and_
 
 from app.models.enjoy import Enjoy
 from app.schemas.enjoy import EnjoyCreate, EnjoyUpdate
+from app.core import search_index, timing
+from app.utils.pagination import Cursor, Page, check_view, fetch_page
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,8 @@ class EnjoyService:
 
             # 保存到数据库
             db.add(new_enjoy)
+            await db.flush()
+            await search_index.index_document(db, "enjoy", new_enjoy)
             await db.commit()
             await db.refresh(new_enjoy)
 
@@ -140,7 +144,8 @@ class EnjoyService:
                 enjoy.updated_by = updated_by
                 enjoy.update_time = datetime.now(timezone.utc)
 
-                # 保存到数据库
+                # 保存到数据库，检索词项随同一事务提交
+                await search_index.index_document(db, "enjoy", enjoy)
                 await db.commit()
                 await db.refresh(enjoy)
 
@@ -171,7 +176,7 @@ class EnjoyService:
                 logger.warning(f"饭店信息不存在: {enjoy_id}")
                 return False
 
-            # 删除饭店信息
+            # 删除饭店信息，检索词项由外键级联删除
             await db.delete(enjoy)
             await db.commit()
 
@@ -182,71 +187,7 @@ class EnjoyService:
             logger.error(f"删除饭店信息失败: {str(e)}", exc_info=True)
             raise
 
-    async def search_enjoys(self,
-                          title: Optional[str] = None,
-                          location: Optional[str] = None,
-                          maker: Optional[str] = None,
-                          min_star: Optional[float] = None,
-                          max_star: Optional[float] = None,
-                          flavor: Optional[str] = None,
-                          tag: Optional[str] = None,
-                          db: AsyncSession = None,
-                          limit: int = 10,
-                          skip: int = 0) -> List[Dict[str, Any]]:
-        """搜索饭店信息
-
-        Args:
-            title: 标题模糊查询
-            location: 地址模糊查询
-            maker: 推荐来源精确查询
-            min_star: 最低评分
-            max_star: 最高评分
-            flavor: 口味精确查询
-            tag: 标签包含查询
-            limit: 返回条数
-            skip: 跳过条数
-
-        Returns:
-            符合条件的饭店信息列表
-        """
-        try:
-            logger.info(f"搜索饭店信息，title: {title}, location: {location}, maker: {maker}, min_star: {min_star}, max_star: {max_star}, flavor: {flavor}, tag: {tag}, skip: {skip}, limit: {limit}")
-
-            # 构建查询条件
-            query = select(Enjoy)
-
-            if title:
-                query = query.where(Enjoy.title.ilike(f"%{title}%"))
-
-            if location:
-                query = query.where(Enjoy.location.ilike(f"%{location}%"))
-
-            if maker:
-                query = query.where(Enjoy.maker == maker)
-
-            if min_star is not None:
-                query = query.where(Enjoy.star >= min_star)
-
-            if max_star is not None:
-                query = query.where(Enjoy.star <= max_star)
-
-            if flavor:
-                query = query.where(Enjoy.flavor == flavor)
-
-            if tag:
-                query = query.where(Enjoy.tags.contains([tag]))
-
-            # 执行查询
-            query = query.order_by(Enjoy.create_time.desc()).offset(skip).limit(limit)
-            result = await db.execute(query)
-            enjoys = result.scalars().all()
-
-            return [enjoy.to_dict() for enjoy in enjoys]
-        except Exception as e:
-            logger.error(f"搜索饭店信息失败: {str(e)}", exc_info=True)
-            raise
-
-    async def search_enjoys_count(
+    def _search_conditions(
         self,
         title: Optional[str] = None,
         location: Optional[str] = None,
@@ -255,56 +196,72 @@ class EnjoyService:
         max_star: Optional[float] = None,
         flavor: Optional[str] = None,
         tag: Optional[str] = None,
-        db: AsyncSession = None
-    ) -> int:
-        """获取符合条件的饭店信息总数
-
-        Args:
-            title: 标题模糊查询
-            location: 地址模糊查询
-            maker: 推荐来源精确查询
-            min_star: 最低评分
-            max_star: 最高评分
-            flavor: 口味精确查询
-            tag: 标签包含查询
+        q: Optional[str] = None
+    ) -> list:
+        """search/count/page 共用的过滤条件"""
+        conditions = []
 
-        Returns:
-            符合条件的饭店信息总数
-        """
-        try:
-            logger.info(f"获取符合条件的饭店信息总数，title: {title}, location: {location}, maker: {maker}, min_star: {min_star}, max_star: {max_star}, flavor: {flavor}, tag: {tag}")
+        if title:
+            conditions.append(Enjoy.title.ilike(f"%{title}%"))
 
-            # 构建查询条件
-            query = select(func.count(Enjoy.id))
+        if location:
+            conditions.append(Enjoy.location.ilike(f"%{location}%"))
 
-            if title:
-                query = query.where(Enjoy.title.ilike(f"%{title}%"))
+        if maker:
+            conditions.append(Enjoy.maker == maker)
 
-            if location:
-                query = query.where(Enjoy.location.ilike(f"%{location}%"))
+        if min_star is not None:
+            conditions.append(Enjoy.star >= min_star)
 
-            if maker:
-                query = query.where(Enjoy.maker == maker)
+        if max_star is not None:
+            conditions.append(Enjoy.star <= max_star)
 
-            if min_star is not None:
-                query = query.where(Enjoy.star >= min_star)
+        if flavor:
+            conditions.append(Enjoy.flavor == flavor)
 
-            if max_star is not None:
-                query = query.where(Enjoy.star <= max_star)
+        if tag:
+            conditions.append(Enjoy.tags.contains([tag]))
 
-            if flavor:
-                query = query.where(Enjoy.flavor == flavor)
+        # 关键词检索：n-gram 倒排索引取候选并用 ILIKE 复核，与上面的结构化条件由数据库求交集
+        if q:
+            conditions.append(search_index.match_condition("enjoy", q))
 
-            if tag:
-                query = query.where(Enjoy.tags.contains([tag]))
+        return conditions
 
-            # 执行查询
-            result = await db.execute(query)
-            return result.scalar()
-
-        except Exception as e:
-            logger.error(f"获取符合条件的饭店信息总数失败: {str(e)}", exc_info=True)
-            raise
+    async def search_enjoys_page(
+        self,
+        title: Optional[str] = None,
+        location: Optional[str] = None,
+        maker: Optional[str] = None,
+        min_star: Optional[float] = None,
+        max_star: Optional[float] = None,
+        flavor: Optional[str] = None,
+        tag: Optional[str] = None,
+        q: Optional[str] = None,
+        db: AsyncSession = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        total_mode: str = "exact",
+        view: str = "full"
+    ) -> Page:
+        """搜索饭店信息并在同一条语句里取得总数（见 fetch_page）"""
+        # summary 只查询卡片字段，结果行直接转字典，不构造 ORM 实体
+        columns = [Enjoy] if check_view(view) == "full" else Enjoy.summary_columns()
+        conditions = self._search_conditions(
+            title=title, location=location, maker=maker, min_star=min_star, max_star=max_star, flavor=flavor, tag=tag, q=q
+        )
+        page = await fetch_page(
+            db, select(*columns).where(*conditions), Enjoy.create_time, Enjoy.id,
+            table=Enjoy.__tablename__, filtered=bool(conditions),
+            skip=skip, limit=limit, after=after, total_mode=total_mode
+        )
+        with timing.phase("serialize"):
+            if view == "full":
+                page.rows = [row.to_dict() for row in page.rows]
+            else:
+                page.rows = [Enjoy.summary_dict(row) for row in page.rows]
+        return page
 
     async def get_enjoys(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
         """获取饭店信息列表（分页）
@@ -2,11 +2,13 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
+from sqlalchemy import select, or_, and_
 from sqlalchemy.sql import text
 
 from app.models.food import Food
 from app.schemas.food import FoodCreate, FoodUpdate
+from app.core import search_index, timing
+from app.utils.pagination import Cursor, Page, check_view, fetch_page
 
 
 class FoodService:
@@ -46,6 +48,8 @@ class FoodService:
 
             logger.debug(f"准备保存到数据库")
             db.add(food)
+            await db.flush()
+            await search_index.index_document(db, "food", food)
             await db.commit()
             await db.refresh(food)
             logger.debug(f"保存成功，食品ID: {food.id}")
@@ -78,11 +82,6 @@ class FoodService:
         foods = result.scalars().all()
         return [f.to_dict() for f in foods]
 
-    async def get_foods_count(self, db: AsyncSession) -> int:
-        """Get total count of all foods."""
-        result = await db.execute(select(func.count(Food.id)))
-        return result.scalar()
-
     async def update_food(
         self, food_id: int, food_update: FoodUpdate, updated_by: int, db: AsyncSession
     ) -> Optional[dict]:
@@ -98,6 +97,7 @@ class FoodService:
 
         food.update_time = datetime.now(timezone.utc)
         food.updated_by = updated_by
+        await search_index.index_document(db, "food", food)
         await db.commit()
         await db.refresh(food)
         return food.to_dict()
@@ -112,7 +112,7 @@ class FoodService:
             return True
         return False
 
-    async def search_foods(
+    def _search_conditions(
         self,
         title: Optional[str] = None,
         content: Optional[str] = None,
@@ -122,52 +122,49 @@ class FoodService:
         flavor: Optional[str] = None,
         tag: Optional[str] = None,
         category: Optional[str] = None,
-        db: AsyncSession = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[dict]:
-        """Search foods with filters and pagination."""
-        # 构建查询条件
-        query = select(Food)
+        q: Optional[str] = None
+    ) -> list:
+        """search/count/page 共用的过滤条件"""
+        conditions = []
 
         # 标题模糊查询
         if title:
-            query = query.where(Food.title.ilike(f"%{title}%"))
+            conditions.append(Food.title.ilike(f"%{title}%"))
 
         # 内容模糊查询
         if content:
-            query = query.where(Food.content.ilike(f"%{content}%"))
+            conditions.append(Food.content.ilike(f"%{content}%"))
 
         # 制作者精确查询
         if maker:
-            query = query.where(Food.maker == maker)
+            conditions.append(Food.maker == maker)
 
         # 星级评分区间查询
         if min_star is not None:
-            query = query.where(Food.star >= min_star)
+            conditions.append(Food.star >= min_star)
 
         if max_star is not None:
-            query = query.where(Food.star <= max_star)
+            conditions.append(Food.star <= max_star)
 
         # 口味精确查询
         if flavor:
-            query = query.where(Food.flavor == flavor)
+            conditions.append(Food.flavor == flavor)
 
         # 标签包含查询
         if tag:
-            query = query.where(Food.tags.contains([tag]))
+            conditions.append(Food.tags.contains([tag]))
 
         # 分类精确查询
         if category:
-            query = query.where(Food.category == category)
+            conditions.append(Food.category == category)
 
-        # 应用分页并按创建时间倒序
-        query = query.order_by(Food.create_time.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        foods = result.scalars().all()
-        return [f.to_dict() for f in foods]
+        # 关键词检索：n-gram 倒排索引取候选并用 ILIKE 复核，与上面的结构化条件由数据库求交集
+        if q:
+            conditions.append(search_index.match_condition("food", q))
 
-    async def search_foods_count(
+        return conditions
+
+    async def search_foods_page(
         self,
         title: Optional[str] = None,
         content: Optional[str] = None,
@@ -177,42 +174,28 @@ class FoodService:
         flavor: Optional[str] = None,
         tag: Optional[str] = None,
         category: Optional[str] = None,
-        db: AsyncSession = None
-    ) -> int:
-        """Get total count of foods matching search criteria."""
-        # 构建查询条件
-        query = select(func.count(Food.id))
-
-        # 标题模糊查询
-        if title:
-            query = query.where(Food.title.ilike(f"%{title}%"))
-
-        # 内容模糊查询
-        if content:
-            query = query.where(Food.content.ilike(f"%{content}%"))
-
-        # 制作者精确查询
-        if maker:
-            query = query.where(Food.maker == maker)
-
-        # 星级评分区间查询
-        if min_star is not None:
-            query = query.where(Food.star >= min_star)
-
-        if max_star is not None:
-            query = query.where(Food.star <= max_star)
-
-        # 口味精确查询
-        if flavor:
-            query = query.where(Food.flavor == flavor)
-
-        # 标签包含查询
-        if tag:
-            query = query.where(Food.tags.contains([tag]))
-
-        # 分类精确查询
-        if category:
-            query = query.where(Food.category == category)
-
-        result = await db.execute(query)
-        return result.scalar()
+        q: Optional[str] = None,
+        db: AsyncSession = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        total_mode: str = "exact",
+        view: str = "full"
+    ) -> Page:
+        """Search foods and the matching total in one statement (see fetch_page)."""
+        # summary 只查询卡片字段，结果行直接转字典，不构造 ORM 实体
+        columns = [Food] if check_view(view) == "full" else Food.summary_columns()
+        conditions = self._search_conditions(
+            title=title, content=content, maker=maker, min_star=min_star, max_star=max_star, flavor=flavor, tag=tag, category=category, q=q
+        )
+        page = await fetch_page(
+            db, select(*columns).where(*conditions), Food.create_time, Food.id,
+            table=Food.__tablename__, filtered=bool(conditions),
+            skip=skip, limit=limit, after=after, total_mode=total_mode
+        )
+        with timing.phase("serialize"):
+            if view == "full":
+                page.rows = [row.to_dict() for row in page.rows]
+            else:
+                page.rows = [Food.summary_dict(row) for row in page.rows]
+        return page
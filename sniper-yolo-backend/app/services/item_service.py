@@ -2,10 +2,12 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_
 
 from app.models.item import Item
 from app.schemas.item import ItemCreate, ItemUpdate
+from app.core import timing
+from app.utils.pagination import Cursor, Page, check_view, fetch_page
 
 
 class ItemService:
@@ -42,86 +44,69 @@ class ItemService:
         items = result.scalars().all()
         return [i.to_dict() for i in items]
 
-    async def get_items_count(self, db: AsyncSession) -> int:
-        """Get total count of all items."""
-        result = await db.execute(select(func.count(Item.id)))
-        return result.scalar()
-
-    async def search_items(
+    def _search_conditions(
         self,
         title: Optional[str] = None,
         description: Optional[str] = None,
         owner_id: Optional[int] = None,
         min_price: Optional[float] = None,
-        max_price: Optional[float] = None,
-        db: AsyncSession = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[dict]:
-        """Search items with filters and pagination."""
-        # 构建查询条件
-        query = select(Item)
+        max_price: Optional[float] = None
+    ) -> list:
+        """search/count/page 共用的过滤条件"""
+        conditions = []
 
         # 标题模糊查询
         if title:
-            query = query.where(Item.title.ilike(f"%{title}%"))
+            conditions.append(Item.title.ilike(f"%{title}%"))
 
         # 描述模糊查询
         if description:
-            query = query.where(Item.description.ilike(f"%{description}%"))
+            conditions.append(Item.description.ilike(f"%{description}%"))
 
         # 所有者ID精确查询
         if owner_id:
-            query = query.where(Item.owner_id == owner_id)
+            conditions.append(Item.owner_id == owner_id)
 
         # 价格区间查询
         if min_price is not None:
-            query = query.where(Item.price >= min_price)
+            conditions.append(Item.price >= min_price)
 
         if max_price is not None:
-            query = query.where(Item.price <= max_price)
+            conditions.append(Item.price <= max_price)
 
-        # 应用分页
-        query = query.order_by(Item.created_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        items = result.scalars().all()
-        return [i.to_dict() for i in items]
+        return conditions
 
-    async def search_items_count(
+    async def search_items_page(
         self,
         title: Optional[str] = None,
         description: Optional[str] = None,
         owner_id: Optional[int] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
-        db: AsyncSession = None
-    ) -> int:
-        """Get total count of items matching search criteria."""
-        # 构建查询条件
-        query = select(func.count(Item.id))
-
-        # 标题模糊查询
-        if title:
-            query = query.where(Item.title.ilike(f"%{title}%"))
-
-        # 描述模糊查询
-        if description:
-            query = query.where(Item.description.ilike(f"%{description}%"))
-
-        # 所有者ID精确查询
-        if owner_id:
-            query = query.where(Item.owner_id == owner_id)
-
-        # 价格区间查询
-        if min_price is not None:
-            query = query.where(Item.price >= min_price)
-
-        if max_price is not None:
-            query = query.where(Item.price <= max_price)
-
-        # 返回匹配条件的总数
-        result = await db.execute(query)
-        return result.scalar()
+        db: AsyncSession = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        total_mode: str = "exact",
+        view: str = "full"
+    ) -> Page:
+        """Search items and the matching total in one statement (see fetch_page)."""
+        # summary 只查询卡片字段，结果行直接转字典，不构造 ORM 实体
+        columns = [Item] if check_view(view) == "full" else Item.summary_columns()
+        conditions = self._search_conditions(
+            title=title, description=description, owner_id=owner_id, min_price=min_price, max_price=max_price
+        )
+        page = await fetch_page(
+            db, select(*columns).where(*conditions), Item.created_at, Item.id,
+            table=Item.__tablename__, filtered=bool(conditions),
+            skip=skip, limit=limit, after=after, total_mode=total_mode
+        )
+        with timing.phase("serialize"):
+            if view == "full":
+                page.rows = [row.to_dict() for row in page.rows]
+            else:
+                page.rows = [Item.summary_dict(row) for row in page.rows]
+        return page
 
     async def update_item(
         self, item_id: int, item_update: ItemUpdate, owner_id: int, db: AsyncSession
@@ -1,9 +1,11 @@
 """LLM service for Zhipu BigModel API calls (OpenAI-compatible)."""
 import logging
 import json
+import time
 import httpx
 from typing import Optional, Dict, Any, AsyncIterator
 from app.schemas.llm import LLMGenerateRequest, LLMChatRequest
+from app.core import timing
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +33,11 @@ class LLMService:
 
             logger.info(f"Calling BigModel API: {self.chat_url}, model={request.model}")
 
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(self.chat_url, json=payload, headers=self._headers)
-                response.raise_for_status()
-                result = response.json()
+            with timing.phase("llm"):
+                async with httpx.AsyncClient(timeout=300.0) as client:
+                    response = await client.post(self.chat_url, json=payload, headers=self._headers)
+                    response.raise_for_status()
+                    result = response.json()
 
             return self._adapt_response(result, request.model)
 
@@ -56,7 +59,10 @@ class LLMService:
             logger.info(f"Calling BigModel API with streaming: model={request.model}")
 
             async with httpx.AsyncClient(timeout=300.0) as client:
+                started = time.perf_counter()
                 async with client.stream("POST", self.chat_url, json=payload, headers=self._headers) as response:
+                    # 流式接口只统计到上游返回响应头为止
+                    timing.record("llm", time.perf_counter() - started)
                     response.raise_for_status()
                     async for chunk in self._parse_sse(response):
                         yield chunk
@@ -78,10 +84,11 @@ class LLMService:
 
             logger.info(f"Calling BigModel Chat API: model={request.model}, messages={len(messages)}")
 
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(self.chat_url, json=payload, headers=self._headers)
-                response.raise_for_status()
-                result = response.json()
+            with timing.phase("llm"):
+                async with httpx.AsyncClient(timeout=300.0) as client:
+                    response = await client.post(self.chat_url, json=payload, headers=self._headers)
+                    response.raise_for_status()
+                    result = response.json()
 
             return self._adapt_response(result, request.model)
 
@@ -103,7 +110,10 @@ class LLMService:
             logger.info(f"Calling BigModel Chat API with streaming: model={request.model}")
 
             async with httpx.AsyncClient(timeout=300.0) as client:
+                started = time.perf_counter()
                 async with client.stream("POST", self.chat_url, json=payload, headers=self._headers) as response:
+                    # 流式接口只统计到上游返回响应头为止
+                    timing.record("llm", time.perf_counter() - started)
                     response.raise_for_status()
                     async for chunk in self._parse_sse(response):
                         yield chunk
@@ -0,0 +1,187 @@
+"""跨美食、饮品、饭店的全文检索
+
+三张表各有一个数据库生成的加权 ``search_vector``（见迁移 007），这里用
+一条 ``UNION ALL`` 语句检索：每个分支先用 GIN 索引筛出命中行、按
+``ts_rank_cd`` 取本表前 limit 条，合并后再取全局前 limit 条，最后只对
+这一页的行计算 ``ts_headline`` 高亮。
+
+``simple`` 配置不切分中文，整段汉字是一个词。n-gram 倒排索引
+（app.core.search_index）就绪时，它的命中（候选经 ILIKE 复核）也算命中，
+并在相关度上加 NGRAM_MATCH_RANK，中文子串因此也能搜到。
+
+结果按 (相关度 DESC, 类型 DESC, id DESC) 排序，游标是最后一行的
+(相关度, 类型, id)，翻页用行值比较定位，与列表接口的键集分页一致。
+
+高亮是 HTML 片段，但标题和正文是用户输入：``ts_headline`` 只用控制字符
+``\\x02``/``\\x03`` 标记命中位置（原文里的这两个字符先被去掉），``render_highlight``
+对整段文本做 HTML 转义后再把标记换成 ``<em>``/``</em>``。
+
+需求里"100 万行下个位数毫秒返回"的目标没有在 PostgreSQL 上实测过（本仓库
+的测试环境没有数据库），上线前需要用真实数据量和 EXPLAIN ANALYZE 验证。
+"""
+import html
+import base64
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, func, literal_column, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import search_index, timing
+from app.models.drink import Drink
+from app.models.enjoy import Enjoy
+from app.models.food import Food
+
+logger = logging.getLogger(__name__)
+
+# 与生成列使用的文本检索配置一致；直接写进语句，避免 regconfig 参数的类型推断
+TEXT_SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# 结果类型 -> 模型
+SEARCH_TARGETS = (
+    ("food", Food),
+    ("drink", Drink),
+    ("enjoy", Enjoy),
+)
+
+# n-gram 索引命中的加分，与 ts_rank_cd（归一化后通常在 0-1 之间）相加
+NGRAM_MATCH_RANK = 0.1
+
+# 命中标记：不是 HTML，转义之后才换成 <em>，用户输入里的标签因此不会被当成标记
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+_HIGHLIGHT_MARKERS = literal_column(r"E'\x02\x03'")
+TITLE_HIGHLIGHT_OPTIONS = literal_column(r"E'HighlightAll=true, StartSel=\x02, StopSel=\x03'")
+CONTENT_HIGHLIGHT_OPTIONS = literal_column(
+    r"E'StartSel=\x02, StopSel=\x03, MaxWords=30, MinWords=10, MaxFragments=2'"
+)
+
+# 解码后的游标：(相关度, 类型, id)
+SearchCursor = Tuple[float, str, int]
+
+
+def render_highlight(headline: Optional[str]) -> str:
+    """``ts_headline`` 结果转成安全的 HTML：先整体转义，再把命中标记换成 <em>"""
+    if not headline:
+        return ""
+    escaped = html.escape(headline, quote=True)
+    return escaped.replace(HIGHLIGHT_START, "<em>").replace(HIGHLIGHT_STOP, "</em>")
+
+
+def _without_markers(text):
+    """去掉原文里的命中标记字符，防止伪造高亮"""
+    return func.translate(text, _HIGHLIGHT_MARKERS, "")
+
+
+def encode_search_cursor(rank: float, result_type: str, row_id: Any) -> str:
+    raw = json.dumps([rank, result_type, int(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_search_cursor(cursor: str) -> SearchCursor:
+    """无法解析时抛出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, result_type, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), str(result_type), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的分页游标") from e
+
+
+class SearchService:
+    """Full-text search across foods, drinks and enjoys"""
+
+    def build_query(self, q: str, limit: int = 20, after: Optional[SearchCursor] = None):
+        """构造检索语句；``q`` 使用 websearch 语法（空格为 AND，"短语"，-排除，or）"""
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, q)
+        branches = []
+        for result_type, model in SEARCH_TARGETS:
+            type_column = literal_column(f"'{result_type}'")
+            rank = cast(func.ts_rank_cd(model.search_vector, tsquery, 1), Float)
+            matched = model.search_vector.op("@@")(tsquery)
+            in_ngram = search_index.indexed_condition(result_type, q)
+            if in_ngram is not None:
+                matched = or_(matched, in_ngram)
+                rank = rank + case((in_ngram, NGRAM_MATCH_RANK), else_=0.0)
+            conditions = [matched]
+            if after is not None:
+                conditions.append(tuple_(rank, type_column, model.id) < tuple_(*after))
+            branches.append(
+                select(
+                    type_column.label("type"),
+                    model.id.label("id"),
+                    model.title.label("title"),
+                    model.content.label("content"),
+                    model.cover.label("cover"),
+                    model.star.label("star"),
+                    model.create_time.label("create_time"),
+                    rank.label("rank"),
+                )
+                .where(and_(*conditions))
+                # 按选择列表里的 rank 排序，不再重复计算一遍相关度表达式
+                .order_by(literal_column("rank").desc(), model.id.desc())
+                .limit(limit)
+            )
+
+        hits = union_all(*branches).subquery("hits")
+        top = (
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.type.desc(), hits.c.id.desc())
+            .limit(limit)
+            .subquery("top")
+        )
+        return select(
+            top.c.type,
+            top.c.id,
+            top.c.title,
+            top.c.cover,
+            top.c.star,
+            top.c.create_time,
+            top.c.rank,
+            func.ts_headline(TEXT_SEARCH_CONFIG, _without_markers(top.c.title), tsquery, TITLE_HIGHLIGHT_OPTIONS)
+            .label("title_highlight"),
+            func.ts_headline(
+                TEXT_SEARCH_CONFIG, _without_markers(func.coalesce(top.c.content, "")), tsquery,
+                CONTENT_HIGHLIGHT_OPTIONS
+            ).label("content_highlight"),
+        ).order_by(top.c.rank.desc(), top.c.type.desc(), top.c.id.desc())
+
+    async def search(
+        self,
+        q: str,
+        db: AsyncSession,
+        limit: int = 20,
+        after: Optional[SearchCursor] = None
+    ) -> Dict[str, Any]:
+        """检索并返回一页混合结果和下一页游标"""
+        q = (q or "").strip()
+        if not q:
+            raise ValueError("检索词不能为空")
+
+        result = await db.execute(self.build_query(q, limit=limit, after=after))
+        rows = result.all()
+
+        results: List[Dict[str, Any]] = []
+        with timing.phase("serialize"):
+            for row in rows:
+                results.append({
+                    "type": row.type,
+                    "id": str(row.id),
+                    "title": row.title or "",
+                    "cover": row.cover or "",
+                    "star": row.star,
+                    "create_time": row.create_time.isoformat() if row.create_time else None,
+                    "rank": row.rank,
+                    "highlight": {
+                        "title": render_highlight(row.title_highlight),
+                        "content": render_highlight(row.content_highlight),
+                    },
+                })
+
+        cursor = None
+        if rows and len(rows) >= limit:
+            last = rows[-1]
+            cursor = encode_search_cursor(last.rank, last.type, last.id)
+        logger.debug(f"全文检索 q={q!r} 返回 {len(results)} 条")
+        return {"results": results, "next_cursor": cursor}
@@ -0,0 +1,108 @@
+"""Login session business logic: refresh-token issue, rotation and revocation"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.core.config import settings
+from app.core.security import create_access_token, user_token_claims
+from app.core import revocation
+
+
+def hash_refresh_token(token: str) -> str:
+    """刷新令牌是 256 位随机串，sha256 摘要足以防止数据库泄露后被直接使用"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class SessionService:
+    """Service class for login sessions backed by refresh tokens."""
+
+    def _issue_refresh_token(self, user_id: int, session_id: str, db: AsyncSession) -> str:
+        token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            user_id=user_id,
+            session_id=session_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+        return token
+
+    def _issue_access_token(self, user: User, session_id: str) -> str:
+        return create_access_token(
+            subject=str(user.id),
+            claims={**user_token_claims(user), "sid": session_id},
+        )
+
+    async def create_session(self, user: User, db: AsyncSession) -> Tuple[str, str]:
+        """登录/注册成功后开启新会话，返回 (access_token, refresh_token)"""
+        session_id = secrets.token_hex(16)
+        refresh_token = self._issue_refresh_token(user.id, session_id, db)
+        await db.commit()
+        return self._issue_access_token(user, session_id), refresh_token
+
+    async def rotate(self, refresh_token: str, db: AsyncSession) -> Optional[Tuple[User, str, str]]:
+        """用刷新令牌换一对新令牌，旧刷新令牌作废
+
+        一条带条件的 UPDATE 原子地占用旧令牌；已轮换过的令牌再次出现
+        说明被重放（可能已泄露），整个会话随之撤销。
+        """
+        token_hash = hash_refresh_token(refresh_token)
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.rotated_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(rotated_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.session_id)
+        )
+        row = result.first()
+        if row is None:
+            await db.rollback()
+            replayed = await db.execute(
+                select(RefreshToken.session_id)
+                .where(RefreshToken.token_hash == token_hash, RefreshToken.rotated_at.isnot(None))
+            )
+            session_id = replayed.scalar()
+            if session_id is not None:
+                await self.revoke_session(session_id, db)
+            return None
+
+        user_id, session_id = row
+        user = await db.get(User, user_id)
+        if user is None or not user.is_active:
+            await db.rollback()
+            return None
+
+        new_refresh_token = self._issue_refresh_token(user_id, session_id, db)
+        await db.commit()
+        return user, self._issue_access_token(user, session_id), new_refresh_token
+
+    async def _revoke(self, db: AsyncSession, *conditions, commit: bool = True) -> List[str]:
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.revoked_at.is_(None), *conditions)
+            .values(revoked_at=datetime.now(timezone.utc))
+            .returning(RefreshToken.session_id)
+        )
+        session_ids = list(set(result.scalars().all()))
+        if commit:
+            await db.commit()
+            revocation.revoke_local(session_ids)
+        return session_ids
+
+    async def revoke_session(self, session_id: str, db: AsyncSession) -> bool:
+        """撤销单个会话（登出）"""
+        return bool(await self._revoke(db, RefreshToken.session_id == session_id))
+
+    async def revoke_user_sessions(self, user_id: int, db: AsyncSession, commit: bool = True) -> List[str]:
+        """撤销用户的全部会话；``commit=False`` 时由调用方提交后再调用 ``revocation.revoke_local``"""
+        return await self._revoke(db, RefreshToken.user_id == user_id, commit=commit)
@@ -1,12 +1,46 @@
 """User business logic layer using SQLAlchemy and PostgreSQL"""
+import re
 from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import select, or_, case
 from datetime import datetime, timezone
 
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core import user_cache, token_versions, revocation
+from app.services.session_service import SessionService
+from app.utils.pagination import Cursor, Page, apply_keyset, check_view, fetch_page
+
+
+# 唯一字段按原有校验顺序排列，多个字段同时冲突时报告第一个
+IDENTITY_FIELDS = ("email", "mobile", "username")
+CONFLICT_MESSAGES = {
+    "email": "邮箱已存在",
+    "mobile": "手机号已存在",
+    "username": "用户名已存在",
+}
+# 迁移创建的 UNIQUE 约束 (users_<field>_key) 与模型 create_all 创建的唯一索引 (ix_users_<field>)
+UNIQUE_CONSTRAINTS = {
+    name: field
+    for field in IDENTITY_FIELDS
+    for name in (f"users_{field}_key", f"ix_users_{field}")
+}
+_KEY_DETAIL = re.compile(r"Key \((\w+)\)=")
+
+
+def conflicting_field(exc: IntegrityError) -> Optional[str]:
+    """从唯一约束冲突异常中找出冲突的字段，无法识别时返回 None"""
+    orig = exc.orig
+    for source in (getattr(orig, "__cause__", None), orig):
+        name = getattr(source, "constraint_name", None)
+        if name in UNIQUE_CONSTRAINTS:
+            return UNIQUE_CONSTRAINTS[name]
+    match = _KEY_DETAIL.search(str(orig))
+    if match and match.group(1) in CONFLICT_MESSAGES:
+        return match.group(1)
+    return None
 
 
 class UserService:
@@ -16,7 +50,7 @@ class UserService:
         self.db = db
 
     async def create_user(self, user_create: UserCreate, db: AsyncSession) -> User:
-        """Create a new user in PostgreSQL - 先验证后插入"""
+        """Create a new user in PostgreSQL - 先校验入参，唯一性冲突由数据库约束识别"""
 
         # 1. 先进行所有验证，确保可以创建用户
         if not user_create.email and not user_create.mobile:
@@ -28,51 +62,69 @@ class UserService:
         if not user_create.password or len(user_create.password) < 8:
             raise ValueError("密码长度至少为8个字符")
 
-        # 2. 检查邮箱是否已存在（如果提供了邮箱）
-        if user_create.email:
-            result = await db.execute(select(User).where(User.email == user_create.email))
-            existing_user = result.scalar_one_or_none()
-            if existing_user:
-                raise ValueError("邮箱已存在")
-
-        # 3. 检查手机号是否已存在（如果提供了手机号）
-        if user_create.mobile:
-            result = await db.execute(select(User).where(User.mobile == user_create.mobile))
-            existing_mobile = result.scalar_one_or_none()
-            if existing_mobile:
-                raise ValueError("手机号已存在")
-
-        # 3. 检查用户名是否已存在
-        result = await db.execute(select(User).where(User.username == user_create.username))
-        existing_username = result.scalar_one_or_none()
-        if existing_username:
-            raise ValueError("用户名已存在")
-
-        # 4. 所有验证通过后，才创建并插入用户
+        # 2. 直接插入，唯一性由数据库约束保证；冲突时映射回原有的错误信息
         now = datetime.now(timezone.utc)
         user = User(
             email=user_create.email,
             mobile=user_create.mobile,
             username=user_create.username,
-            hashed_password=get_password_hash(user_create.password),
+            hashed_password=await get_password_hash_async(user_create.password),
             is_active=user_create.is_active if hasattr(user_create, 'is_active') else True,
             is_superuser=user_create.is_superuser if hasattr(user_create, 'is_superuser') else False,
             vip_level=user_create.vip_level if hasattr(user_create, 'vip_level') else 1,
+            token_version=0,
             created_at=now,
             updated_at=now,
         )
 
-        # 5. 最后一步才插入数据库
         db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            field = conflicting_field(e) or await self._find_identity_conflict(
+                db,
+                email=user_create.email,
+                mobile=user_create.mobile,
+                username=user_create.username,
+            )
+            if field is None:
+                raise
+            raise ValueError(CONFLICT_MESSAGES[field])
+        # 所有列都已在插入时确定（id 通过 RETURNING 取回），无需再 refresh
         return user
 
+    async def _find_identity_conflict(
+        self, db: AsyncSession, exclude_id: Optional[int] = None, **values: Optional[str]
+    ) -> Optional[str]:
+        """一次查询找出与 email/mobile/username 冲突的字段"""
+        conditions = [getattr(User, f) == values[f] for f in IDENTITY_FIELDS if values.get(f) is not None]
+        if not conditions:
+            return None
+        stmt = select(User.email, User.mobile, User.username).where(or_(*conditions))
+        if exclude_id is not None:
+            stmt = stmt.where(User.id != exclude_id)
+        rows = (await db.execute(stmt)).all()
+        for field in IDENTITY_FIELDS:
+            value = values.get(field)
+            if value is not None and any(getattr(row, field) == value for row in rows):
+                return field
+        return None
+
     async def get_user(self, user_id: int, db: AsyncSession) -> Optional[User]:
         """Get user by ID."""
         result = await db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_user_cached(self, user_id: int, db: AsyncSession) -> Optional[User]:
+        """Get user by ID through the in-process user cache (returns a detached instance on hit)."""
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await self.get_user(user_id, db)
+            if user is not None:
+                user_cache.put(user)
+        return user
+
     async def get_user_by_email(self, email: str, db: AsyncSession) -> Optional[User]:
         """Get user by email."""
         result = await db.execute(select(User).where(User.email == email))
@@ -88,59 +140,81 @@ class UserService:
         result = await db.execute(select(User).where(User.mobile == mobile))
         return result.scalar_one_or_none()
 
-    async def get_users(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get list of users with pagination."""
-        result = await db.execute(select(User).offset(skip).limit(limit))
+    async def get_users(
+        self, db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None
+    ) -> List[User]:
+        """Get list of users, newest first, by offset or keyset cursor."""
+        result = await db.execute(apply_keyset(select(User), User.created_at, User.id, after=after, skip=skip, limit=limit))
         return result.scalars().all()
 
-    async def get_users_count(self, db: AsyncSession) -> int:
-        """Get total count of all users."""
-        from sqlalchemy import func
-        result = await db.execute(select(func.count(User.id)))
-        return result.scalar()
+    async def get_users_page(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        total_mode: str = "exact",
+        view: str = "full"
+    ) -> Page:
+        """Get a page of users, newest first, with the total from the same statement.
+
+        ``view="full"`` returns User entities; ``view="summary"`` returns rows of
+        ``User.summary_columns()`` only.
+        """
+        columns = [User] if check_view(view) == "full" else User.summary_columns()
+        return await fetch_page(
+            db, select(*columns), User.created_at, User.id,
+            table=User.__tablename__, filtered=False,
+            skip=skip, limit=limit, after=after, total_mode=total_mode
+        )
 
     async def update_user(self, user_id: int, user_update: UserUpdate, db: AsyncSession) -> Optional[User]:
         """Update user information."""
-        user = await self.get_user(user_id, db)
+        update_data = user_update.model_dump(exclude_unset=True)
+
+        # 一次查询同时取出目标用户和与新邮箱/用户名冲突的用户
+        checks = {f: update_data[f] for f in ("email", "username") if update_data.get(f) is not None}
+        conditions = [User.id == user_id] + [getattr(User, f) == v for f, v in checks.items()]
+        result = await db.execute(select(User).where(or_(*conditions)))
+        rows = result.scalars().all()
+
+        user = next((row for row in rows if row.id == user_id), None)
         if not user:
             return None
 
-        # 验证更新数据
-        update_data = user_update.model_dump(exclude_unset=True)
+        for field, value in checks.items():
+            if any(row.id != user_id and getattr(row, field) == value for row in rows):
+                raise ValueError(CONFLICT_MESSAGES[field])
 
-        # 检查邮箱是否已存在（如果更新邮箱）
-        if "email" in update_data:
-            result = await db.execute(
-                select(User).where(
-                    and_(User.email == update_data["email"], User.id != user_id)
-                )
-            )
-            existing_email = result.scalar_one_or_none()
-            if existing_email:
-                raise ValueError("邮箱已存在")
-
-        # 检查用户名是否已存在（如果更新用户名）
-        if "username" in update_data:
-            result = await db.execute(
-                select(User).where(
-                    and_(User.username == update_data["username"], User.id != user_id)
-                )
-            )
-            existing_username = result.scalar_one_or_none()
-            if existing_username:
-                raise ValueError("用户名已存在")
+        # 改密码或停用账号时递增令牌版本，已签发的令牌随之失效；刷新令牌一并撤销
+        revoked_sessions = []
+        if "password" in update_data or update_data.get("is_active") is False:
+            update_data["token_version"] = (user.token_version or 0) + 1
+            revoked_sessions = await SessionService().revoke_user_sessions(user_id, db, commit=False)
 
         # 处理密码更新
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
 
         # 更新字段
         for field, value in update_data.items():
             setattr(user, field, value)
 
         user.updated_at = datetime.now(timezone.utc)
-        await db.commit()
-        await db.refresh(user)
+        await user_cache.invalidate(user_id, db)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            # 查询之后被并发请求抢先占用
+            await db.rollback()
+            field = conflicting_field(e)
+            if field is None:
+                raise
+            raise ValueError(CONFLICT_MESSAGES[field])
+        # 提交前可能有并发请求把旧数据写回缓存
+        user_cache.discard(user_id)
+        token_versions.put(user_id, user.token_version or 0)
+        revocation.revoke_local(revoked_sessions)
         return user
 
     async def delete_user(self, user_id: int, db: AsyncSession) -> bool:
@@ -150,19 +224,24 @@ class UserService:
             return False
 
         await db.delete(user)
+        await user_cache.invalidate(user_id, db)
         await db.commit()
+        user_cache.discard(user_id)
+        token_versions.discard(user_id)
         return True
 
     async def authenticate_user(self, identifier: str, password: str, db: AsyncSession) -> Optional[User]:
         """Authenticate user with email or mobile phone number and password."""
-        # 先尝试通过邮箱查找
-        user = await self.get_user_by_email(identifier, db)
-
-        # 如果邮箱没找到，尝试通过手机号查找
-        if not user:
-            user = await self.get_user_by_mobile(identifier, db)
+        # 一次查询同时匹配邮箱和手机号，邮箱优先
+        result = await db.execute(
+            select(User)
+            .where(or_(User.email == identifier, User.mobile == identifier))
+            .order_by(case((User.email == identifier, 0), else_=1))
+            .limit(1)
+        )
+        user = result.scalar_one_or_none()
 
         # 验证密码
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             return None
         return user
@@ -0,0 +1,33 @@
+"""ASGI scope helpers shared by middleware."""
+from typing import Optional
+
+from starlette.types import Scope
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def get_route_template(scope: Scope) -> str:
+    """Return the matched route template (e.g. /api/v1/foods/{food_id}).
+
+    FastAPI stores the matched APIRoute in scope["route"] during routing, so
+    this is only meaningful once the downstream app has run. Requests that
+    matched no route collapse into a single label to keep cardinality bounded.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+def get_client_ip(scope: Scope, header: str = "") -> Optional[str]:
+    """Return the client IP, preferring a proxy-set header such as X-Real-IP.
+
+    Only pass a header name when the app is reachable solely through a proxy
+    that overwrites it; otherwise clients could spoof their address.
+    """
+    if header:
+        name = header.lower().encode("latin-1")
+        for key, value in scope.get("headers", ()):
+            if key == name:
+                return value.decode("latin-1").split(",")[0].strip() or None
+    client = scope.get("client")
+    return client[0] if client else None
@@ -0,0 +1,56 @@
+"""布隆过滤器 - 只会误判存在，不会漏判"""
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """按预期条数和误判率确定位数组大小与哈希次数
+
+    k 个位置由一次 blake2b 摘要拆成两个 64 位整数做双重哈希得到。
+    只在事件循环线程里使用，不加锁。
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """加入一个键；返回它此前是否不在过滤器里
+
+        ``count`` 只统计此前不在的键，重复加入（如增量刷新的回看窗口）不会
+        虚增条数；误判为已存在的新键不计入，偏差不超过误判率。
+        """
+        bits = self._bits
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,86 @@
+"""orjson 快速响应 - 把统一响应信封直接序列化成字节
+
+默认情况下端点返回的 ApiSuccessResponse 会先按 response_model 校验一遍，
+再经过 jsonable_encoder 和 json.dumps。按路由器开启：
+
+    router = APIRouter(route_class=ApiORJSONRoute)
+
+开启后端点返回的 ApiSuccessResponse / ApiErrorResponse 会被直接写成
+``{code, statusCode, msg, data, timestamp}`` 的 UTF-8 字节（中文不转义），
+跳过重复校验；OpenAPI 文档仍按 response_model 生成。
+"""
+import functools
+import inspect
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.utils.response import ApiErrorResponse, ApiSuccessResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """orjson 不认识的类型：pydantic 模型、Decimal，其余交给 jsonable_encoder"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return jsonable_encoder(obj)
+
+
+class ApiORJSONResponse(Response):
+    """使用 orjson 序列化的 JSON 响应"""
+    media_type = "application/json; charset=utf-8"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def envelope_response(
+    envelope: Any, status_code: int = 200
+) -> ApiORJSONResponse:
+    """把 ApiSuccessResponse / ApiErrorResponse 直接写成响应，不经过 model_dump"""
+    return ApiORJSONResponse(
+        {
+            "code": envelope.code,
+            "statusCode": envelope.statusCode,
+            "msg": envelope.msg,
+            "data": envelope.data,
+            "timestamp": envelope.timestamp,
+        },
+        status_code=status_code,
+    )
+
+
+def _wrap_endpoint(endpoint: Callable, status_code: Optional[int]) -> Callable:
+    http_status = status_code or 200
+
+    def convert(result: Any) -> Any:
+        if isinstance(result, (ApiSuccessResponse, ApiErrorResponse)):
+            return envelope_response(result, http_status)
+        return result
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return convert(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return convert(endpoint(*args, **kwargs))
+    return wrapper
+
+
+class ApiORJSONRoute(APIRoute):
+    """端点返回的统一响应信封直接用 orjson 输出（按路由器开启）"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        super().__init__(path, _wrap_endpoint(endpoint, kwargs.get("status_code")), **kwargs)
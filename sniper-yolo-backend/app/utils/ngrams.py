@@ -0,0 +1,42 @@
+"""n-gram 词项切分 - 不依赖分词词典的中文检索
+
+文本先做 NFKC 归一化并转小写，再按连续的汉字或连续的字母数字切成若干段，
+每段的每个字（单字）和每两个相邻字（二元组）各是一个词项。查询时每段
+只取二元组（一个字的段取单字）：
+
+- 原文包含查询的某段，原文的词项就一定包含这段的全部查询词项，所以
+  "查询词项是文档词项的子集" 不会漏掉任何子串命中（``lat``、``atte``
+  都能找到 ``latte``）；
+- 反过来二元组都出现不代表原文连续出现，候选会多出一些，调用方需要
+  用原始条件（ILIKE）复核。
+"""
+import re
+import unicodedata
+from typing import FrozenSet, List, Set
+
+_TOKEN_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]+|[0-9a-z]+")
+
+
+def _runs(text: str) -> List[str]:
+    return _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower())
+
+
+def _bigrams(run: str) -> Set[str]:
+    return {run[i:i + 2] for i in range(len(run) - 1)}
+
+
+def document_terms(text: str) -> FrozenSet[str]:
+    """文档的全部词项：每段的单字和二元组"""
+    terms: Set[str] = set()
+    for run in _runs(text):
+        terms.update(run)
+        terms.update(_bigrams(run))
+    return frozenset(terms)
+
+
+def query_terms(text: str) -> FrozenSet[str]:
+    """命中文档必须全部包含的词项；查询里没有可检索的字符时为空"""
+    terms: Set[str] = set()
+    for run in _runs(text):
+        terms.update(_bigrams(run) if len(run) > 1 else run)
+    return frozenset(terms)
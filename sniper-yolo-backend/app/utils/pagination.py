@@ -0,0 +1,187 @@
+"""键集（游标）分页工具
+
+列表按 ``(创建时间 DESC, id DESC)`` 排序。游标是最后一行的
+``(创建时间, id)`` 经 base64 编码后的不透明字符串，下一页用行值比较
+``(create_time, id) < (:t, :id)`` 直接在复合索引上定位，深分页不再
+随页码线性变慢，翻页期间插入的新行也不会造成重复或遗漏。
+
+保留 ``page``/``count`` 的偏移分页；带游标时忽略偏移。
+
+``fetch_page`` 在同一条语句里取出一页数据和总数，总数有三种模式：
+
+- ``exact``：偏移分页用 ``count(*) OVER ()``，过滤条件只算一遍；游标分页
+  的窗口只能数到游标之后的行，改用同一语句里的非相关标量子查询；
+- ``estimate``：无过滤条件的列表读 ``pg_class.reltuples``（按表缓存），
+  不再扫描全表；带过滤条件时按 ``exact`` 处理；
+- ``none``：不计算总数。
+
+第一页就没取满时，总数就是本页行数，不再另外计数或估算。
+
+``query`` 可以查询单个实体（rows 为实体），也可以只查询若干列
+（view=summary，rows 为结果行，不经过 ORM 实体和 identity map）。
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+# 解码后的游标：(创建时间, id)
+Cursor = Tuple[Optional[datetime], int]
+
+
+def encode_cursor(created: Any, row_id: Any) -> str:
+    """``created`` 可以是 datetime 或 to_dict 里的 ISO 字符串"""
+    if isinstance(created, datetime):
+        created = created.isoformat()
+    raw = json.dumps([created, int(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """无法解析时抛出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created) if created is not None else None), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的分页游标") from e
+
+
+def apply_keyset(
+    query: Select,
+    time_column: Any,
+    id_column: Any,
+    after: Optional[Cursor] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Select:
+    """按 (时间 DESC NULLS FIRST, id DESC) 排序并定位到游标之后的一页
+
+    排序与 ``(time DESC, id DESC)`` 复合索引一致（PostgreSQL 中 DESC 默认
+    NULLS FIRST）。创建时间为空的行排在最前，只有游标停在这些行上时
+    才需要额外的 OR 条件。
+    """
+    query = query.order_by(time_column.desc().nulls_first(), id_column.desc())
+    if after is not None:
+        created, row_id = after
+        if created is None:
+            query = query.where(or_(and_(time_column.is_(None), id_column < row_id), time_column.isnot(None)))
+        else:
+            query = query.where(tuple_(time_column, id_column) < tuple_(created, row_id))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(rows: Sequence[Dict[str, Any]], limit: int, time_key: str = "create_time") -> Optional[str]:
+    """本页取满时返回指向最后一行的游标，否则说明已经到底"""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.get(time_key), last["id"])
+
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+# 列表投影：full 返回完整实体，summary 只查询卡片字段
+VIEWS = ("full", "summary")
+
+_estimates = TTLCache(256, settings.ESTIMATED_COUNT_CACHE_TTL)
+
+
+@dataclass
+class Page:
+    """一页结果；``total`` 为 None 表示未计算"""
+    rows: List[Any]
+    total: Optional[int]
+    total_exact: bool
+
+
+def check_view(view: str) -> str:
+    if view not in VIEWS:
+        raise ValueError(f"view 只能是 {', '.join(VIEWS)}")
+    return view
+
+
+def _is_entity_query(query: Select) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
+
+async def estimated_count(db: AsyncSession, table: str) -> Optional[int]:
+    """planner 统计里的行数估计；非 PostgreSQL 或表从未 ANALYZE 时返回 None"""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = _estimates.get(table)
+    if estimate is None:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate < 0:
+            return None
+        _estimates.set(table, estimate)
+    return estimate
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    time_column: Any,
+    id_column: Any,
+    *,
+    table: str,
+    filtered: bool,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Cursor] = None,
+    total_mode: str = "exact",
+) -> Page:
+    """执行 ``query``（已带过滤条件），返回一页实体或结果行和总数"""
+    if total_mode not in TOTAL_MODES:
+        raise ValueError(f"total_mode 只能是 {', '.join(TOTAL_MODES)}")
+    if total_mode == "estimate" and filtered:
+        # 带过滤条件时表级估计没有意义，按精确总数处理，响应里 total_exact 会如实标明
+        total_mode = "exact"
+    first_page = after is None and not skip
+    entity = _is_entity_query(query)
+
+    if total_mode == "exact":
+        if after is None:
+            total_column = func.count().over()
+        else:
+            total_column = select(func.count()).select_from(query.order_by(None).subquery()).scalar_subquery()
+        paged = apply_keyset(query.add_columns(total_column.label("total")), time_column, id_column,
+                             after=after, skip=skip, limit=limit)
+        result = await db.execute(paged)
+        records = result.all()
+        rows = [record[0] for record in records] if entity else records
+        if records:
+            return Page(rows, records[0].total, True)
+        if first_page:
+            return Page(rows, 0, True)
+        # 偏移越过末尾时窗口里没有行可读，退回单独计数
+        total = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        return Page(rows, total.scalar(), True)
+
+    result = await db.execute(apply_keyset(query, time_column, id_column, after=after, skip=skip, limit=limit))
+    rows = list(result.scalars().all() if entity else result.all())
+    if first_page and len(rows) < limit:
+        return Page(rows, len(rows), True)
+    if total_mode == "none":
+        return Page(rows, None, False)
+    estimate = await estimated_count(db, table)
+    if estimate is None:
+        total = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        return Page(rows, total.scalar(), True)
+    return Page(rows, max(estimate, skip + len(rows)), False)
+
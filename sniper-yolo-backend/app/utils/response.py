@@ -1,8 +1,22 @@
 """统一响应格式工具 - 使用Pydantic类实现"""
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional, Union
 from pydantic import BaseModel, Field, RootModel
 
+from app.core.metrics import api_errors_total
+
+_timestamp_cache = (0, "")
+
+
+def current_timestamp() -> str:
+    """当前时间的 "%Y-%m-%d %H:%M:%S" 字符串，同一秒内只格式化一次"""
+    global _timestamp_cache
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S"))
+    return _timestamp_cache[1]
+
 
 # class BaseResponse(BaseModel):
 #     """响应模型的基类"""
@@ -19,17 +33,17 @@ class ApiSuccessResponse(BaseModel):
     statusCode: int = 200
     msg: str = "Success"
     data: Optional[Any] = None
-    timestamp: str = Field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    timestamp: str = Field(default_factory=current_timestamp)
     
     @classmethod
     def create(cls, data: Any = None, msg: str = "Success", status_code: int = 200, code: str = "000000") -> "ApiSuccessResponse":
-        """快速创建成功响应实例"""
-        return cls(
+        """快速创建成功响应实例（字段由代码构造，跳过校验）"""
+        return cls.model_construct(
             code=code,
             data=data,
             msg=msg,
             statusCode=status_code,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp=current_timestamp()
         )
     
     def json(self, **kwargs):
@@ -44,16 +58,18 @@ class ApiErrorResponse(BaseModel):
     statusCode: int  # 添加statusCode字段
     msg: str  # 添加msg字段
     data: None = None  # 错误响应中data始终为None
-    timestamp: str = Field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    timestamp: str = Field(default_factory=current_timestamp)
 
     @classmethod
     def create(cls, code: str, status_code: int, msg: str) -> "ApiErrorResponse":
-        """快速创建错误响应实例"""
-        return cls(
+        """快速创建错误响应实例（字段由代码构造，跳过校验）"""
+        api_errors_total.inc(code)
+        return cls.model_construct(
             code=code,
             statusCode=status_code,
             msg=msg,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            data=None,
+            timestamp=current_timestamp()
         )
     
     def json(self, **kwargs):
@@ -0,0 +1,148 @@
+"""Benchmark: list pages as full ORM entities vs the view=summary projection.
+
+Seeds a synthetic table shaped like ``foods`` (long content, image and tag
+arrays stored as JSON so it runs on SQLite) and times fetching 20-row pages
+both ways through ``app.utils.pagination.apply_keyset``:
+
+- full: ``select(entity)`` loaded through the ORM session, serialized with
+  ``Food.to_dict``;
+- summary: ``select(*card_columns)`` rows mapped straight to dicts with
+  ``Food.summary_dict``, no entities or identity map.
+
+Reports rows/sec (query + serialize) and the orjson-encoded bytes per page.
+
+Runs on an in-memory SQLite database by default; pass a synchronous
+SQLAlchemy URL to run against PostgreSQL instead (the table is dropped and
+recreated).
+
+Usage (from sniper-yolo-backend/):
+    python -m benchmarks.bench_list_projection [rows] [--url postgresql+psycopg2://...]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text, create_engine, insert, select
+from sqlalchemy.orm import Session, declarative_base
+
+from app.models.food import Food
+from app.utils.pagination import apply_keyset
+
+PAGE_SIZE = 20
+PAGES = 200
+REPEAT = 5
+
+BenchBase = declarative_base()
+
+
+class BenchFood(BenchBase):
+    """与 foods 同形的表；数组列改用 JSON，SQLite 上也能跑"""
+    __tablename__ = "bench_projection_foods"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    content = Column(Text)
+    cover = Column(String)
+    images = Column(JSON)
+    tags = Column(JSON)
+    star = Column(Integer)
+    maker = Column(String, nullable=False)
+    flavor = Column(String)
+    category = Column(String)
+    create_time = Column(DateTime(timezone=True))
+    update_time = Column(DateTime(timezone=True))
+    created_by = Column(Integer)
+    updated_by = Column(Integer)
+
+    __table_args__ = (Index("ix_bench_projection_foods_create_time_id", create_time.desc(), id.desc()),)
+
+
+SUMMARY_COLUMNS = [getattr(BenchFood, column.key) for column in Food.summary_columns()]
+
+
+def seed(engine, count: int) -> None:
+    BenchBase.metadata.drop_all(engine)
+    BenchBase.metadata.create_all(engine)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    batch = 20000
+    with engine.begin() as conn:
+        for offset in range(0, count, batch):
+            conn.execute(insert(BenchFood), [
+                {
+                    "id": i + 1,
+                    "title": f"红烧肉 {i}",
+                    "content": "肥而不腻，入口即化，酱香浓郁。" * 40,
+                    "cover": f"https://cdn.example.com/foods/{i}/cover.jpg",
+                    "images": [f"https://cdn.example.com/foods/{i}/{n}.jpg" for n in range(6)],
+                    "tags": ["家常菜", "下饭"],
+                    "star": i % 5 + 1,
+                    "maker": "老王",
+                    "flavor": "咸鲜",
+                    "category": "荤菜",
+                    "create_time": start + timedelta(seconds=i),
+                    "update_time": start + timedelta(seconds=i),
+                    "created_by": 1,
+                    "updated_by": 1,
+                }
+                for i in range(offset, min(offset + batch, count))
+            ])
+
+
+def run(engine, fetch) -> tuple:
+    """逐页读取 PAGES 页；返回 (rows/sec 中位数, 每页平均字节数)"""
+    rates, sizes = [], []
+    for _ in range(REPEAT):
+        rows, size = 0, 0
+        started = time.perf_counter()
+        with Session(engine) as session:
+            after = None
+            for _ in range(PAGES):
+                page, after = fetch(session, after)
+                if not page:
+                    break
+                rows += len(page)
+                size += len(orjson.dumps(page))
+        rates.append(rows / (time.perf_counter() - started))
+        sizes.append(size / PAGES)
+    return statistics.median(rates), statistics.mean(sizes)
+
+
+def fetch_full(session, after):
+    query = apply_keyset(select(BenchFood), BenchFood.create_time, BenchFood.id, after=after, limit=PAGE_SIZE)
+    entities = session.execute(query).scalars().all()
+    page = [Food.to_dict(entity) for entity in entities]
+    # 和列表接口一样，每页用新的 identity map
+    session.expunge_all()
+    return page, (entities[-1].create_time, entities[-1].id) if entities else None
+
+
+def fetch_summary(session, after):
+    query = apply_keyset(select(*SUMMARY_COLUMNS), BenchFood.create_time, BenchFood.id, after=after, limit=PAGE_SIZE)
+    rows = session.execute(query).all()
+    page = [Food.summary_dict(row) for row in rows]
+    return page, (rows[-1].create_time, rows[-1].id) if rows else None
+
+
+def main(count: int, url: str) -> None:
+    engine = create_engine(url)
+    started = time.perf_counter()
+    seed(engine, count)
+    print(f"dialect: {engine.dialect.name}, rows: {count}, seeded in {time.perf_counter() - started:.1f}s")
+    print(f"{'view':>8} {'rows/sec':>10} {'bytes/page':>11}")
+
+    full_rate, full_bytes = run(engine, fetch_full)
+    summary_rate, summary_bytes = run(engine, fetch_summary)
+    print(f"{'full':>8} {full_rate:>10.0f} {full_bytes:>11.0f}")
+    print(f"{'summary':>8} {summary_rate:>10.0f} {summary_bytes:>11.0f}")
+    print(f"summary: {summary_rate / full_rate:.1f}x rows/sec, {summary_bytes / full_bytes:.0%} of the bytes")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", nargs="?", type=int, default=10_000)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args()
+    main(args.rows, args.url)
@@ -0,0 +1,107 @@
+"""Benchmark: OFFSET pagination vs keyset (cursor) pagination on deep pages.
+
+Seeds a synthetic table shaped like ``foods`` (id, create_time, title,
+content) with a ``(create_time DESC, id DESC)`` index, then times fetching
+page 1, 100 and 10000 (20 rows per page) both ways through
+``app.utils.pagination.apply_keyset``. The cursor for each page is looked up
+once outside the timed loop, as a client would have it from the previous
+response.
+
+Runs on an in-memory SQLite database by default; pass a synchronous
+SQLAlchemy URL to run against PostgreSQL instead (the table is dropped and
+recreated).
+
+Usage (from sniper-yolo-backend/):
+    python -m benchmarks.bench_pagination [rows] [--url postgresql+psycopg2://...]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, Text, create_engine, insert, select
+
+from app.utils.pagination import apply_keyset
+
+PAGE_SIZE = 20
+PAGES = (1, 100, 10000)
+REPEAT = 20
+
+metadata = MetaData()
+rows_table = Table(
+    "bench_keyset_rows",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("create_time", DateTime(timezone=True)),
+    Column("title", String),
+    Column("content", Text),
+)
+Index("ix_bench_keyset_rows_create_time_id", rows_table.c.create_time.desc(), rows_table.c.id.desc())
+
+
+def seed(engine, count: int) -> None:
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    batch = 50000
+    with engine.begin() as conn:
+        for offset in range(0, count, batch):
+            conn.execute(insert(rows_table), [
+                {
+                    "id": i + 1,
+                    # 每 7 行共用一个时间戳，覆盖按 id 决胜的情况
+                    "create_time": start + timedelta(seconds=(i // 7) * 7),
+                    "title": f"食品 {i}",
+                    "content": "内容" * 20,
+                }
+                for i in range(offset, min(offset + batch, count))
+            ])
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(f"VACUUM ANALYZE {rows_table.name}")
+
+
+def timed(conn, query) -> float:
+    conn.execute(query).all()  # warm-up
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        conn.execute(query).all()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main(count: int, url: str) -> None:
+    engine = create_engine(url)
+    started = time.perf_counter()
+    seed(engine, count)
+    print(f"dialect: {engine.dialect.name}, rows: {count}, seeded in {time.perf_counter() - started:.1f}s")
+    print(f"{'page':>6} {'offset ms':>10} {'keyset ms':>10} {'speedup':>8}")
+
+    t, pk = rows_table.c.create_time, rows_table.c.id
+    with engine.connect() as conn:
+        for page in PAGES:
+            skip = (page - 1) * PAGE_SIZE
+            if skip >= count:
+                continue
+            offset_query = apply_keyset(select(rows_table), t, pk, skip=skip, limit=PAGE_SIZE)
+            after = None
+            if skip:
+                # 上一页最后一行，即客户端手里的游标
+                previous = conn.execute(apply_keyset(select(t, pk), t, pk, skip=skip - 1, limit=1)).one()
+                after = (previous.create_time, previous.id)
+            keyset_query = apply_keyset(select(rows_table), t, pk, after=after, limit=PAGE_SIZE)
+
+            assert conn.execute(offset_query).all() == conn.execute(keyset_query).all()
+            offset_ms = timed(conn, offset_query)
+            keyset_ms = timed(conn, keyset_query)
+            print(f"{page:>6} {offset_ms:>10.3f} {keyset_ms:>10.3f} {offset_ms / keyset_ms:>7.1f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args()
+    main(args.rows, args.url)
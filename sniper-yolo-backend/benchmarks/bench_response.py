@@ -0,0 +1,85 @@
+"""Micro-benchmark: serializing a 100-row list envelope.
+
+Compares the default FastAPI path (response_model validation +
+jsonable_encoder + json.dumps) with ApiORJSONRoute, which writes the
+envelope straight to bytes with orjson. Drives the ASGI app directly.
+
+Usage (from sniper-yolo-backend/):
+    python -m benchmarks.bench_response [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import APIRouter, FastAPI
+
+from app.utils.fast_response import ApiORJSONRoute
+from app.utils.response import ApiSuccessResponse
+
+ROWS = [
+    {
+        "id": i,
+        "title": f"红烧肉 {i}",
+        "content": "肥而不腻，入口即化" * 4,
+        "maker": "老王",
+        "star": i % 5 + 1,
+        "flavor": "咸鲜",
+        "tags": ["家常菜", "下饭"],
+        "category": "热菜",
+        "image_url": f"https://cdn.example.com/foods/{i}.jpg",
+        "create_time": "2024-05-01T12:00:00",
+        "update_time": "2024-05-02T08:30:00",
+    }
+    for i in range(100)
+]
+
+
+def build_app(route_class=None) -> FastAPI:
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+
+    @router.get("/foods", response_model=ApiSuccessResponse)
+    async def list_foods() -> ApiSuccessResponse:
+        return ApiSuccessResponse.create(
+            data={"foods": ROWS, "total": 1000, "page": 1, "count": 100},
+            msg="获取食品列表成功"
+        )
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def drive(app, iterations: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/foods", "raw_path": b"/foods",
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(100):  # warm-up
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def main(iterations: int) -> None:
+    default = await drive(build_app(), iterations)
+    fast = await drive(build_app(ApiORJSONRoute), iterations)
+
+    print(f"iterations: {iterations}, rows per response: {len(ROWS)}")
+    print(f"response_model + json.dumps: {default:8.1f} us/req")
+    print(f"ApiORJSONRoute (orjson)    : {fast:8.1f} us/req  ({default / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,80 @@
+"""Micro-benchmark: per-request overhead of SecurityHeadersMiddleware on /health.
+
+Compares the previous BaseHTTPMiddleware implementation with the pure-ASGI
+one by driving the ASGI app directly (no network, no HTTP client), so the
+numbers isolate middleware cost.
+
+Usage (from sniper-yolo-backend/):
+    python -m benchmarks.bench_security_headers [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.security import SecurityHeadersMiddleware
+from app.utils.response import ApiSuccessResponse
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version this benchmark is measured against."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        return response
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return ApiSuccessResponse.create(data={"status": "healthy"}, msg="服务健康")
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def drive(app, iterations: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/health", "raw_path": b"/health",
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # warm-up
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def main(iterations: int) -> None:
+    baseline = await drive(build_app(), iterations)
+    legacy = await drive(build_app(LegacySecurityHeadersMiddleware), iterations)
+    current = await drive(build_app(SecurityHeadersMiddleware), iterations)
+
+    print(f"iterations: {iterations}")
+    print(f"no middleware          : {baseline:8.1f} us/req")
+    print(f"BaseHTTPMiddleware     : {legacy:8.1f} us/req  (+{legacy - baseline:.1f} us)")
+    print(f"pure ASGI (precomputed): {current:8.1f} us/req  (+{current - baseline:.1f} us)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,63 @@
+"""Tests for the instrumented connection pool."""
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.core import db_pool
+from app.core.db_pool import InstrumentedPool
+
+
+class _FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _checkout_twice(pool):
+    first = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    first.close()
+    pool.connect().close()
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkouts_and_starvation():
+    """Test that checkouts, waits, timeouts and connection ages are recorded."""
+    db_pool.pool_stats().reset()
+    pool = InstrumentedPool(_FakeConnection, pool_size=1, max_overflow=0, timeout=0.05)
+    db_pool.instrument_pool(pool)
+
+    await greenlet_spawn(_checkout_twice, pool)
+
+    status = db_pool.pool_status(type("Engine", (), {"pool": pool})())
+    assert status["instrumented"] is True
+    assert status["checkouts"] == 2 and status["checkout_timeouts"] == 1
+    assert status["checked_out"] == 0 and status["waiting"] == 0
+    assert status["peak_checked_out"] == 1
+    assert status["connections"]["open"] == 1
+    pool.dispose()
+    assert db_pool.pool_stats().connection_ages()["open"] == 0
+
+
+@pytest.mark.asyncio
+async def test_replica_pools_keep_their_own_stats():
+    """Test that a replica pool records into its own labelled stats, not the primary's."""
+    db_pool.pool_stats().reset()
+    primary_checkouts = db_pool.pool_stats().checkouts
+    replica = InstrumentedPool(_FakeConnection, pool_size=1, max_overflow=0, timeout=0.05)
+    db_pool.instrument_pool(replica, "replica-test")
+
+    await greenlet_spawn(_checkout_twice, replica)
+
+    status = db_pool.pool_status(type("Engine", (), {"pool": replica})())
+    assert status["pool"] == "replica-test" and status["checkouts"] == 2
+    assert db_pool.pool_stats().checkouts == primary_checkouts
+    assert db_pool.db_pool_checkout_timeouts_total._values[("replica-test",)] == 1
+
+    # dispose 重建出来的池沿用名字和统计
+    recreated = replica.recreate()
+    assert recreated.name == "replica-test" and recreated.stats is replica.stats
+    replica.dispose()
@@ -0,0 +1,53 @@
+"""Tests for the orjson envelope route class."""
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import APIRouter, FastAPI, status
+from httpx import AsyncClient, ASGITransport
+
+from app.utils.fast_response import ApiORJSONRoute
+from app.utils.response import ApiErrorResponse, ApiSuccessResponse, current_timestamp
+
+
+def _build_app() -> FastAPI:
+    router = APIRouter(route_class=ApiORJSONRoute)
+
+    @router.get("/ok", response_model=ApiSuccessResponse)
+    async def ok() -> ApiSuccessResponse:
+        return ApiSuccessResponse.create(
+            data={"title": "红烧肉", "price": Decimal("12.5"), "at": datetime(2024, 5, 1, 12, 0), 1: "one"},
+            msg="获取成功"
+        )
+
+    @router.get("/missing", response_model=ApiSuccessResponse)
+    def missing() -> ApiErrorResponse:
+        return ApiErrorResponse.create(code="B00404", status_code=status.HTTP_404_NOT_FOUND, msg="不存在")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_envelope_written_with_orjson():
+    """Test that envelopes keep their shape, Chinese text stays unescaped, and extra types serialize."""
+    async with AsyncClient(transport=ASGITransport(app=_build_app()), base_url="http://test") as ac:
+        ok = await ac.get("/ok")
+        missing = await ac.get("/missing")
+
+    assert "红烧肉".encode() in ok.content
+    assert ok.headers["content-type"] == "application/json; charset=utf-8"
+    body = ok.json()
+    assert list(body) == ["code", "statusCode", "msg", "data", "timestamp"]
+    assert body["data"] == {"title": "红烧肉", "price": 12.5, "at": "2024-05-01T12:00:00", "1": "one"}
+
+    assert missing.status_code == 200
+    assert json.loads(missing.content)["code"] == "B00404"
+
+
+def test_timestamp_format():
+    """Test that the cached timestamp keeps the envelope's format."""
+    datetime.strptime(current_timestamp(), "%Y-%m-%d %H:%M:%S")
+    datetime.strptime(ApiSuccessResponse().timestamp, "%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,37 @@
+"""Tests for the bounded password-hashing executor."""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing import BoundedHashExecutor, PasswordHashBusyError
+from app.core.security import get_password_hash, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_async_verify_matches_sync_hash():
+    """Test that the async API verifies hashes produced by the sync one."""
+    hashed = get_password_hash("correct horse")
+    assert await verify_password_async("correct horse", hashed)
+    assert not await verify_password_async("wrong horse", hashed)
+
+
+@pytest.mark.asyncio
+async def test_saturated_executor_rejects_immediately():
+    """Test that jobs beyond max_pending are rejected instead of queued."""
+    executor = BoundedHashExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        running = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        assert executor.saturated
+
+        with pytest.raises(PasswordHashBusyError):
+            await executor.run(lambda: None)
+
+        release.set()
+        await asyncio.gather(*running)
+        assert executor.pending == 0
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,33 @@
+"""Tests for the event-loop lag monitor and blocking-call watchdog."""
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from app.core import loop_monitor
+
+
+def _hold_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_lag_is_measured_and_blocking_stack_captured(caplog):
+    """Test that a blocking call shows up as lag and its stack is logged by the watchdog."""
+    stalls_before = loop_monitor.event_loop_stalls_total._values.get((), 0.0)
+    monitor = asyncio.create_task(loop_monitor.monitor_lag(0.01))
+    watchdog = loop_monitor.BlockingWatchdog(threading.get_ident(), 0.01, 0.05)
+    watchdog.start()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+            await asyncio.sleep(0.05)
+            _hold_the_loop(0.3)
+            await asyncio.sleep(0.05)
+    finally:
+        watchdog.stop()
+        monitor.cancel()
+
+    assert loop_monitor.event_loop_stalls_total._values.get((), 0.0) > stalls_before
+    assert any("_hold_the_loop" in r.getMessage() for r in caplog.records)
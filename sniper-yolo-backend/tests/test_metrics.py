@@ -0,0 +1,54 @@
+"""Tests for the in-process metrics registry and /metrics endpoint."""
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.core.metrics import MetricsRegistry
+from app.main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram buckets are exported cumulatively with sum/count."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5, "/a")
+
+    text = registry.render()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 5.55' in text
+
+
+def test_multiprocess_directory_merges_workers(tmp_path):
+    """Test that counters are summed across worker snapshots and dead gauges dropped."""
+    worker_a = MetricsRegistry(str(tmp_path))
+    worker_a.counter("hits_total", "Hits").inc(amount=2)
+    worker_a.gauge("in_flight", "In flight").set(3)
+    worker_a.flush()
+    # 模拟一个已退出的 worker 留下的快照
+    (tmp_path / "metrics_999999999.json").write_text(
+        '{"hits_total": {"type": "counter", "help": "Hits", "labelnames": [], "samples": [[[], 5]]},'
+        ' "in_flight": {"type": "gauge", "help": "In flight", "labelnames": [], "samples": [[[], 7]]}}'
+    )
+
+    text = worker_a.render()
+
+    assert "hits_total 7" in text
+    assert "in_flight 3" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_uses_route_template():
+    """Test that /metrics exposes request metrics keyed by route template."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/health")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+    assert "http_requests_in_flight" in response.text
@@ -1,6 +1,6 @@
 """Tests for Starlette middleware."""
 import pytest
-from httpx import AsyncClient
+from httpx import AsyncClient, ASGITransport
 
 from app.main import app
 
@@ -8,7 +8,7 @@ from app.main import app
 @pytest.mark.asyncio
 async def test_logging_middleware():
     """Test that logging middleware adds process time header."""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         response = await ac.get("/health")
     
     assert response.status_code == 200
@@ -18,7 +18,7 @@ async def test_logging_middleware():
 @pytest.mark.asyncio
 async def test_security_headers_middleware():
     """Test that security headers are added to responses."""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         response = await ac.get("/health")
     
     assert response.status_code == 200
@@ -30,7 +30,7 @@ async def test_security_headers_middleware():
 @pytest.mark.asyncio
 async def test_cors_middleware():
     """Test CORS middleware configuration."""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         # Test preflight request
         response = await ac.options(
             "/api/v1/users/",
@@ -41,4 +41,81 @@ async def test_cors_middleware():
         )
     
     assert response.status_code == 200
-    assert response.headers["access-control-allow-origin"] == "*"
\ No newline at end of file
+    # 允许携带凭证时不能返回 *，中间件回显请求的 Origin
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+@pytest.mark.asyncio
+async def test_logging_middleware_streams_and_truncates(caplog):
+    """Test that logging middleware forwards streamed bodies untouched and caps logged bytes."""
+    from starlette.applications import Starlette
+    from starlette.responses import StreamingResponse
+    from starlette.routing import Route
+
+    from app.middleware.logging import LoggingMiddleware
+
+    async def echo(request):
+        body = await request.body()
+
+        async def chunks():
+            for i in range(0, len(body), 100):
+                yield body[i:i + 100]
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    inner = Starlette(routes=[Route("/echo", echo, methods=["POST"])])
+    wrapped = LoggingMiddleware(inner, request_body_limit=8, response_body_limit=8, log_details=True)
+    payload = b"x" * 1000
+
+    caplog.set_level("INFO", logger="app.middleware.logging")
+    async with AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test") as ac:
+        response = await ac.post("/echo", content=payload, headers={"content-type": "text/plain"})
+
+    assert response.status_code == 200
+    assert response.content == payload
+    assert "→ Body: xxxxxxxx… [truncated, total 1000 bytes]" in caplog.text
+    assert "← Body   : xxxxxxxx… [truncated, total 1000 bytes]" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_logging_middleware_skips_denied_content_types(caplog):
+    """Test that multipart uploads are summarised instead of logged."""
+    from app.middleware.logging import LoggingMiddleware
+
+    caplog.set_level("INFO", logger="app.middleware.logging")
+    wrapped = LoggingMiddleware(app, log_details=True)
+    async with AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test") as ac:
+        await ac.post("/health", files={"file": ("a.png", b"\x89PNG" * 10, "image/png")})
+
+    assert "[multipart/form-data" in caplog.text
+    assert "PNG" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_access_log_uses_route_template(caplog, monkeypatch):
+    """Test that the access record is one JSON line keyed by route template."""
+    import json
+    from app.core.config import settings
+
+    monkeypatch.setitem(settings.ACCESS_LOG_SAMPLE_RATES, "/health", 1.0)
+    caplog.set_level("INFO", logger="app.access")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/health?probe=1")
+
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.access"]
+    assert records[-1]["route"] == "/health"
+    assert records[-1]["method"] == "GET"
+    assert records[-1]["status"] == 200
+    assert records[-1]["bytes_out"] > 0
+
+
+def test_queue_handler_drops_when_full():
+    """Test that a full log queue drops and counts records instead of blocking."""
+    import logging
+    import queue
+    from app.core.logging_setup import DroppingQueueHandler
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.dropped == 1
@@ -0,0 +1,137 @@
+"""Tests for keyset (cursor) pagination helpers."""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.food import Food
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor, fetch_page, next_cursor
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+    def scalar(self):
+        return self._rows[0]
+
+
+class _Session:
+    """Records statements and replays canned results; dialect is postgresql."""
+
+    def __init__(self, *results):
+        self.statements = []
+        self._results = list(results)
+        self.bind = type("Bind", (), {"dialect": postgresql.dialect()})()
+
+    def get_bind(self):
+        return self.bind
+
+    async def execute(self, statement, params=None):
+        self.statements.append(_sql(statement))
+        return _Result(self._results.pop(0))
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Test that cursors decode to (create_time, id) and malformed ones raise ValueError."""
+    created = datetime(2026, 10, 18, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created, "42")) == (created, 42)
+    assert decode_cursor(encode_cursor(created.isoformat(), 7)) == (created, 7)
+    assert decode_cursor(encode_cursor(None, 3)) == (None, 3)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_query_seeks_with_row_value_comparison():
+    """Test that a cursor replaces OFFSET with a (create_time, id) row comparison."""
+    after = (datetime(2026, 1, 1, tzinfo=timezone.utc), 10)
+    sql = _sql(apply_keyset(select(Food), Food.create_time, Food.id, after=after, skip=500, limit=20))
+    assert "(foods.create_time, foods.id) < (" in sql
+    assert "ORDER BY foods.create_time DESC NULLS FIRST, foods.id DESC" in sql
+    assert "OFFSET" not in sql
+
+    assert "OFFSET" in _sql(apply_keyset(select(Food), Food.create_time, Food.id, skip=500, limit=20))
+
+
+def test_next_cursor_only_for_full_pages():
+    """Test that next_cursor points at the last row of a full page and is None at the end."""
+    rows = [{"id": "2", "create_time": "2026-01-02T00:00:00+00:00"}, {"id": "1", "create_time": None}]
+    assert decode_cursor(next_cursor(rows, 2)) == (None, 1)
+    assert next_cursor(rows, 3) is None
+
+
+@pytest.mark.asyncio
+async def test_exact_total_comes_from_the_page_query():
+    """Test that offset pages use a window count and cursor pages a scalar subquery."""
+    row = type("Row", (), {"total": 57, "__getitem__": lambda self, i: "food"})()
+
+    db = _Session([row])
+    page = await fetch_page(db, select(Food), Food.create_time, Food.id,
+                            table="foods", filtered=True, skip=20, limit=20)
+    assert (page.rows, page.total, page.total_exact) == (["food"], 57, True)
+    assert len(db.statements) == 1 and "count(*) OVER ()" in db.statements[0]
+
+    db = _Session([row])
+    after = (datetime(2026, 1, 1, tzinfo=timezone.utc), 10)
+    await fetch_page(db, select(Food), Food.create_time, Food.id,
+                     table="foods", filtered=True, after=after, limit=20)
+    assert len(db.statements) == 1
+    assert "OVER" not in db.statements[0] and "(SELECT count(*)" in db.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_estimate_mode_skips_count_on_unfiltered_lists():
+    """Test that estimate mode reads reltuples, and short first pages need no total at all."""
+    from app.utils import pagination
+    pagination._estimates.clear()
+
+    db = _Session(["f"] * 20, [100000])
+    page = await fetch_page(db, select(Food), Food.create_time, Food.id,
+                            table="foods", filtered=False, limit=20, total_mode="estimate")
+    assert (page.total, page.total_exact) == (100000, False)
+    assert "reltuples" in db.statements[1] and "count" not in db.statements[0]
+
+    db = _Session(["f"] * 3)
+    page = await fetch_page(db, select(Food), Food.create_time, Food.id,
+                            table="foods", filtered=False, limit=20, total_mode="estimate")
+    assert (page.total, page.total_exact, len(db.statements)) == (3, True, 1)
+
+    with pytest.raises(ValueError):
+        await fetch_page(db, select(Food), Food.create_time, Food.id,
+                         table="foods", filtered=False, total_mode="bogus")
+    pagination._estimates.clear()
+
+
+@pytest.mark.asyncio
+async def test_summary_view_selects_only_card_columns():
+    """Test that view=summary queries the card columns and maps rows straight to dicts."""
+    from types import SimpleNamespace
+
+    from app.services.food_service import FoodService
+
+    created = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    row = SimpleNamespace(id=5, title="红烧肉", cover="c.jpg", star=4, tags=["家常"],
+                          maker="张三", create_time=created, total=1)
+    db = _Session([row])
+    page = await FoodService().search_foods_page(db=db, limit=20, view="summary")
+
+    select_list = db.statements[0].split("FROM")[0]
+    assert "foods.title" in select_list and "foods.cover" in select_list
+    assert "foods.content" not in select_list and "foods.images" not in select_list
+    assert page.rows == [{"id": "5", "title": "红烧肉", "cover": "c.jpg", "star": 4, "tags": ["家常"],
+                          "maker": "张三", "create_time": created.isoformat()}]
+    assert page.total == 1
+
+    with pytest.raises(ValueError):
+        await FoodService().search_foods_page(db=_Session(), view="compact")
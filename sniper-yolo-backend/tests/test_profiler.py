@@ -0,0 +1,52 @@
+"""Tests for the on-demand stack sampler."""
+import asyncio
+import sys
+import time
+
+import pytest
+
+from app.core import profiler
+
+
+def _burn(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_request_profile_only_counts_its_own_stacks():
+    """Test that samples outside the request's frame are attributed to [awaiting]."""
+    async def handler():
+        session = profiler.start_request_profile(sys._getframe(), "GET /test")
+        try:
+            _burn(0.1)
+            await asyncio.sleep(0.1)
+        finally:
+            profiler.finish_request_profile(session)
+        return session
+
+    session = await handler()
+    text = session.render()
+
+    assert session.samples > 0
+    assert any("_burn" in stack for stack in session.stacks)
+    assert profiler.AWAITING in session.stacks
+    assert all(stack.startswith("test_request_profile_only_counts_its_own_stacks.<locals>.handler")
+               for stack in session.stacks if stack != profiler.AWAITING)
+    assert profiler.get_profile(session.id) is session
+    assert text.splitlines()[0].startswith("# GET /test samples=")
+
+
+@pytest.mark.asyncio
+async def test_global_profile_sees_loop_thread():
+    """Test that a timed global session samples whatever runs on the loop."""
+    async def busy():
+        await asyncio.sleep(0.01)
+        _burn(0.1)
+
+    task = asyncio.create_task(busy())
+    session = await profiler.profile_for(0.2)
+    await task
+
+    assert any("_burn" in stack for stack in session.stacks)
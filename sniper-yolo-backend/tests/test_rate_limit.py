@@ -0,0 +1,56 @@
+"""Tests for the login token-bucket limiter."""
+import pytest
+
+from app.core.rate_limit import LoginRateLimitedError, LoginRateLimiter, TokenBucketLimiter
+from app.utils.asgi import get_client_ip
+
+
+def test_token_bucket_burst_refill_and_sweep():
+    """Test burst capacity, retry-after, continuous refill and sweeping of full buckets."""
+    limiter = TokenBucketLimiter(capacity=3, per_minute=60, sweep_interval=1000)
+
+    assert [limiter.hit("a", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.hit("a", now=0.0) == pytest.approx(1.0)
+    assert limiter.hit("a", now=1.0) == 0.0  # 1 token/s refilled
+
+    limiter.hit("b", now=0.0)
+    assert limiter.sweep(now=10.0) == 2
+    assert len(limiter) == 0
+
+
+def test_token_bucket_evicts_oldest_key_at_capacity():
+    """Test that the key table stays bounded."""
+    limiter = TokenBucketLimiter(capacity=1, per_minute=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.hit(key, now=0.0)
+    assert len(limiter) == 2
+    assert limiter.hit("a", now=0.0) == 0.0  # a 已被淘汰，重新获得满桶
+
+
+@pytest.mark.asyncio
+async def test_login_limiter_rejects_per_identifier():
+    """Test that repeated attempts on one identifier are rejected regardless of IP."""
+    limiter = LoginRateLimiter()
+    burst = int(limiter.local["identifier"].capacity)
+    for i in range(burst):
+        await limiter.check("User@Example.com", f"10.0.0.{i}")
+
+    with pytest.raises(LoginRateLimitedError) as exc:
+        await limiter.check(" user@example.com ", "10.0.0.99")
+    assert exc.value.retry_after > 0
+
+
+def test_client_ip_prefers_proxy_header():
+    """Test that the proxy header wins over the socket peer address."""
+    scope = {"headers": [(b"x-real-ip", b"203.0.113.7")], "client": ("172.18.0.2", 5000)}
+    assert get_client_ip(scope, "X-Real-IP") == "203.0.113.7"
+    assert get_client_ip(scope) == "172.18.0.2"
+
+
+def test_client_ip_header_is_not_trusted_by_default():
+    """Test that without CLIENT_IP_HEADER configured a spoofed X-Real-IP is ignored."""
+    from app.core.config import Settings
+
+    header = Settings.model_fields["CLIENT_IP_HEADER"].default
+    scope = {"headers": [(b"x-real-ip", b"198.51.100.1")], "client": ("203.0.113.9", 5000)}
+    assert get_client_ip(scope, header) == "203.0.113.9"
@@ -0,0 +1,81 @@
+"""Tests for read-replica routing and read-your-writes pinning."""
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.core import read_your_writes
+from app.core.database import Database
+from app.core.dependencies import get_read_db
+
+
+class _FakeSession:
+    def __init__(self, name):
+        self.name = name
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def close(self):
+        pass
+
+
+def _request(method: str = "GET", ip: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": method, "headers": [], "client": (ip, 1234)})
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    monkeypatch.setattr(Database, "async_session", lambda: _FakeSession("primary"))
+    monkeypatch.setattr(Database, "replica_sessions", [lambda: _FakeSession("r0"), lambda: _FakeSession("r1")])
+    monkeypatch.setattr(Database, "replica_healthy", [True, True])
+    read_your_writes.clear()
+    yield Database
+    read_your_writes.clear()
+
+
+async def _read_target(request: Request) -> str:
+    gen = get_read_db(request)
+    session = await gen.__anext__()
+    await gen.aclose()
+    return session.name
+
+
+@pytest.mark.asyncio
+async def test_round_robin_skips_unhealthy_and_falls_back(replicas):
+    """Test that reads alternate across healthy replicas and fall back to the primary."""
+    targets = {await _read_target(_request()) for _ in range(4)}
+    assert targets == {"r0", "r1"}
+
+    replicas.replica_healthy[0] = False
+    assert {await _read_target(_request()) for _ in range(4)} == {"r1"}
+
+    replicas.replica_healthy[1] = False
+    assert await _read_target(_request()) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_recent_writer_is_pinned_to_primary(replicas):
+    """Test that a client's reads go to the primary right after it writes."""
+    writer = _request("POST", ip="10.0.0.2")
+    read_your_writes.pin(read_your_writes.client_key(writer))
+
+    assert await _read_target(_request(ip="10.0.0.2")) == "primary"
+    assert await _read_target(_request(ip="10.0.0.3")) in {"r0", "r1"}
+
+
+@pytest.mark.asyncio
+async def test_health_check_marks_lagging_replica(monkeypatch, replicas):
+    """Test that check_replicas records each replica's probe result."""
+    monkeypatch.setattr(Database, "replica_engines", [SimpleNamespace(), SimpleNamespace()])
+    results = iter([True, False])
+
+    async def fake_ping(engine):
+        return next(results)
+
+    monkeypatch.setattr(Database, "_ping_engine", fake_ping)
+    assert await Database.check_replicas() == [True, False]
+    assert Database.replica_healthy == [True, False]
@@ -0,0 +1,80 @@
+"""Tests for the Bloom-filter session revocation list."""
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import revocation, token_versions
+from app.core.dependencies import get_current_claims
+from app.core.security import create_access_token
+from app.services.session_service import hash_refresh_token
+from app.utils.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added key is found and the false-positive rate stays near target."""
+    bloom = BloomFilter(1000, 0.01)
+    bloom.update(f"session-{i}" for i in range(1000))
+
+    assert all(f"session-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    # 被误判为已存在的新键不计数，偏差在误判率以内
+    entries = len(bloom)
+    assert 990 <= entries <= 1000
+
+    # 重复加入不计数
+    bloom.update(f"session-{i}" for i in range(500))
+    assert len(bloom) == entries
+    assert bloom.add("session-new") is True and bloom.add("session-new") is False
+
+
+def test_refresh_tokens_are_stored_hashed():
+    """Test that refresh tokens are persisted only as a sha256 hex digest."""
+    digest = hash_refresh_token("secret-token")
+    assert len(digest) == 64 and "secret-token" not in digest
+
+
+def _credentials(session_id: str) -> HTTPAuthorizationCredentials:
+    token = create_access_token(
+        subject="51",
+        claims={"is_active": True, "is_superuser": False, "vip_level": 1, "ver": 0, "sid": session_id},
+    )
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_revoked_session_rejected_without_database():
+    """Test that unrevoked sessions pass and locally revoked ones fail, both with db=None."""
+    revocation.clear()
+    token_versions.put(51, 0)
+
+    claims = await get_current_claims(request=None, credentials=_credentials("a" * 32), db=None)
+    assert claims.session_id == "a" * 32
+
+    revocation.revoke_local(["a" * 32])
+    with pytest.raises(HTTPException) as exc:
+        await get_current_claims(request=None, credentials=_credentials("a" * 32), db=None)
+    assert exc.value.status_code == 401
+
+    token_versions.discard(51)
+    revocation.clear()
+
+
+@pytest.mark.asyncio
+async def test_filter_hit_is_confirmed_once(monkeypatch):
+    """Test that a Bloom hit queries the database once and the answer is reused."""
+    revocation.clear()
+    revocation._filter.add("b" * 32)
+    lookups = []
+
+    async def fake_session_revoked(session_id, db):
+        lookups.append(session_id)
+        return False
+
+    monkeypatch.setattr(revocation, "_session_revoked", fake_session_revoked)
+
+    assert not await revocation.is_revoked("b" * 32, db=None)
+    assert not await revocation.is_revoked("b" * 32, db=None)
+    assert not await revocation.is_revoked("c" * 32, db=None)
+    assert lookups == ["b" * 32]
+    revocation.clear()
@@ -0,0 +1,57 @@
+"""Tests for the unified full-text search query."""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.search_service import (
+    SearchService,
+    decode_search_cursor,
+    encode_search_cursor,
+    render_highlight,
+)
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_search_is_one_ranked_union_with_highlights_on_the_page_only():
+    """Test that all three tables are searched in one UNION ALL and headlines wrap the limited page."""
+    sql = _sql(SearchService().build_query("红烧肉", limit=20))
+    assert sql.count("UNION ALL") == 2
+    for table in ("foods", "drinks", "enjoys"):
+        assert f"{table}.search_vector @@ websearch_to_tsquery('simple'::regconfig" in sql
+    # 高亮只在最外层、取完一页之后计算
+    outer, _, inner = sql.partition("FROM (SELECT hits.type")
+    assert "ts_headline" in outer and "ts_headline" not in inner
+
+
+def test_highlights_escape_user_text_before_marking_hits():
+    """Test that headlines mark hits with non-HTML sentinels and user markup comes back escaped."""
+    sql = _sql(SearchService().build_query("红烧肉", limit=20))
+    assert "<em>" not in sql
+    assert sql.count("ts_headline('simple'::regconfig, translate(") == 2
+
+    headline = '<img src=x onerror="alert(1)"> \x02红烧肉\x03 & <em>假高亮</em>'
+    assert render_highlight(headline) == (
+        '&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <em>红烧肉</em> &amp; &lt;em&gt;假高亮&lt;/em&gt;'
+    )
+    assert render_highlight(None) == ""
+
+
+def test_search_cursor_seeks_every_branch():
+    """Test that the (rank, type, id) cursor round-trips and becomes a row comparison per branch."""
+    cursor = encode_search_cursor(0.123456789, "drink", "42")
+    assert decode_search_cursor(cursor) == (0.123456789, "drink", 42)
+    with pytest.raises(ValueError):
+        decode_search_cursor("garbage")
+
+    sql = _sql(SearchService().build_query("红烧肉", limit=20, after=(0.5, "drink", 42)))
+    assert sql.count("'drink', drinks.id) < (") == 1
+    assert sql.count(".id) < (") == 3
+
+
+@pytest.mark.asyncio
+async def test_blank_query_rejected():
+    """Test that a whitespace-only query is rejected before touching the database."""
+    with pytest.raises(ValueError):
+        await SearchService().search("   ", db=None)
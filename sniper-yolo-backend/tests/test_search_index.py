@@ -0,0 +1,159 @@
+"""Tests for the n-gram search terms index.
+
+The path comparison against a real database needs PostgreSQL: set
+TEST_DATABASE_URL to a synchronous SQLAlchemy URL, otherwise it is skipped.
+"""
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core import search_index
+from app.models import Base
+from app.models.food import Food
+from app.services.enjoy_service import EnjoyService
+from app.services.food_service import FoodService
+from app.services.search_service import SearchService
+from app.utils.ngrams import document_terms, query_terms
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+SCHEMA = "search_index_check"
+
+DOCUMENTS = {
+    1: ("红烧肉", "家常做法，肥而不腻"),
+    2: ("红烧茄子", "下饭"),
+    3: ("清蒸鲈鱼", "鱼要新鲜"),
+    4: ("Latte 拿铁", "oat milk"),
+    5: ("Lager 啤酒", "100% 麦芽"),
+    6: ("latte art", "拉花_练习"),
+}
+QUERIES = ["红烧", "烧肉", "红烧 家常", "鱼", "红烧 鱼", "lat", "atte", "LATTE", "te ar", "100%", "花_练", "a", "？！"]
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def _ilike(document, q: str) -> bool:
+    """Python 版的 ILIKE 回退条件：每个词在某一列里（不区分大小写）出现"""
+    return all(any(term.lower() in field.lower() for field in document) for term in q.split())
+
+
+@pytest.fixture
+def ready_index(monkeypatch):
+    monkeypatch.setattr(search_index, "_ready", True)
+    yield
+    search_index.clear()
+
+
+def test_query_terms_never_miss_a_substring_match():
+    """Test that every substring ILIKE would match has all its query terms in the document terms."""
+    for title, content in DOCUMENTS.values():
+        terms = document_terms(f"{title} {content}")
+        for field in (title, content):
+            for start in range(len(field)):
+                for end in range(start + 1, min(start + 6, len(field)) + 1):
+                    assert query_terms(field[start:end]) <= terms, field[start:end]
+
+    assert query_terms("？！") == frozenset()
+    assert query_terms("ＬＡＴ") == {"la", "at"}
+
+
+def test_index_and_fallback_paths_return_the_same_rows():
+    """Test that candidates re-checked with ILIKE give exactly the ILIKE-only result."""
+    for q in QUERIES:
+        fallback = {doc_id for doc_id, document in DOCUMENTS.items() if _ilike(document, q)}
+        indexed = {
+            doc_id for doc_id, document in DOCUMENTS.items()
+            if query_terms(q) <= document_terms(" ".join(document)) and _ilike(document, q)
+        }
+        assert indexed == fallback, q
+    assert {d for d, document in DOCUMENTS.items() if _ilike(document, "atte")} == {4, 6}
+
+
+def test_indexed_condition_rechecks_with_the_fallback_condition(ready_index):
+    """Test that the index path is the GIN candidate subquery AND the same ILIKE clauses."""
+    fallback = _sql(search_index.ilike_condition("food", "红烧 肉"))
+    conditions = FoodService()._search_conditions(maker="张三", q="红烧 肉")
+    assert len(conditions) == 2
+    compiled = conditions[1].compile(dialect=postgresql.dialect())
+    assert "foods.id IN (SELECT food_search_terms.doc_id" in str(compiled)
+    assert "food_search_terms.terms @> " in str(compiled)
+    assert fallback in str(compiled)
+    assert ["红烧", "肉"] in compiled.params.values()
+
+
+def test_falls_back_to_ilike_until_synced(monkeypatch):
+    """Test the ILIKE-only path before the first sync and for queries with no indexable characters."""
+    search_index.clear()
+    sql = _sql(search_index.match_condition("enjoy", "鸡丁 辣"))
+    assert "search_terms" not in sql
+    assert sql.count("array_to_string(enjoys.recommend_dishes") == 2
+
+    monkeypatch.setattr(search_index, "_ready", True)
+    assert search_index.indexed_condition("food", "？！") is None
+    assert "enjoy_search_terms" in _sql(EnjoyService()._search_conditions(q="水煮")[0])
+    search_index.clear()
+
+
+def test_like_wildcards_in_keywords_are_literal():
+    """Test that % and _ typed by the user do not act as LIKE wildcards."""
+    compiled = search_index.ilike_condition("food", "100%").compile(dialect=postgresql.dialect())
+    assert "%100\\%%" in compiled.params.values()
+
+
+def test_sync_upsert_keeps_newer_terms():
+    """Test that the sync task only overwrites terms while its snapshot of the row is still current."""
+    row = search_index._terms_row("food", SimpleNamespace(id=1, title="红烧肉", content=""), None)
+    assert row["terms"] == sorted(document_terms("红烧肉"))
+    sql = _sql(search_index._upsert("food", [row], current_only=True))
+    assert "ON CONFLICT (doc_id) DO UPDATE" in sql
+    assert "excluded.changed_at IS NOT DISTINCT FROM (SELECT coalesce(foods.update_time, foods.create_time)" in sql
+    assert "WHERE" not in _sql(search_index._upsert("food", [row])).split("DO UPDATE")[1]
+
+
+def test_unified_search_also_matches_ngram_hits(ready_index):
+    """Test that /search ORs the re-checked index condition into each branch so Chinese substrings match."""
+    sql = _sql(SearchService().build_query("烧肉", limit=20))
+    assert "foods.search_vector @@ websearch_to_tsquery('simple'::regconfig, %(websearch_to_tsquery_1)s)) OR " in sql
+    assert "foods.id IN (SELECT food_search_terms.doc_id" in sql
+    # 每个分支：WHERE 里的命中条件和 SELECT 里的相关度加分各一次
+    assert sql.count("_search_terms.terms @> ") == 3 * 2
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        Base.metadata.create_all(conn)
+        now = datetime.now(timezone.utc)
+        rows = [{"id": doc_id, "title": title, "content": content, "maker": "m", "create_time": now}
+                for doc_id, (title, content) in DOCUMENTS.items()]
+        conn.execute(Food.__table__.insert(), rows)
+        terms = [search_index._terms_row("food", SimpleNamespace(**row), now) for row in rows]
+        conn.execute(search_index._upsert("food", terms))
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.commit()
+    engine.dispose()
+
+
+@pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+@pytest.mark.parametrize("q", QUERIES)
+def test_paths_agree_on_postgresql(connection, ready_index, q):
+    """Test that the index path and the ILIKE fallback select the same rows in PostgreSQL."""
+    def ids(condition):
+        return set(connection.execute(select(Food.id).where(condition)).scalars())
+
+    fallback = ids(search_index.ilike_condition("food", q))
+    assert ids(search_index.match_condition("food", q)) == fallback
+    assert fallback == {doc_id for doc_id, document in DOCUMENTS.items() if _ilike(document, q)}
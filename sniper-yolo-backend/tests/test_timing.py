@@ -0,0 +1,74 @@
+"""Tests for per-request phase timing and the Server-Timing header."""
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import create_engine, text
+
+from app.core import timing
+from app.core.db_events import instrument_engine
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header_present():
+    """Test that every response carries a Server-Timing header with total app time."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/health")
+
+    assert "app;dur=" in response.headers["server-timing"]
+
+
+def test_phases_accumulate_and_db_events_recorded():
+    """Test that nested phases accumulate and SQL statements land in the db phase."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    collector = timing.start_request()
+
+    with timing.phase("auth"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+    header = collector.header_value()
+    assert "auth;dur=" in header
+    assert 'db;dur=' in header and 'desc="2x"' in header
+    assert set(collector.as_dict()) == {"auth", "db"}
+
+
+def test_query_stats_detects_repeated_statement_shapes():
+    """Test that repeated statements differing only in literals share one shape."""
+    from app.core import query_stats
+
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    stats = query_stats.start_request()
+
+    with engine.connect() as conn:
+        for user_id in range(6):
+            conn.execute(text("SELECT :id AS owner_id"), {"id": user_id})
+        conn.execute(text("SELECT 'x' IN (1, 2, 3)"))
+
+    assert stats.count == 7
+    assert stats.repeated(5) == [("SELECT ? AS owner_id", 6)]
+    assert query_stats.normalize_sql("SELECT * FROM items WHERE id IN ($1, $2, $3)") == \
+        "SELECT * FROM items WHERE id IN (?)"
+
+
+def test_slow_query_records_shape_without_values(monkeypatch):
+    """Test that statements over the threshold are buffered with normalized SQL and parameter types only."""
+    from app.core import slow_query
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    slow_query.clear()
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT :name AS name, 42 AS answer"), {"name": "secret"})
+
+    entry = slow_query.recent(1)[0]
+    assert entry["sql"] == "SELECT ? AS name, ? AS answer"
+    assert entry["params"] == ["str"]
+    assert "secret" not in str(entry)
+    assert entry["plan"] is None
+    slow_query.clear()
@@ -0,0 +1,71 @@
+"""Tests for claims-carrying access tokens and the claims-only dependency."""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import token_versions
+from app.core.dependencies import get_current_active_claims, get_current_claims
+from app.core.security import create_access_token, user_token_claims
+
+
+def _token(user_id: int, **fields) -> HTTPAuthorizationCredentials:
+    user = SimpleNamespace(is_active=True, is_superuser=False, vip_level=2, token_version=0)
+    user.__dict__.update(fields)
+    token = create_access_token(subject=str(user_id), claims=user_token_claims(user))
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_claims_authorize_without_database():
+    """Test that a known user with a current version is authorized from claims alone (db=None)."""
+    token_versions.put(41, 0)
+    claims = await get_current_claims(request=None, credentials=_token(41), db=None)
+
+    assert claims.id == 41 and claims.is_active and claims.vip_level == 2
+    assert (await get_current_active_claims(claims)).id == 41
+    token_versions.discard(41)
+
+
+@pytest.mark.asyncio
+async def test_bumped_version_revokes_token():
+    """Test that tokens issued before a version bump are rejected."""
+    token_versions.put(42, 1)
+    with pytest.raises(HTTPException) as exc:
+        await get_current_claims(request=None, credentials=_token(42, token_version=0), db=None)
+    assert exc.value.status_code == 401
+    token_versions.discard(42)
+
+
+@pytest.mark.asyncio
+async def test_inactive_claims_rejected():
+    """Test that an inactive user's claims fail the active-user check."""
+    token_versions.put(43, 0)
+    claims = await get_current_claims(request=None, credentials=_token(43, is_active=False), db=None)
+    with pytest.raises(HTTPException) as exc:
+        await get_current_active_claims(claims)
+    assert exc.value.status_code == 400
+    token_versions.discard(43)
+
+
+def test_decoded_token_cache_respects_exp(monkeypatch):
+    """Test that cached payloads are returned as copies and expire with the token."""
+    import time
+    from datetime import timedelta
+
+    from app.core import security
+
+    now = [time.time()]
+    monkeypatch.setattr(security.time, "time", lambda: now[0])
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(security, "_decoded_tokens", security.TTLCache(100, 300))
+
+    token = create_access_token(subject="44", expires_delta=timedelta(seconds=60))
+    first = security.decode_access_token(token)
+    first["sub"] = "tampered"
+    assert security.decode_access_token(token)["sub"] == "44"
+
+    # 超过令牌 exp 后缓存条目失效
+    now[0] += 61
+    assert security._decoded_tokens.get(security.hashlib.sha256(token.encode()).digest()) is None
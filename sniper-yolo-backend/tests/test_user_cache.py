@@ -0,0 +1,41 @@
+"""Tests for the TTL/LRU cache and the authenticated-user cache."""
+import time
+
+from sqlalchemy import inspect
+
+from app.core import user_cache
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    """Test that entries expire after the TTL and the LRU entry is evicted at capacity."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a 变为最近使用
+    cache.set("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_user_cache_returns_detached_copies():
+    """Test that cache hits are fresh detached instances and discard removes the entry."""
+    user_cache.clear()
+    user = User(id=7, username="sniper", email="s@example.com", is_active=True, is_superuser=False)
+    user_cache.put(user)
+
+    first, second = user_cache.get(7), user_cache.get(7)
+    assert first is not second
+    assert first.username == "sniper" and first.is_active
+    state = inspect(first)
+    assert state.detached and not state.modified
+
+    user_cache.discard(7)
+    assert user_cache.get(7) is None
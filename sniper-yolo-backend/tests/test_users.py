@@ -0,0 +1,33 @@
+"""Tests for user service helpers."""
+from sqlalchemy.exc import IntegrityError
+
+from app.services.user_service import CONFLICT_MESSAGES, conflicting_field
+
+
+class _UniqueViolation(Exception):
+    def __init__(self, message: str, constraint_name: str = None):
+        super().__init__(message)
+        self.constraint_name = constraint_name
+
+
+def _integrity_error(orig: Exception) -> IntegrityError:
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+def test_conflicting_field_from_constraint_name():
+    """Test that asyncpg-style constraint names map to the colliding field."""
+    driver_error = Exception("duplicate key")
+    driver_error.__cause__ = _UniqueViolation("duplicate key", constraint_name="users_mobile_key")
+    assert conflicting_field(_integrity_error(driver_error)) == "mobile"
+    assert conflicting_field(_integrity_error(_UniqueViolation("dup", "ix_users_username"))) == "username"
+
+
+def test_conflicting_field_from_error_detail():
+    """Test that the 'Key (field)=' detail is used when no constraint name is exposed."""
+    orig = Exception(
+        'duplicate key value violates unique constraint "users_email_key"\n'
+        "DETAIL:  Key (email)=(a@example.com) already exists."
+    )
+    field = conflicting_field(_integrity_error(orig))
+    assert field == "email" and CONFLICT_MESSAGES[field] == "邮箱已存在"
+    assert conflicting_field(_integrity_error(Exception("foreign key violation"))) is None